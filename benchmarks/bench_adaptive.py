@@ -0,0 +1,140 @@
+"""Fixed politeness against the adaptive limiter, on a local server that throttles and blocks.
+
+The server answers up to --capacity requests per second; beyond that it
+returns 429 with Retry-After, slows down as more requests are in flight, and
+after too many 429s within ten seconds it serves a captcha page for
+--block-seconds.
+Each strategy fetches the same detail pages and reports its throughput, the
+share of pages that came back with an address, and what the server had to
+throttle or block.
+
+Run from the repository root:
+    python -m benchmarks.bench_adaptive
+"""
+import argparse
+import collections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+from benchmarks.fixture_server import CountingServer, load_fixture
+from booking_scraper import adaptive, http_client
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.extract import extract_details
+from booking_scraper.fetching import HostRateLimiter, fetch_all
+
+STRIKE_WINDOW = 10  # Seconds over which the server counts 429s before blocking
+CAPTCHA_PAGE = b'<html><head><title>Robot check</title></head><body><div id="px-captcha"></div></body></html>'
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            now = time.monotonic()
+            server.in_flight += 1
+            while server.recent and now - server.recent[0] > 1:
+                server.recent.popleft()
+            server.recent.append(now)
+            if now < server.blocked_until:
+                status, body = 200, CAPTCHA_PAGE
+                server.stats["captcha"] += 1
+            elif len(server.recent) > server.capacity:
+                status, body = 429, b"Too many requests"
+                server.stats["429"] += 1
+                while server.strikes and now - server.strikes[0] > STRIKE_WINDOW:
+                    server.strikes.popleft()
+                server.strikes.append(now)
+                if len(server.strikes) >= server.block_after:
+                    server.blocked_until = now + server.block_seconds
+                    server.strikes.clear()
+                    server.stats["blocks"] += 1
+            else:
+                status, body = 200, server.page
+                server.stats["200"] += 1
+            # Responses slow down as more requests queue up on the server
+            delay = server.latency * (1 + server.in_flight / server.workers)
+        time.sleep(delay)
+        with server.lock:
+            server.in_flight -= 1
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_throttling_server(capacity, latency, block_after, block_seconds, workers=8):
+    server = CountingServer(("127.0.0.1", 0), ThrottlingHandler)
+    server.page = load_fixture("detail.html")
+    server.capacity = capacity
+    server.latency = latency
+    server.workers = workers
+    server.block_after = block_after
+    server.block_seconds = block_seconds
+    server.lock = threading.Lock()
+    server.recent = collections.deque()
+    server.in_flight = 0
+    server.strikes = collections.deque()  # Times of recent 429s
+    server.blocked_until = 0.0
+    server.stats = collections.Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def fetch(link):
+    try:
+        return extract_details(http_client.get(link).content)
+    except Exception:
+        return "N/A", "N/A"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--capacity", type=int, default=20, help="Requests per second the server accepts")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server-side delay per request when idle")
+    parser.add_argument("--block-after", type=int, default=20, help="429s within the strike window before the server blocks")
+    parser.add_argument("--block-seconds", type=float, default=5.0)
+    parser.add_argument("--in-flight", type=int, default=16)
+    parser.add_argument("--only", nargs="+", choices=("polite", "aggressive", "adaptive"), help="Strategies to run")
+    args = parser.parse_args()
+
+    adaptive.PAUSE_SECONDS = args.block_seconds  # Pause as long as the simulated block lasts
+    strategies = (
+        ("polite", "fixed 2 req/s", lambda: HostRateLimiter(2, 4)),
+        ("aggressive", "fixed 100 req/s", lambda: HostRateLimiter(100, args.in_flight)),
+        ("adaptive", "adaptive", AdaptiveLimiter),
+    )
+    for key, name, make_limiter in strategies:
+        if args.only and key not in args.only:
+            continue
+        server, base_url = start_throttling_server(args.capacity, args.latency, args.block_after, args.block_seconds)
+        limiter = make_limiter()
+        links = [f"{base_url}/hotel/it/fixture-{n}.html" for n in range(args.pages)]
+        try:
+            start = time.perf_counter()
+            results = fetch_all(links, fetch, max_in_flight=args.in_flight, limiter=limiter)
+            elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+        ok = sum(1 for address, _ in results if address != "N/A")
+        print(f"{name:<16} {ok / elapsed:6.1f} good pages/sec, {ok / len(results):6.1%} with an address, "
+              f"{server.stats['429']:4d} throttled, {server.stats['blocks']} blocks, "
+              f"{server.stats['captcha']:4d} captcha pages ({elapsed:.1f}s)")
+        if isinstance(limiter, AdaptiveLimiter):
+            for host, stats in limiter.report().items():
+                print(f"  {host}: ended at {stats['rate']} req/s, {stats['concurrency']} in flight, "
+                      f"{stats['decreases']} decreases")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Peak memory and bytes read for contact-page fetches against oversized and binary responses.
+
+A local server answers like search results do: a normal contact page, a huge
+directory page with the contacts in its first screen, a PDF and a video. The
+original fetch reads and parses every body whole; the bounded fetch refuses
+non-HTML from the headers, stops reading at http_client.MAX_BODY_BYTES and
+scans the rest chunk by chunk. Each run is a fresh process, so its peak RSS
+is its own; the bounded fetch should stay flat as the pages get larger.
+
+Run from the repository root:
+    python -m benchmarks.bench_bounded_fetch
+"""
+import argparse
+import multiprocessing
+import resource
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+from benchmarks.fixture_server import CountingServer, load_fixture
+
+KINDS = ("contact", "directory", "pdf", "video")  # Result pages of one search, fetched in turn
+DIRECTORY_ROW = b'<tr><td>Albergo Fixture</td><td>Via Roma 1</td><td>+39 041 000 0000</td></tr>\n'
+
+
+class OversizedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # A kept-alive connection the client dropped after cutting a body short
+
+    def do_GET(self):
+        server = self.server
+        kind = self.path.strip("/").split("/")[0]
+        if kind == "contact":
+            content_type, head, size = "text/html; charset=utf-8", server.contact_page, 0
+        elif kind == "directory":
+            content_type, head, size = "text/html; charset=utf-8", server.contact_page.replace(b"</html>", b""), server.size
+        elif kind == "pdf":
+            content_type, head, size = "application/pdf", b"%PDF-1.7\n", server.size
+        else:
+            content_type, head, size = "video/mp4", b"\0\0\0\x20ftypisom", server.size
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(max(size, len(head))))
+        self.end_headers()
+        try:
+            self.wfile.write(head)
+            with server.lock:
+                server.bytes_sent += len(head)
+            filler = DIRECTORY_ROW if kind == "directory" else b"\0" * len(DIRECTORY_ROW)
+            block = filler * (2**20 // len(filler))
+            sent = len(head)
+            while sent < size:
+                part = block[:size - sent]
+                self.wfile.write(part)
+                sent += len(part)
+                with server.lock:
+                    server.bytes_sent += len(part)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # The client stopped reading, as the bounded fetch does
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_oversized_server(size):
+    server = CountingServer(("127.0.0.1", 0), OversizedHandler)
+    server.contact_page = load_fixture("contact_page.html")
+    server.size = size
+    server.lock = threading.Lock()
+    server.bytes_sent = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def run(mode, urls, in_flight, results):
+    """Fetch every URL in a fresh process and report what it found and its peak RSS."""
+    from booking_scraper import http_client
+    from booking_scraper.contacts import ContactCollector
+    from booking_scraper.fetching import HostRateLimiter, fetch_all
+
+    def unbounded(url):
+        collector = ContactCollector()
+        response = http_client.get(url)
+        collector.scan_page(response.content)
+        return len(response.content), len(collector.emails) + len(collector.phones)
+
+    def bounded(url):
+        try:
+            response = http_client.bounded_get(url)
+        except http_client.ContentRejected:
+            return 0, 0
+        collector = ContactCollector()
+        collector.scan_stream(http_client.iter_body(response))
+        return len(response.content), len(collector.emails) + len(collector.phones)
+
+    fetch = unbounded if mode == "unbounded" else bounded
+    start = time.perf_counter()
+    pages = fetch_all(urls, fetch, max_in_flight=in_flight, limiter=HostRateLimiter(rate=1000, capacity=100))
+    results.put({
+        "elapsed": time.perf_counter() - start,
+        "bytes": sum(size for size, _ in pages),
+        "contacts": sum(found for _, found in pages),
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # kB on Linux
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50], help="Size of the large responses in MB")
+    parser.add_argument("--searches", type=int, default=4, help="Sets of result pages (one of each kind) fetched")
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--only", nargs="+", choices=("unbounded", "bounded"), help="Fetch modes to run")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        server, base_url = start_oversized_server(size * 2**20)
+        urls = [f"{base_url}/{kind}/{n}" for n in range(args.searches) for kind in KINDS]
+        try:
+            for mode in ("unbounded", "bounded"):
+                if args.only and mode not in args.only:
+                    continue
+                results = context.Queue()
+                server.bytes_sent = 0
+                process = context.Process(target=run, args=(mode, urls, args.in_flight, results))
+                process.start()
+                result = results.get()
+                process.join()
+                print(f"{size:3d} MB pages, {mode:<9} {result['peak_rss']:7.1f} MB peak RSS, "
+                      f"{result['bytes'] / 2**20:8.1f} MB kept of {server.bytes_sent / 2**20:8.1f} MB sent, "
+                      f"{result['contacts']:3d} contacts from {len(urls)} pages in {result['elapsed']:6.2f}s")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
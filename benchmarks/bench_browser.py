@@ -0,0 +1,116 @@
+"""Bytes, load time and memory per city of the default and the lean Chrome profile.
+
+The search-results fixture is served with what a real search page drags in:
+card photos, web fonts and a third-party tracking script (from "localhost",
+which counts as a third party next to 127.0.0.1). Chrome memory is the
+resident size of the browser's process tree, measured with psutil when it is
+installed.
+
+Needs Google Chrome. Run from the repository root:
+    python -m benchmarks.bench_browser
+"""
+import argparse
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.fixture_server import load_fixture, start_server
+from booking_scraper import browser_pool
+from booking_scraper.browser import scrape_booking
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+IMAGE_BYTES = 80 * 1024
+FONT_BYTES = 150 * 1024
+TRACKER_BYTES = 300 * 1024
+
+
+def heavy_route(port, images):
+    page = load_fixture("search_results.html")
+    extras = (
+        '<style>@font-face { font-family: Brand; src: url("/fonts/brand.woff2"); } body { font-family: Brand; }</style>'
+        + "".join(f'<img src="/images/photo-{n}.jpg" width="200">' for n in range(images))
+        + f'<script src="http://localhost:{port}/tracker.js"></script>'
+    ).encode()
+    page = page.replace(b"</body>", extras + b"</body>")
+
+    def route(path):
+        path = urlsplit(path).path
+        if path.startswith("/images/"):
+            return b"\xff\xd8" + b"\0" * IMAGE_BYTES
+        if path.startswith("/fonts/"):
+            return b"\0" * FONT_BYTES
+        if path == "/tracker.js":
+            return b"/*" + b" " * TRACKER_BYTES + b"*/"
+        return page
+    return route
+
+
+def chrome_memory(driver):
+    """Resident memory of chromedriver's Chrome processes in MB, or None without psutil."""
+    if psutil is None:
+        return None
+    total = 0
+    for process in psutil.Process(driver.service.process.pid).children(recursive=True):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=4, help="Result pages per city")
+    parser.add_argument("--images", type=int, default=40, help="Photos on the search page")
+    args = parser.parse_args()
+
+    server, base_url = start_server(fixture="search_results.html", latency=0.02)
+    port = server.server_port
+    server.RequestHandlerClass.route = staticmethod(heavy_route(port, args.images))
+    browser_pool.BLOCKED_DOMAINS = browser_pool.BLOCKED_DOMAINS + [f"*://localhost:{port}/*"]
+    search_url = f"{base_url}/searchresults.html?ss={{city}}&pages={args.pages}&load_delay=200"
+    results = {}
+    try:
+        for lean in (False, True):
+            name = "lean" if lean else "default"
+            totals = {"seconds": 0.0, "bytes": 0, "requests": 0, "memory": []}
+            for n in range(args.cities):
+                driver = browser_pool.create_driver(headless=True, lean=lean)
+                try:
+                    start = time.perf_counter()
+                    listings = scrape_booking(f"Fixture City {n}", driver, max_results=0, base_url=search_url)
+                    elapsed = time.perf_counter() - start
+                    stats = browser_pool.page_stats(driver)
+                    memory = chrome_memory(driver)
+                finally:
+                    driver.quit()
+                totals["seconds"] += elapsed
+                totals["bytes"] += stats["bytes"]
+                totals["requests"] += stats["requests"]
+                if memory is not None:
+                    totals["memory"].append(memory)
+                print(f"{name:<8} city {n}: {len(listings)} listings in {elapsed:.2f}s, "
+                      f"{stats['bytes'] / 1e6:.2f} MB in {stats['requests']} requests"
+                      + (f", Chrome {memory:.0f} MB" if memory is not None else ""))
+            results[name] = totals
+    finally:
+        server.shutdown()
+
+    default, lean = results["default"], results["lean"]
+    print(f"Lean profile saves {(default['bytes'] - lean['bytes']) / args.cities / 1e6:.2f} MB and "
+          f"{(default['seconds'] - lean['seconds']) / args.cities:.2f}s per city "
+          f"({1 - lean['bytes'] / max(default['bytes'], 1):.0%} of bytes, {1 - lean['seconds'] / default['seconds']:.0%} of time)")
+    if default["memory"] and lean["memory"]:
+        default_memory = sum(default["memory"]) / len(default["memory"])
+        lean_memory = sum(lean["memory"]) / len(lean["memory"])
+        print(f"Chrome memory per driver: {default_memory:.0f} MB default, {lean_memory:.0f} MB lean")
+    else:
+        print("Install psutil to measure Chrome memory per driver.")
+
+
+if __name__ == "__main__":
+    main()
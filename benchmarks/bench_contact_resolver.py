@@ -0,0 +1,110 @@
+"""External calls per listing for contact lookups, per listing versus batched and memoized.
+
+A stub search backend stands in for Google and points at a local fixture
+server, so the run is offline and every search and page fetch is counted.
+
+Run from the repository root:
+    python -m benchmarks.bench_contact_resolver
+"""
+import argparse
+import random
+import threading
+import time
+
+from benchmarks.fixture_server import load_fixture, start_server
+from booking_scraper import http_client
+from booking_scraper.contact_resolver import CONTACT_BATCH_SIZE, SEARCH_RESULTS, ContactResolver, normalize_name
+from booking_scraper.contacts import ContactCollector
+from booking_scraper.fetching import HostRateLimiter
+
+# Overlapping areas return many of the same properties
+CITIES = ["Ostia", "Ostia Antica", "Fiumicino", "Sardinia", "Olbia", "Cagliari", "Venice", "Verona"]
+CHAINS = ["Best Western", "NH Hotels", "Hilton Garden Inn", "B&B Hotels"]
+
+
+def build_listings(count, distinct, seed=1):
+    """`count` listings drawn from `distinct` properties, with chain members sharing a website."""
+    rng = random.Random(seed)
+    properties = []
+    for n in range(distinct):
+        chain = CHAINS[n % len(CHAINS)] if n % 3 == 0 else None
+        name = f"{chain} {n}" if chain else f"Hotel Fixture {n}"
+        properties.append((name, chain, rng.choice(CITIES)))
+    listings = []
+    for _ in range(count):
+        name, chain, city = rng.choice(properties)
+        if rng.random() < 0.3:
+            name = name.upper() + "!"  # Same property, different spelling
+        listings.append({"Name": name, "City": city})
+    return listings
+
+
+class StubSearch:
+    """Search backend returning fixture-server URLs; chain properties share the chain's pages."""
+
+    def __init__(self, base_url, chains):
+        self.base_url = base_url
+        self.chains = chains
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, query, num_results):
+        with self.lock:
+            self.calls += 1
+        name = query.rsplit(" phone email", 1)[0]
+        slug = normalize_name(name).replace(" ", "-")
+        chain = next((chain for chain in self.chains if normalize_name(name).startswith(normalize_name(chain))), None)
+        urls = [f"{self.base_url}/hotel/{slug}/{n}" for n in range(num_results)]
+        if chain:
+            urls[-2:] = [f"{self.base_url}/chain/{normalize_name(chain).replace(' ', '-')}/{page}" for page in ("contact", "about")]
+        return urls
+
+
+def per_listing(listings, search, fetch):
+    """The original lookup: one search and every result fetched, for each listing."""
+    results = []
+    for listing in listings:
+        collector = ContactCollector()
+        for url in search(f"{listing['Name']} {listing['City']} phone email", SEARCH_RESULTS):
+            collector.scan_page(fetch(url).content)
+        results.append(collector.result())
+    return results
+
+
+def batched(listings, search, fetch):
+    # Every stub page is on one local host, so lift the per-host limit to measure the lookup itself
+    resolver = ContactResolver(search=search, fetch=fetch, limiter=HostRateLimiter(rate=1000, capacity=100))
+    results = []
+    for start in range(0, len(listings), CONTACT_BATCH_SIZE):
+        results += resolver.resolve_batch(listings[start:start + CONTACT_BATCH_SIZE])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=80, help="Distinct properties among the listings")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the server waits per page")
+    args = parser.parse_args()
+
+    page = load_fixture("contact_page.html")
+    fetched = []
+    server, base_url = start_server("contact_page.html", latency=args.latency, route=lambda path: fetched.append(path) or page)
+    listings = build_listings(args.listings, args.distinct)
+    try:
+        for name, lookup in (("per-listing", per_listing), ("batched", batched)):
+            search = StubSearch(base_url, CHAINS)
+            fetched.clear()
+            start = time.perf_counter()
+            results = lookup(listings, search, http_client.get)
+            elapsed = time.perf_counter() - start
+            calls = search.calls + len(fetched)
+            found = sum(result["Emails"] != ["N/A"] for result in results)
+            print(f"{name:<12} {search.calls:5d} searches, {len(fetched):5d} fetches, "
+                  f"{calls / len(listings):5.2f} external calls/listing, {elapsed:6.2f}s ({found} with email)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Contact extraction throughput over a corpus of saved contact pages.
+
+Run from the repository root:
+    python -m benchmarks.bench_contacts
+"""
+import argparse
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixture_server import load_fixture
+from booking_scraper.contacts import ContactCollector
+
+FILLER = '<p>Camere con vista sul canale, colazione inclusa e Wi-Fi gratuito in tutta la struttura.</p>\n'
+
+
+def build_corpus(pages, size_kb):
+    """Saved contact page padded to `size_kb`, with a distinct number and email on every page."""
+    page = load_fixture("contact_page.html").decode("utf-8")
+    filler = FILLER * (size_kb * 1024 // len(FILLER))
+    return [
+        page.replace("</main>", f"{filler}<p>Staff {n}: staff{n}@hotelfixture.it, +39 041 600 {n:04d}</p></main>").encode("utf-8")
+        for n in range(pages)
+    ]
+
+
+def normalize_phone(phone):
+    phone_cleaned = re.sub(r"[^\d\s\+]", "", phone)
+    phone_cleaned = re.sub(r"\s+", "", phone_cleaned)
+    if phone_cleaned.startswith("+39"):
+        return f"{phone_cleaned[:3]} {phone_cleaned[3:6]} {phone_cleaned[6:9]} {phone_cleaned[9:]}".strip()
+    return None
+
+
+def validate_email(email):
+    email_pattern = r"^[a-zA-Z][a-zA-Z0-9._%+-]*@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+    return email if re.match(email_pattern, email) else None
+
+
+def legacy_scan(corpus):
+    """The original find_contact_details extraction loop."""
+    emails, phones = [], []
+    for content in corpus:
+        soup = BeautifulSoup(content.decode("utf-8"), 'html.parser')
+        raw_emails = re.findall(r"[a-zA-Z][a-zA-Z0-9._%+-]*@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", soup.get_text())
+        emails += [validate_email(email) for email in raw_emails if validate_email(email) is not None]
+        raw_phones = re.findall(r"\+39[\s\-()0-9]{8,}", soup.get_text())
+        phones += [normalize_phone(phone) for phone in raw_phones if normalize_phone(phone) is not None]
+    return {"Emails": list(set(emails)), "Phones": list(set(phones))}
+
+
+def collector_scan(corpus):
+    collector = ContactCollector()
+    for content in corpus:
+        collector.scan_page(content)
+    return collector.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=200, help="Size of each saved page")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.pages, args.size_kb)
+    for name, scan in (("legacy", legacy_scan), ("collector", collector_scan)):
+        start = time.perf_counter()
+        found = scan(corpus)
+        elapsed = time.perf_counter() - start
+        matches = len(found["Emails"]) + len(found["Phones"])
+        print(f"{name:<10} {args.pages / elapsed:8.1f} pages/sec, {matches / elapsed:9.1f} matches/sec "
+              f"({len(found['Emails'])} emails, {len(found['Phones'])} phones)")
+
+
+if __name__ == "__main__":
+    main()
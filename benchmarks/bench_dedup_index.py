@@ -0,0 +1,56 @@
+"""Size and lookup speed of the property index at millions of keys.
+
+Run from the repository root:
+    python -m benchmarks.bench_dedup_index
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from booking_scraper.dedup_index import PropertyIndex
+
+FIELDS = {"Address": "Calle Larga 1, 30100 Venezia, Italy", "Property Type": "Hotel",
+          "Email": "info@hotelfixture.it", "Phone Number": "+39 041 600 0000"}
+
+
+def listing(n):
+    # Card links carry per-search tracking params; the index must see through them
+    return {"Link": f"https://www.booking.com/hotel/it/fixture-{n}.en-gb.html?aid=304142&hpos={n % 25}&srpvid={n:x}", **FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000, help="Listings per add_many/apply_known call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "property_index.sqlite")
+        index = PropertyIndex(path)
+
+        start = time.perf_counter()
+        for first in range(0, args.keys, args.batch):
+            index.add_many([listing(n) for n in range(first, min(first + args.batch, args.keys))])
+        elapsed = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"insert   {args.keys / elapsed:10.0f} keys/sec, {size / 2**20:7.1f} MiB on disk ({size / args.keys:.0f} bytes/key)")
+
+        # Half the looked-up listings were seen before, as with overlapping cities
+        rng = random.Random(1)
+        probes = [rng.randrange(args.keys * 2) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        remaining = 0
+        for first in range(0, len(probes), args.batch):
+            batch = [{"Link": listing(n)["Link"]} for n in probes[first:first + args.batch]]
+            remaining += len(index.apply_known(batch))
+        elapsed = time.perf_counter() - start
+        print(f"lookup   {args.lookups / elapsed:10.0f} keys/sec, {args.lookups - remaining} hits, {remaining} misses")
+        print(f"avoided  {index.report()}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Crawl throughput with one and several worker processes sharing a SQLite work queue, and recovery from a crash.
+
+Search, detail and contact pages come from the local replay server. In the
+crash run one worker exits abruptly while it holds a city's lease; the lease
+expires and another worker lists the city again. Every run then collects the
+results into one store and checks that each listing arrived exactly once.
+
+Run from the repository root:
+    python -m benchmarks.bench_distributed
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+LEASE_SECONDS = 3  # Short leases so the crashed worker's city is reassigned quickly
+
+
+def run_worker(queue_path, base_url, owner, crash, search_latency):
+    from booking_scraper import distributed, http_client
+    from benchmarks.fixture_server import StubSearch
+    from booking_scraper.contact_resolver import ContactResolver
+    from booking_scraper.extract import extract_details
+    from booking_scraper.fetching import HostRateLimiter
+    from booking_scraper.listing import scrape_booking_http
+    from booking_scraper.work_queue import open_queue
+
+    distributed.POLL_INTERVAL = 0.2
+    search_url = f"{base_url}/searchresults.html?ss={{city}}"
+
+    def list_city(city):
+        accommodations = scrape_booking_http(city, base_url=search_url, limiter=limiter)
+        if crash:
+            os._exit(1)  # Dies holding the city's lease, before any of its listings are queued
+        return accommodations
+
+    def fetch_details(link):
+        return extract_details(http_client.get(base_url + urlsplit(link).path).content)
+
+    limiter = HostRateLimiter(rate=10000, capacity=1000)
+    resolver = ContactResolver(search=StubSearch(base_url, search_latency), fetch=http_client.get, limiter=limiter)
+    distributed.Worker(open_queue(queue_path), list_city, fetch_details, resolver, limiter=limiter, owner=owner,
+                       lease_seconds=LEASE_SECONDS).run()
+
+
+def crawl(cities, workers, base_url, directory, search_latency, crash=False):
+    from booking_scraper.distributed import collect, enqueue_cities
+    from booking_scraper.store import AccommodationStore
+    from booking_scraper.work_queue import open_queue
+
+    queue_path = os.path.join(directory, f"queue-{workers}-{crash}.sqlite")
+    queue = open_queue(queue_path)
+    enqueue_cities(queue, cities)
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    processes = [context.Process(target=run_worker, args=(queue_path, base_url, f"worker-{n}", crash and n == 0, search_latency))
+                 for n in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    store = AccommodationStore(os.path.join(directory, f"store-{workers}-{crash}.sqlite"))
+    rows, finished = collect(queue, store)
+    stored = store.query()
+    queue.close()
+    return {
+        "elapsed": elapsed,
+        "rows": rows,
+        "unique": len({(row["City"], row["Link"]) for row in stored}),
+        "with_address": sum(row["Address"] != "N/A" for row in stored),
+        "cities": len(finished),
+        "crashed": sum(process.exitcode != 0 for process in processes),
+    }
+
+
+def main():
+    from benchmarks.fixture_server import replay_route, start_server
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="Server-side delay per page in seconds")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Seconds per stub search")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency, route=replay_route)
+    cities = [f"City {n}" for n in range(args.cities)]
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for name, workers, crash in (("1 worker", 1, False),
+                                         (f"{args.workers} workers", args.workers, False),
+                                         (f"{args.workers} workers, 1 crash", args.workers, True)):
+                result = crawl(cities, workers, base_url, directory, args.search_latency, crash)
+                print(f"{name:<20} {result['rows']:5d} rows ({result['unique']} unique, {result['with_address']} with an address) "
+                      f"from {result['cities']}/{len(cities)} cities in {result['elapsed']:6.2f}s "
+                      f"({result['rows'] / result['elapsed']:6.1f} rows/sec), {result['crashed']} workers crashed")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
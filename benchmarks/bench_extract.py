@@ -0,0 +1,77 @@
+"""Pages/sec and peak RSS of the detail-page extractor backends on saved pages.
+
+Each backend runs in its own process so peak RSS is not shared between them.
+Run from the repository root:
+    python -m benchmarks.bench_extract
+"""
+import argparse
+import multiprocessing
+import re
+import resource
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixture_server import load_fixture
+from booking_scraper import extract
+
+# Filler appended after the header to bring the saved page up to a real detail page's size
+REVIEW_BLOCK = (
+    '<div class="review_item"><div class="review_item_header">Guest review {n}</div>'
+    '<p class="review_pos">Great location, friendly staff and a very clean room. '
+    'Breakfast was excellent and the canal view from the balcony was unforgettable.</p></div>\n'
+)
+
+
+def build_page(size_kb):
+    page = load_fixture("detail.html").decode("utf-8")
+    filler = "".join(REVIEW_BLOCK.format(n=n) for n in range(size_kb * 1024 // len(REVIEW_BLOCK) + 1))
+    return page.replace("</body>", f"<div id='reviews'>{filler}</div></body>").encode("utf-8")
+
+
+def legacy_extract(content):
+    """The original scrape_address_property parsing path."""
+    soup = BeautifulSoup(content.decode("utf-8"), 'html.parser')
+    address_element = soup.select_one('div[tabindex="0"].a53cbfa6de.f17adf7576')
+    address = re.sub(r"(Italy.*)", "Italy", address_element.get_text(strip=True)) if address_element else "N/A"
+    property_element = soup.select_one('a.bui_breadcrumb__link_masked')
+    match = re.search(r"\((.*?)\)", property_element.get_text(strip=True)) if property_element else None
+    return address, match.group(1) if match else "N/A"
+
+
+def run_backend(name, page, pages, results):
+    extractor = legacy_extract if name == "legacy" else lambda content: extract.extract_details(content, name)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    for _ in range(pages):
+        fields = extractor(page)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((name, pages / elapsed, rss_after / 1024, (rss_after - rss_before) / 1024, fields))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=1500, help="Size of the saved page")
+    args = parser.parse_args()
+
+    page = build_page(args.size_kb)
+    backends = ["legacy", "html.parser"]
+    if extract.etree is not None:
+        backends.append("lxml")
+    if extract.HTMLParser is not None:
+        backends.append("selectolax")
+
+    print(f"Page size {len(page) / 1024:.0f} KB, {args.pages} pages per backend")
+    results = multiprocessing.Queue()
+    for name in backends:
+        process = multiprocessing.Process(target=run_backend, args=(name, page, args.pages, results))
+        process.start()
+        process.join()
+        name, rate, peak, growth, fields = results.get()
+        print(f"{name:<12} {rate:8.1f} pages/sec, peak RSS {peak:6.1f} MB (+{growth:.1f} MB while parsing) -> {fields}")
+
+
+if __name__ == "__main__":
+    main()
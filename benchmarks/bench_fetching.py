@@ -0,0 +1,54 @@
+"""Throughput of the concurrent detail-page stage against a local fixture server.
+
+Run from the repository root:
+    python -m benchmarks.bench_fetching
+"""
+import argparse
+import time
+
+from benchmarks.fixture_server import start_server
+from booking_scraper.fetching import HostRateLimiter, fetch_all
+from booking_scraper import http_client
+
+
+def fetch(url):
+    return http_client.get(url).status_code
+
+
+def run_serial(urls):
+    start = time.perf_counter()
+    results = [fetch(url) for url in urls]
+    return results, time.perf_counter() - start
+
+
+def run_concurrent(urls, max_in_flight, rate, burst):
+    start = time.perf_counter()
+    results = fetch_all(urls, fetch, max_in_flight=max_in_flight, limiter=HostRateLimiter(rate, burst))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1, help="Server-side delay per request in seconds")
+    parser.add_argument("--in-flight", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=50.0, help="Requests per second allowed per host")
+    parser.add_argument("--burst", type=int, default=8)
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    urls = [f"{base_url}/hotel/it/fixture-{i}.html" for i in range(args.pages)]
+    try:
+        _, serial_time = run_serial(urls)
+        results, concurrent_time = run_concurrent(urls, args.in_flight, args.rate, args.burst)
+    finally:
+        server.shutdown()
+
+    print(f"Serial:     {args.pages / serial_time:8.1f} pages/sec ({serial_time:.2f}s)")
+    print(f"Concurrent: {args.pages / concurrent_time:8.1f} pages/sec ({concurrent_time:.2f}s), "
+          f"{args.in_flight} in flight, {args.rate:g} req/s per host")
+    print(f"Speedup:    {serial_time / concurrent_time:8.1f}x, {len(results)} results in order")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Latency and handshake counts of bare requests.get versus the pooled client.
+
+Run from the repository root:
+    python -m benchmarks.bench_http_client
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmarks.fixture_server import start_server
+from booking_scraper import http_client
+
+
+def measure(urls, get):
+    latencies = []
+    for url in urls:
+        start = time.perf_counter()
+        get(url).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label, latencies, connections):
+    print(f"{label:<8} mean {statistics.mean(latencies) * 1000:7.2f} ms, "
+          f"median {statistics.median(latencies) * 1000:7.2f} ms, {connections} connections opened")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Server-side delay per request in seconds")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    urls = [f"{base_url}/hotel/it/fixture-{i}.html" for i in range(args.requests)]
+    try:
+        bare = measure(urls, lambda url: requests.get(url, headers=http_client.HEADERS))
+        bare_connections = server.connection_count
+
+        session = http_client.create_session()
+        pooled = measure(urls, lambda url: session.get(url, timeout=(http_client.CONNECT_TIMEOUT, http_client.READ_TIMEOUT)))
+        pooled_connections = server.connection_count - bare_connections
+    finally:
+        server.shutdown()
+
+    report("Bare", bare, bare_connections)
+    report("Pooled", pooled, pooled_connections)
+    print(f"Client-side pool stats: {http_client.connection_stats(session)}")
+
+
+if __name__ == "__main__":
+    main()
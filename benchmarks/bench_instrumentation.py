@@ -0,0 +1,73 @@
+"""Cost of the run instrumentation, per call and on a detail-page crawl, with recording on and off.
+
+Detail pages come from a local fixture server with no added latency, so the
+crawl comparison is as unfavourable to the instrumentation as it gets.
+
+Run from the repository root:
+    python -m benchmarks.bench_instrumentation
+"""
+import argparse
+import time
+
+from benchmarks.fixture_server import load_fixture, start_server
+from booking_scraper import http_client, instrumentation
+from booking_scraper.extract import extract_details
+from booking_scraper.fetching import HostRateLimiter, fetch_all
+
+
+def noop():
+    return None
+
+
+@instrumentation.timed("bench.noop")
+def timed_noop():
+    return None
+
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def crawl(links):
+    limiter = HostRateLimiter(rate=100000, capacity=10000)
+    start = time.perf_counter()
+    fetch_all(links, lambda link: extract_details(http_client.get(link).content), limiter=limiter)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+
+    baseline = per_call(noop, args.calls)
+    for enabled in (False, True):
+        instrumentation.ENABLED = enabled
+        overhead = per_call(timed_noop, args.calls) - baseline
+        print(f"timed() call, recording {'on ' if enabled else 'off'}: {overhead * 1e9:7.0f} ns overhead")
+
+    page = load_fixture("detail.html")
+    server, base_url = start_server(latency=0, route=lambda path: page)
+    try:
+        links = [f"{base_url}/hotel/it/fixture-{n}.html" for n in range(args.pages)]
+        crawl(links)  # Warm the connection pool
+        for enabled in (False, True, False, True):
+            instrumentation.ENABLED = enabled
+            instrumentation.reset()
+            elapsed = crawl(links)
+            print(f"crawl of {args.pages} pages, recording {'on ' if enabled else 'off'}: {elapsed:6.3f}s "
+                  f"({elapsed / args.pages * 1e3:.3f} ms/page)")
+        report = instrumentation.snapshot()
+        print(f"Last run recorded {report['counters'].get('http.requests', 0)} responses, "
+              f"{report['counters'].get('http.bytes', 0) / 1e6:.1f} MB, parse p50 "
+              f"{report['timers']['parse.details']['p50'] * 1e3:.1f} ms")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Browserless listing of a city from recorded search-result pages.
+
+Run from the repository root:
+    python -m benchmarks.bench_listing
+"""
+import argparse
+import resource
+import time
+import tracemalloc
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixture_server import load_fixture, start_server
+from booking_scraper.fetching import HostRateLimiter
+from booking_scraper.listing import scrape_booking_http
+
+RECORDED_OFFSETS = (0, 25, 50)  # The fixture city has 60 results over three pages
+
+
+def search_route(path):
+    """Serve the recorded page for the requested offset, or an empty results page past the end."""
+    offset = int(parse_qs(urlsplit(path).query).get("offset", ["0"])[0])
+    if offset in RECORDED_OFFSETS:
+        return load_fixture(f"search_offset_{offset}.html")
+    return load_fixture("search_empty.html")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="Server-side delay per request in seconds")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency, route=search_route)
+    search_url = f"{base_url}/searchresults.html?ss={{city}}"
+    limiter = HostRateLimiter(rate=10000, capacity=1000)  # One local host; measure parsing, not politeness
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        listed = [len(scrape_booking_http(f"City {i}", base_url=search_url, limiter=limiter)) for i in range(args.cities)]
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert all(count == 60 for count in listed), f"expected 60 listings per city, got {listed}"
+    print(f"{args.cities} cities, {sum(listed)} listings in {elapsed:.2f}s ({args.cities / elapsed:.1f} cities/sec)")
+    print(f"Peak Python heap {peak / 2**20:.1f} MB, process max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""End-to-end crawl time with nested stages (the old main loop) versus the pipelined enricher.
+
+Search, detail and contact pages come from a local fixture server and
+searches from a stub that sleeps like a remote search engine would. Both
+runs work in a scratch directory so checkpoint, index and store files start
+empty.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline
+"""
+import argparse
+import os
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.fixture_server import StubSearch, replay_route, start_server
+from booking_scraper import http_client
+from booking_scraper.checkpoint import CheckpointStore
+from booking_scraper.contact_resolver import CONTACT_BATCH_SIZE, ContactResolver
+from booking_scraper.enrichment import Enricher
+from booking_scraper.extract import extract_details
+from booking_scraper.fetching import HostRateLimiter, fetch_all
+from booking_scraper.listing import scrape_booking_http
+from booking_scraper.sink import RowSink
+
+
+def local(base_url, link):
+    return base_url + urlsplit(link).path
+
+
+def nested(cities, base_url, search_url, resolver, limiter):
+    """The old main loop: list a whole city, then fetch its details, then its contacts."""
+    sink = RowSink("nested.csv")
+    for city in cities:
+        accommodations = scrape_booking_http(city, base_url=search_url, limiter=limiter)
+        details = fetch_all([local(base_url, a["Link"]) for a in accommodations],
+                            lambda link: extract_details(http_client.get(link).content), limiter=limiter)
+        for accommodation, (address, property_type) in zip(accommodations, details):
+            accommodation["Address"] = address
+            accommodation["Property Type"] = property_type
+        for start in range(0, len(accommodations), CONTACT_BATCH_SIZE):
+            batch = accommodations[start:start + CONTACT_BATCH_SIZE]
+            for accommodation, contact_details in zip(batch, resolver.resolve_batch(batch)):
+                accommodation["Email"] = contact_details["Emails"][0]
+                accommodation["Phone Number"] = contact_details["Phones"][0]
+                sink.write(accommodation)
+    sink.close()
+    return sink.rows, None
+
+
+def pipelined(cities, base_url, search_url, resolver, limiter, contact_workers=1):
+    sink = RowSink("pipelined.csv")
+    enricher = Enricher(CheckpointStore(), sink, lambda link: extract_details(http_client.get(local(base_url, link)).content),
+                        lambda city, accommodations: None, contact_resolver=resolver, limiter=limiter,
+                        contact_workers=contact_workers)
+    for city in cities:
+        enricher.city_listed(city, scrape_booking_http(city, base_url=search_url, on_listing=enricher.submit, limiter=limiter))
+    enricher.pipeline.close()
+    enricher.done.set()
+    sink.close()
+    return sink.rows, enricher.pipeline.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Server-side delay per page in seconds")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Seconds per stub search")
+    parser.add_argument("--contact-workers", type=int, default=4, help="Contact stage workers in the tuned pipelined run")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency, route=replay_route)
+    search_url = f"{base_url}/searchresults.html?ss={{city}}"
+    cities = [f"City {n}" for n in range(args.cities)]
+    try:
+        runs = (
+            ("nested", nested),
+            ("pipelined", pipelined),
+            (f"pipelined, {args.contact_workers} contact workers", lambda *run_args: pipelined(*run_args, args.contact_workers)),
+        )
+        for name, run in runs:
+            with tempfile.TemporaryDirectory() as directory:
+                cwd = os.getcwd()
+                os.chdir(directory)
+                try:
+                    resolver = ContactResolver(search=StubSearch(base_url, args.search_latency), fetch=http_client.get,
+                                               limiter=HostRateLimiter(rate=1000, capacity=100))
+                    start = time.perf_counter()
+                    rows, stats = run(cities, base_url, search_url, resolver, HostRateLimiter(rate=1000, capacity=100))
+                    elapsed = time.perf_counter() - start
+                finally:
+                    os.chdir(cwd)
+            print(f"{name:<32} {rows} rows in {elapsed:6.2f}s ({rows / elapsed:6.1f} rows/sec)")
+            for stage, stage_stats in (stats or {}).items():
+                print(f"  {stage:<9} {stage_stats['workers']:2d} workers, peak queue {stage_stats['max_depth']:4d}, "
+                      f"{stage_stats['utilisation']:5.1%} busy")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
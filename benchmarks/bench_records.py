@@ -0,0 +1,106 @@
+"""Memory per record and build/export time for a million accommodations as dicts, slotted records and a RecordBuffer.
+
+Rows look like enriched listings: unique names, links, addresses and
+contacts, cities and property types from small sets, and a share of missing
+contacts. Memory is what tracemalloc sees still allocated once every row is
+held, strings included.
+
+Run from the repository root:
+    python -m benchmarks.bench_records
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import pandas as pd
+
+from booking_scraper.records import COLUMNS, Accommodation, RecordBuffer
+
+CITIES = ["Venice", "Verona", "Rome", "Florence", "Naples", "Milan", "Bologna", "Palermo", "Bari", "Turin"]
+PROPERTY_TYPES = ["Hotel", "Apartment", "Bed and Breakfast", "Guest house", "Villa", "Holiday home"]
+
+
+def raw_rows(count, missing_contacts=0.3):
+    """Field values as the listing and enrichment stages produce them, one tuple per row."""
+    for n in range(count):
+        city = CITIES[n % len(CITIES)]
+        contacted = (n * 7919) % 100 >= missing_contacts * 100
+        yield (
+            f"Hotel Fixture {n}",
+            city,
+            f"https://www.booking.com/hotel/it/fixture-{n}.html",
+            f"Via Roma {n % 300}, {30100 + n % 900} {city}, Italy",
+            PROPERTY_TYPES[n % len(PROPERTY_TYPES)],
+            f"info@fixture{n}.it" if contacted else "N/A",
+            f"+39 041 {n % 1000:03d} {n % 10000:04d}" if contacted else "N/A",
+        )
+
+
+def build_dicts(count):
+    return [dict(zip(COLUMNS, values)) for values in raw_rows(count)]
+
+
+def build_records(count):
+    return [Accommodation(*values) for values in raw_rows(count)]
+
+
+def build_buffer(count):
+    buffer = RecordBuffer()
+    for values in raw_rows(count):
+        buffer.append(Accommodation(*values))
+    return buffer
+
+
+def dicts_frame(rows):
+    return pd.DataFrame(rows, columns=list(COLUMNS))
+
+
+def records_frame(rows):
+    return pd.DataFrame([record.values() for record in rows], columns=list(COLUMNS))
+
+
+def buffer_frame(buffer):
+    return buffer.frame()
+
+
+def measure(build, frame, count):
+    gc.collect()
+    start = time.perf_counter()
+    rows = build(count)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    frame(rows)
+    exported = time.perf_counter() - start
+    del rows
+    gc.collect()
+
+    tracemalloc.start()
+    rows = build(count)
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+    gc.collect()
+    return memory, built, exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = {}
+    for name, build, frame in (("dicts", build_dicts, dicts_frame),
+                               ("records", build_records, records_frame),
+                               ("buffer", build_buffer, buffer_frame)):
+        memory, built, exported = measure(build, frame, args.records)
+        results[name] = memory
+        print(f"{name:<8} {memory / 2**20:8.1f} MB ({memory / args.records:6.1f} bytes/record), "
+              f"built in {built:5.2f}s, DataFrame in {exported:5.2f}s")
+    print(f"Slotted records use {1 - results['records'] / results['dicts']:.0%} less memory than dicts, "
+          f"the columnar buffer {1 - results['buffer'] / results['dicts']:.0%} less.")
+
+
+if __name__ == "__main__":
+    main()
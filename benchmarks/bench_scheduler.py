@@ -0,0 +1,129 @@
+"""Freshness per request of the refresh scheduler against full recrawls, on a simulated clock.
+
+Detail pages come from a local fixture server whose addresses change over
+simulated days, a few listings often and most rarely; contact lookups are a
+local stub. Each strategy reports its request volume and the share of
+listings whose saved fields matched the live ones, averaged over the days.
+
+Run from the repository root:
+    python -m benchmarks.bench_scheduler
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+
+from benchmarks.fixture_server import load_fixture, start_server
+from booking_scraper import http_client
+from booking_scraper.extract import extract_details
+from booking_scraper.fetching import HostRateLimiter, fetch_all
+from booking_scraper.scheduler import KIND_COST, RefreshScheduler, run_refresh
+
+DAY = 24 * 3600
+current_world = [None]  # The fixture server answers from the world being simulated
+FIXTURE_PATH = re.compile(r"/hotel/it/fixture-(\d+)\.html")
+
+
+class World:
+    """The live state of every listing, changing day by day."""
+
+    def __init__(self, listings, seed=1):
+        self.rng = random.Random(seed)
+        # A tenth of the listings change often (new address text, new contact), the rest rarely
+        self.change_rates = [0.15 if self.rng.random() < 0.1 else 0.005 for _ in range(listings)]
+        self.address_versions = [0] * listings
+        self.contact_versions = [0] * listings
+        self.page = load_fixture("detail.html").decode("utf-8")
+
+    def next_day(self):
+        for n, rate in enumerate(self.change_rates):
+            if self.rng.random() < rate:
+                self.address_versions[n] += 1
+            if self.rng.random() < rate / 2:
+                self.contact_versions[n] += 1
+
+    def truth(self, n):
+        return {"Address": f"Calle Larga {self.address_versions[n] + 1}, San Marco, 30124 Venice, Italy",
+                "Email": f"info{self.contact_versions[n]}@fixture-{n}.it"}
+
+    def route(self, path):
+        match = FIXTURE_PATH.match(path)
+        if not match:
+            return None
+        return self.page.replace("Calle Larga 1", f"Calle Larga {self.address_versions[int(match.group(1))] + 1}").encode("utf-8")
+
+    def resolve_contacts(self, accommodations):
+        return [{"Emails": [self.truth(listing_number(a))["Email"]], "Phones": ["+39 041 600 0000"]} for a in accommodations]
+
+
+def listing_number(accommodation):
+    return int(FIXTURE_PATH.search(accommodation["Link"]).group(1))
+
+
+def fetch_details(links):
+    limiter = HostRateLimiter(rate=10000, capacity=1000)  # One local host; measure requests, not politeness
+    return fetch_all(links, lambda link: extract_details(http_client.get(link).content), limiter=limiter)
+
+
+def freshness(world, known):
+    fresh = 0
+    for n, fields in known.items():
+        truth = world.truth(n)
+        fresh += fields.get("Address") == truth["Address"] and fields.get("Email") == truth["Email"]
+    return fresh / len(known)
+
+
+def simulate(listings, days, base_url, strategy, budget=None, recrawl_every=1):
+    world = World(listings)
+    current_world[0] = world
+    accommodations = [{"Name": f"Hotel Fixture {n}", "City": "Venice", "Link": f"{base_url}/hotel/it/fixture-{n}.html"}
+                      for n in range(listings)]
+    known = {}
+    requests = 0
+    scores = []
+    with tempfile.TemporaryDirectory() as directory:
+        now = [0.0]
+        scheduler = RefreshScheduler(os.path.join(directory, "schedule.sqlite"), clock=lambda: now[0])
+        scheduler.add_listings(accommodations)
+        for day in range(days):
+            now[0] = day * DAY
+            if strategy == "scheduler":
+                # The first day fetches everything, like the first crawl would
+                day_budget = budget if day else listings * sum(KIND_COST.values())
+                refreshed = run_refresh(scheduler, day_budget, fetch_details, world.resolve_contacts)
+                for accommodation in refreshed.values():
+                    known[listing_number(accommodation)] = dict(accommodation)
+                requests = scheduler.stats["requests"]
+            elif day % recrawl_every == 0:
+                details = fetch_details([a["Link"] for a in accommodations])
+                contacts = world.resolve_contacts(accommodations)
+                for accommodation, (address, _), contact in zip(accommodations, details, contacts):
+                    known[listing_number(accommodation)] = {"Address": address, "Email": contact["Emails"][0]}
+                requests += listings * sum(KIND_COST.values())
+            scores.append(freshness(world, known))
+            world.next_day()
+        scheduler.close()
+    return requests, sum(scores) / len(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=300)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--budget", type=int, default=300, help="Scheduler requests per day")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=0, route=lambda path: current_world[0].route(path))
+    try:
+        for name, kwargs in (("daily recrawl", {"strategy": "full", "recrawl_every": 1}),
+                             ("weekly recrawl", {"strategy": "full", "recrawl_every": 7}),
+                             ("scheduler", {"strategy": "scheduler", "budget": args.budget})):
+            requests, fresh = simulate(args.listings, args.days, base_url, **kwargs)
+            print(f"{name:<15} {requests:8d} requests, {fresh:6.1%} of listings fresh on average")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Import time of each command, against everything the old crawl scripts imported before doing any work.
+
+Every measurement is a fresh interpreter importing what one command loads
+before its first request; the interpreter's own startup is left out. The
+heavy third-party packages each one pulled in are listed next to it.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY = ("pandas", "selenium", "webdriver_manager", "googlesearch", "pyarrow")
+IMPORTS = {
+    "scripts (before)": "selenium.webdriver.common.by, selenium.webdriver.support.expected_conditions, "
+                        "booking_scraper.browser_pool, booking_scraper.checkpoint, booking_scraper.enrichment, "
+                        "booking_scraper.extract, booking_scraper.http_client, booking_scraper.instrumentation, "
+                        "booking_scraper.listing, booking_scraper.records, booking_scraper.sink, booking_scraper.waits, "
+                        "pandas, googlesearch",  # What scraping.py and its modules loaded at startup
+    "--help": "booking_scraper.cli",
+    "list": "booking_scraper.cli, booking_scraper.crawl",
+    "details/contacts": "booking_scraper.cli, booking_scraper.crawl, booking_scraper.enrichment",
+    "browser fallback": "booking_scraper.cli, booking_scraper.crawl, booking_scraper.browser_pool, booking_scraper.browser",
+    "merge": "booking_scraper.cli, booking_scraper.merge",
+}
+SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import {modules}
+print(time.perf_counter() - start)
+print(" ".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(modules):
+    output = subprocess.run([sys.executable, "-c", SNIPPET.format(modules=modules, heavy=HEAVY)],
+                            capture_output=True, text=True, check=True).stdout.splitlines()
+    return float(output[0]), output[1] if len(output) > 1 else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per command; the median is shown")
+    args = parser.parse_args()
+
+    measure(IMPORTS["scripts (before)"])  # Warm the OS file cache and the bytecode caches
+    for name, modules in IMPORTS.items():
+        results = [measure(modules) for _ in range(args.runs)]
+        seconds = statistics.median(seconds for seconds, _ in results)
+        print(f"{name:<18} {seconds * 1000:7.1f} ms   {results[0][1] or '-'}")
+
+
+if __name__ == "__main__":
+    main()
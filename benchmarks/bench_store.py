@@ -0,0 +1,69 @@
+"""Query latency of the accommodation store on a multi-million-row history, against a full pandas load.
+
+Run from the repository root:
+    python -m benchmarks.bench_store
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from booking_scraper.store import CITY_REGIONS, AccommodationStore
+
+PROPERTY_TYPES = ["Hotel", "Apartment", "Bed and Breakfast", "Guesthouse", "Vacation Home", "Villa"]
+QUERIES = {
+    "B&Bs in Puglia without a phone": {"region": "Puglia", "property_type": "Bed and Breakfast", "missing": ["Phone Number"]},
+    "one link, every run": {"link": "https://www.booking.com/hotel/it/fixture-bari-7.html"},
+    "latest Venice run": {"city": "Venice", "latest": True},
+}
+
+
+def build_rows(city, listings, rng):
+    return [
+        {"Name": f"Fixture {city} {n}", "City": city, "Link": f"https://www.booking.com/hotel/it/fixture-{city.lower()}-{n}.html",
+         "Address": f"Via Roma {n}, {city}, Italy", "Property Type": rng.choice(PROPERTY_TYPES),
+         "Email": "info@hotelfixture.it" if rng.random() < 0.4 else "N/A",
+         "Phone Number": "+39 041 600 0000" if rng.random() < 0.6 else "N/A"}
+        for n in range(listings)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Run dates in the history")
+    parser.add_argument("--listings", type=int, default=1000, help="Listings per city and run")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    cities = sorted(CITY_REGIONS)
+    with tempfile.TemporaryDirectory() as directory:
+        store = AccommodationStore(os.path.join(directory, "accommodations.sqlite"))
+        start = time.perf_counter()
+        for run in range(args.runs):
+            run_date = f"2024-{run // 28 + 1:02d}-{run % 28 + 1:02d}"
+            for city in cities:
+                store.add_rows(build_rows(city, args.listings, rng), run_date)
+        rows = args.runs * len(cities) * args.listings
+        print(f"loaded   {rows} rows in {time.perf_counter() - start:.1f}s")
+
+        for name, filters in QUERIES.items():
+            start = time.perf_counter()
+            found = store.query(**filters)
+            print(f"store    {name:<32} {len(found):7d} rows in {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        # The same question answered the old way: load everything, then filter
+        export = os.path.join(directory, "total.parquet")
+        pd.DataFrame(store.query()).to_parquet(export, index=False)
+        start = time.perf_counter()
+        df = pd.read_parquet(export)
+        puglia = [city for city, region in CITY_REGIONS.items() if region == "Puglia"]
+        found = df[df["City"].isin(puglia) & (df["Property Type"] == "Bed and Breakfast") & (df["Phone Number"] == "N/A")]
+        print(f"pandas   {'B&Bs in Puglia without a phone':<32} {len(found):7d} rows in {(time.perf_counter() - start) * 1000:8.1f} ms (Parquet, not Excel)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""End-to-end benchmark suite: every scraper stage against recorded pages on a local replay server.
+
+Listing, detail pages, contact lookups and the merge run against the pages in
+benchmarks/fixtures, served with configurable latency, jitter and injected
+503s. Each stage reports throughput, p50/p99 latency per call and peak Python
+memory of this process (merge converts files in worker processes, which are
+not counted). Results are appended to benchmarks/results.jsonl together with the
+commit they were measured on, and compared with the last run that used the
+same settings so regressions show up between versions. Every pass also checks
+its output against what the fixtures contain, so a change that gets faster by
+losing or garbling data fails the suite instead of improving it. The browser
+listing ("Load more" clicks) runs only with --browser and needs Google Chrome.
+
+Run from the repository root:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --error-rate 0.05 --check
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fixture_server import StubSearch, replay_route, start_server
+from booking_scraper import instrumentation
+from booking_scraper.contact_resolver import CONTACT_BATCH_SIZE, ContactResolver
+from booking_scraper.fetching import HostRateLimiter, fetch_all
+from booking_scraper.records import COLUMNS
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results.jsonl")
+TOLERANCE = 0.2  # Relative drop in throughput (or rise in p99) reported as a regression
+
+# What the fixtures contain, for checking each scenario's output
+FIXTURE_LISTINGS = 60  # Results per city over the recorded search pages
+FIXTURE_DETAILS = ("Calle Larga 1, San Marco, 30124 Venice, Italy", "Hotel")  # Address and type of detail.html
+FIXTURE_EMAILS = {"booking@hotelfixture.it", "reception@hotelfixture.it", "direzione@hotelfixture.it",
+                  "info@hotelfixture.it", "gruppi@hotelfixture.it"}  # Found on contact_page.html
+FIXTURE_PHONES = {"+39 041 520 0000", "+39 041 520 0001", "+39 041 520 0002", "+39 041 520 0003", "+39 041 520 0004"}
+BROWSER_LISTINGS = 100  # Cards per city in search_results.html: 4 pages of 25
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class Recorder:
+    """Collects per-call latencies from any number of threads."""
+
+    def __init__(self):
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def wrap(self, func):
+        def timed_call(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                with self.lock:
+                    self.samples.append(time.perf_counter() - start)
+        return timed_call
+
+
+class WrongResult(Exception):
+    """A scenario's output doesn't match the fixtures."""
+
+
+def expect(condition, message):
+    if not condition:
+        raise WrongResult(message)
+
+
+def generous_limiter():
+    return HostRateLimiter(rate=100000, capacity=10000)  # One local host; measure the code, not politeness
+
+
+# Each scenario runs one pass, checks its output and returns the number of items it
+# handled; `run` is the pass number so every pass requests pages the response cache has not seen.
+
+def bench_listing(args, base_url, recorder, run):
+    from booking_scraper.listing import scrape_booking_http
+    search_url = f"{base_url}/searchresults.html?ss={{city}}"
+    limiter = generous_limiter()
+    scrape = recorder.wrap(lambda city: scrape_booking_http(city, 0, search_url, limiter=limiter))
+    items = 0
+    for n in range(args.cities):
+        city = f"City {run} {n}"
+        accommodations = scrape(city)
+        links = {accommodation["Link"] for accommodation in accommodations}
+        expect(len(accommodations) == FIXTURE_LISTINGS, f"{city}: {len(accommodations)} listings, expected {FIXTURE_LISTINGS}")
+        expect(len(links) == FIXTURE_LISTINGS, f"{city}: {len(links)} distinct links")
+        expect(all(accommodation["City"] == city for accommodation in accommodations), f"{city}: listings of another city")
+        items += len(accommodations)
+    return items
+
+
+def bench_details(args, base_url, recorder, run):
+    from booking_scraper.crawl import scrape_address_property
+    links = [f"{base_url}/hotel/it/fixture-{run}-{n}.html" for n in range(args.pages)]
+    results = fetch_all(links, recorder.wrap(scrape_address_property), limiter=generous_limiter())
+    wrong = [result for result in results if result != FIXTURE_DETAILS]
+    expect(not wrong, f"{len(wrong)} of {len(results)} detail pages not read as {FIXTURE_DETAILS}, e.g. {wrong[:1]}")
+    return len(results)
+
+
+def bench_contacts(args, base_url, recorder, run):
+    # The resolver's own fetch (cached_bounded_get), as in a crawl: contact pages go through the response cache
+    resolver = ContactResolver(search=StubSearch(base_url, args.search_latency), limiter=generous_limiter())
+    listings = [{"Name": f"Hotel Fixture {run}-{n}", "City": "Venice"} for n in range(args.listings)]
+    resolve = recorder.wrap(resolver.resolve_batch)
+    results = []
+    for start in range(0, len(listings), CONTACT_BATCH_SIZE):
+        results += resolve(listings[start:start + CONTACT_BATCH_SIZE])
+    expect(len(results) == len(listings), f"{len(results)} contact results for {len(listings)} listings")
+    for listing, contact_details in zip(listings, results):
+        expect(not contact_details["Failed"], f"{listing['Name']}: lookup failed")
+        expect(set(contact_details["Emails"]) == FIXTURE_EMAILS, f"{listing['Name']}: emails {contact_details['Emails']}")
+        expect(set(contact_details["Phones"]) == FIXTURE_PHONES, f"{listing['Name']}: phones {contact_details['Phones']}")
+    return len(listings)
+
+
+def bench_merge(args, base_url, recorder, run):
+    from booking_scraper import merge
+    shutil.rmtree(merge.MASTER_DIR, ignore_errors=True)  # Rebuild the master store from scratch every pass
+    with contextlib.redirect_stdout(io.StringIO()):  # One line per city file otherwise
+        manifest = recorder.wrap(merge.merge)()
+    rows = sum(entry["rows"] for entry in manifest.values())
+    expect(len(manifest) == args.merge_files, f"{len(manifest)} city files merged, expected {args.merge_files}")
+    expect(rows == args.merge_files * args.merge_rows, f"{rows} rows merged, expected {args.merge_files * args.merge_rows}")
+    stored = pd.read_parquet(merge.MASTER_DIR)
+    expect(len(stored) == rows, f"{len(stored)} rows in the master store, {rows} in the manifest")
+    return rows
+
+
+def bench_browser(args, base_url, recorder, run):
+    from booking_scraper.browser import scrape_booking
+    search_url = f"{base_url}/searchresults.html?ss={{city}}&pages=4&load_delay=200"
+    scrape = recorder.wrap(lambda city: scrape_booking(city, max_results=0, base_url=search_url, headless=True))
+    items = 0
+    for n in range(args.browser_cities):
+        city = f"Fixture City {n}"
+        accommodations = scrape(city)
+        links = {accommodation["Link"] for accommodation in accommodations}
+        expect(len(accommodations) == BROWSER_LISTINGS, f"{city}: {len(accommodations)} listings, expected {BROWSER_LISTINGS}")
+        expect(len(links) == BROWSER_LISTINGS, f"{city}: {len(links)} distinct links")
+        items += len(accommodations)
+    return items
+
+
+SCENARIOS = {
+    "listing": bench_listing,
+    "details": bench_details,
+    "contacts": bench_contacts,
+    "merge": bench_merge,
+}
+
+
+def write_city_files(args):
+    """City files like the contacts command saves them, for the merge scenario."""
+    os.makedirs("scraping", exist_ok=True)
+    for n in range(args.merge_files):
+        rows = [[f"Hotel {n}-{row}", f"City {n}", f"https://www.booking.com/hotel/it/h-{n}-{row}.html",
+                 f"Via Roma {row}, Italy", "Hotel", f"info{row}@h{n}.it", f"+39 041 {row:07d}"]
+                for row in range(args.merge_rows)]
+        pd.DataFrame(rows, columns=COLUMNS).to_excel(os.path.join("scraping", f"City {n}_accommodations.xlsx"), index=False)
+
+
+def measure(scenario, args, base_url):
+    """Time one pass, then repeat it under tracemalloc for the memory peak."""
+    instrumentation.reset()
+    recorder = Recorder()
+    start = time.perf_counter()
+    items = scenario(args, base_url, recorder, 0)
+    elapsed = time.perf_counter() - start
+    counters = instrumentation.snapshot()["counters"]
+    result = {
+        "items": items,
+        "seconds": elapsed,
+        "per_second": items / elapsed,
+        "calls": len(recorder.samples),
+        "p50_ms": percentile(recorder.samples, 0.5) * 1e3,
+        "p99_ms": percentile(recorder.samples, 0.99) * 1e3,
+        "requests": counters.get("http.requests", 0),
+        "retries": counters.get("http.retries", 0),
+    }
+    if args.memory:
+        tracemalloc.start()
+        scenario(args, base_url, Recorder(), 1)
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(record, previous):
+    """Print the change from `previous` per scenario; returns the scenarios that regressed."""
+    regressions = []
+    print(f"Compared with {previous['commit']} from {previous['timestamp']}:")
+    for name, result in record["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before is None:
+            continue
+        throughput = result["per_second"] / before["per_second"] - 1
+        p99 = result["p99_ms"] / max(before["p99_ms"], 1e-9) - 1
+        regressed = throughput < -TOLERANCE or p99 > TOLERANCE
+        if regressed:
+            regressions.append(name)
+        print(f"  {name:<9} throughput {throughput:+7.1%}, p99 {p99:+7.1%}" + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS) + ["browser"], help="Scenarios to run")
+    parser.add_argument("--cities", type=int, default=5, help="Cities listed over HTTP")
+    parser.add_argument("--pages", type=int, default=300, help="Detail pages fetched")
+    parser.add_argument("--listings", type=int, default=200, help="Listings whose contacts are resolved")
+    parser.add_argument("--merge-files", type=int, default=20)
+    parser.add_argument("--merge-rows", type=int, default=500, help="Rows per city file")
+    parser.add_argument("--browser", action="store_true", help="Also list cities in Chrome by clicking 'Load more'")
+    parser.add_argument("--browser-cities", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.02, help="Server-side delay per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Seconds per stub search")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc passes")
+    parser.add_argument("--results", default=RESULTS_FILE, help="JSONL file the results are appended to")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if a scenario regressed")
+    args = parser.parse_args()
+
+    names = args.only or list(SCENARIOS) + (["browser"] if args.browser else [])
+    scenarios = dict(SCENARIOS, browser=bench_browser)
+    server, base_url = start_server(latency=args.latency, route=replay_route, jitter=args.jitter,
+                                    error_rate=args.error_rate, seed=args.seed)
+    if "browser" in names:
+        browser_server, browser_url = start_server(fixture="search_results.html", latency=0)
+    results = {}
+    cwd = os.getcwd()
+    results_path = os.path.abspath(args.results)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)  # Caches, checkpoints and merge output start empty
+            if "merge" in names:
+                write_city_files(args)
+            for name in names:
+                try:
+                    results[name] = measure(scenarios[name], args, browser_url if name == "browser" else base_url)
+                except WrongResult as e:
+                    print(f"{name:<9} WRONG RESULT: {e}")
+                    sys.exit(1)  # Nothing is appended: a wrong run is no baseline
+                result = results[name]
+                print(f"{name:<9} {result['items']:7d} items in {result['seconds']:6.2f}s ({result['per_second']:8.1f}/s), "
+                      f"p50 {result['p50_ms']:7.1f} ms, p99 {result['p99_ms']:7.1f} ms"
+                      + (f", peak {result['peak_mb']:6.1f} MB" if "peak_mb" in result else "")
+                      + (f", {result['retries']} retries" if result["retries"] else ""))
+            os.chdir(cwd)
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        if "browser" in names:
+            browser_server.shutdown()
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("results", "check", "only", "browser")}
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "settings": settings,
+        "scenarios": results,
+    }
+    previous = [r for r in load_results(results_path) if r["settings"] == settings and r["machine"] == record["machine"]]
+    regressions = compare(record, previous[-1]) if previous else []
+    with open(results_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Results appended to {results_path}.")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Wall-clock time of scrape_booking per city on a local search-results fixture.
+
+Needs Google Chrome. Run from the repository root:
+    python -m benchmarks.bench_waits
+"""
+import argparse
+import time
+
+from benchmarks.fixture_server import start_server
+from booking_scraper.browser import scrape_booking
+from booking_scraper import waits
+
+# Fixed sleeps the search flow used before it waited on page conditions:
+# 10s for the sign-in modal, 2s after every scroll and every "Load more" click,
+# plus the 10s WebDriverWait that timed out on the last page.
+LEGACY_MODAL_SLEEP = 10
+LEGACY_SCROLL_SLEEP = 2
+LEGACY_CLICK_SLEEP = 2
+LEGACY_FINAL_TIMEOUT = 10
+
+
+def legacy_idle_seconds(pages):
+    return LEGACY_MODAL_SLEEP + LEGACY_SCROLL_SLEEP * pages + LEGACY_CLICK_SLEEP * (pages - 1) + LEGACY_FINAL_TIMEOUT
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=4, help="Result pages per city")
+    parser.add_argument("--load-delay", type=int, default=400, help="Milliseconds the fixture takes per 'Load more'")
+    args = parser.parse_args()
+
+    server, base_url = start_server(fixture="search_results.html", latency=0)
+    search_url = f"{base_url}/searchresults.html?ss={{city}}&pages={args.pages}&load_delay={args.load_delay}"
+    legacy = legacy_idle_seconds(args.pages)
+    try:
+        for i in range(args.cities):
+            city = f"Fixture City {i}"
+            start = time.perf_counter()
+            accommodations = scrape_booking(city, max_results=0, base_url=search_url, headless=True)
+            elapsed = time.perf_counter() - start
+            print(f"{city}: {len(accommodations)} listings in {elapsed:.2f}s "
+                  f"(fixed sleeps alone used to cost {legacy}s, saved ~{legacy - elapsed:.1f}s)")
+    finally:
+        server.shutdown()
+    print(f"Wait timeouts: PAGE_READY={waits.PAGE_READY_TIMEOUT}s LOAD_MORE={waits.LOAD_MORE_TIMEOUT}s "
+          f"NEW_RESULTS={waits.NEW_RESULTS_TIMEOUT}s")
+
+
+if __name__ == "__main__":
+    main()
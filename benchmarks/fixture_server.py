@@ -0,0 +1,108 @@
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+RECORDED_OFFSETS = (0, 25, 50)  # Search result pages recorded for one city: 60 results over three pages
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def replay_route(path):
+    """Answer like the live sites from the recorded pages.
+
+    Search pages (one set per city, so every city gets its own properties),
+    detail pages under /hotel/ and contact pages under /contact/.
+    """
+    parts = urlsplit(path)
+    if parts.path.startswith("/hotel/"):
+        return load_fixture("detail.html")
+    if parts.path.startswith("/contact/"):
+        return load_fixture("contact_page.html")
+    query = parse_qs(parts.query)
+    offset = int(query.get("offset", ["0"])[0])
+    if offset not in RECORDED_OFFSETS:
+        return load_fixture("search_empty.html")
+    city = query["ss"][0].lower().replace(" ", "-")
+    return load_fixture(f"search_offset_{offset}.html").replace(b"fixture-venice", f"fixture-{city}".encode())
+
+
+class StubSearch:
+    """Answers like a search engine, after `latency` seconds, with two local contact pages."""
+
+    def __init__(self, base_url, latency):
+        self.base_url = base_url
+        self.latency = latency
+
+    def __call__(self, query, num_results):
+        time.sleep(self.latency)
+        slug = query.split()[2]  # "Hotel Fixture <n> <city> phone email"
+        return [f"{self.base_url}/contact/{slug}-{n}" for n in range(2)]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves a fixture after an artificial delay.
+
+    `route(path)` picks the body for a request path; by default every path gets `body`.
+    A route returning None answers 404. Each response waits `latency` plus up
+    to `jitter` seconds, and a share `error_rate` of requests fails with
+    `error_status` and `Retry-After: 0`, like a throttling server would.
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep connections alive so pooling is measurable
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls between header and body writes
+    body = b""
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    error_status = 503
+    route = None
+
+    def do_GET(self):
+        time.sleep(self.latency + (self.server.rng.uniform(0, self.jitter) if self.jitter else 0))
+        if self.error_rate and self.server.rng.random() < self.error_rate:
+            body = b"Service unavailable"
+            self.send_response(self.error_status)
+            self.send_header("Retry-After", "0")
+        else:
+            body = self.body if self.route is None else self.route(self.path)
+            if body is None:
+                self.send_response(404)
+                body = b"Not found"
+            else:
+                self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+class CountingServer(ThreadingHTTPServer):
+    """Threaded server that counts accepted TCP connections."""
+
+    daemon_threads = True
+    connection_count = 0
+
+    def process_request(self, request, client_address):
+        self.connection_count += 1
+        super().process_request(request, client_address)
+
+
+def start_server(fixture="detail.html", latency=0.1, route=None, jitter=0.0, error_rate=0.0, error_status=503, seed=1):
+    """Start a fixture server on a free local port and return (server, base_url)."""
+    attributes = {"body": load_fixture(fixture), "latency": latency, "route": staticmethod(route) if route else None,
+                  "jitter": jitter, "error_rate": error_rate, "error_status": error_status}
+    handler = type("Handler", (FixtureHandler,), attributes)
+    server = CountingServer(("127.0.0.1", 0), handler)
+    server.rng = random.Random(seed)  # Same delays and failures on every run with the same seed
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
@@ -0,0 +1,6 @@
+"""Booking.com accommodation scraper.
+
+Run `python -m booking_scraper --help` for the commands. Importing the
+package loads nothing heavy: Selenium, pandas and the search client are only
+imported by the commands that need them.
+"""
@@ -0,0 +1,3 @@
+from booking_scraper.cli import main
+
+main()
@@ -0,0 +1,245 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from booking_scraper.instrumentation import count
+
+# Starting point and bounds of each host's request rate (per second) and concurrency
+START_RATE = 2.0
+MIN_RATE = 0.2
+MAX_RATE = 20.0
+START_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+SLOW_START_FACTOR = 1.1  # Until a host first pushes back, every healthy response raises its rate by 10%...
+RATE_INCREASE = 1.0  # ...after that it gains this many requests per second per second of healthy responses
+DECREASE_FACTOR = 0.5  # Rate and concurrency are multiplied by this on throttling (multiplicative decrease)
+DECREASE_INTERVAL = 2.0  # Seconds between two decreases, so one burst of failures only counts once
+LATENCY_FACTOR = 2.0  # Responses slower than this many times the host's best latency count as congestion...
+LATENCY_SLACK = 0.25  # ...once they are also this many seconds slower than it
+LATENCY_SMOOTHING = 0.2  # Weight of the newest response in the moving latency average
+PAUSE_SECONDS = 30  # A blocked host gets no requests for this long, doubling with every block in a row
+MAX_PAUSE_SECONDS = 600
+THROTTLE_STATUSES = (429, 503)
+BLOCK_STATUSES = (403,)
+# Challenge and captcha pages served instead of content; only the start of a page is scanned
+BLOCK_MARKERS = re.compile(
+    rb"px-captcha|awswaf|cf-chl-|Attention Required!|detected unusual traffic|/sorry/index|<title>Access Denied",
+    re.IGNORECASE,
+)
+BLOCK_SCAN_BYTES = 64 * 1024
+
+_local = threading.local()  # The slot of the request this thread is making, for the response hook
+
+
+class Slot:
+    """One request made through a limiter; `blocked` asks the caller to make it again later."""
+
+    def __init__(self, url):
+        self.url = url
+        self.state = None  # The HostState it was acquired from, for feedback while it is in flight
+        self.outcome = None  # "ok", "throttled", "error" or "blocked"; None if the network wasn't used
+        self.latency = None
+        self.retry_after = None
+        self.blocked = False
+
+
+def looks_blocked(response, read_body=True):
+    """True for block statuses and captcha or challenge pages served with any status."""
+    if response.status_code in BLOCK_STATUSES:
+        return True
+    return read_body and bool(BLOCK_MARKERS.search(response.content[:BLOCK_SCAN_BYTES]))
+
+
+def retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None  # An HTTP date; the default pause applies
+
+
+def record_response(response, *args, **kwargs):
+    """requests response hook: classify the response for the slot this thread is in.
+
+    A streamed body isn't read here, only its status is checked; readers of
+    streamed bodies call this again once they have the body.
+    """
+    response.blocked = looks_blocked(response, not kwargs.get("stream"))  # Also keeps challenge pages out of the response cache
+    slot = getattr(_local, "slot", None)
+    if slot is None:
+        return
+    retries = getattr(response.raw, "retries", None)
+    retried_statuses = [entry.status for entry in retries.history] if retries is not None else []
+    slot.latency = response.elapsed.total_seconds()
+    slot.retry_after = retry_after_seconds(response)
+    if response.blocked:
+        slot.outcome = "blocked"
+    elif response.status_code in THROTTLE_STATUSES or any(status in THROTTLE_STATUSES for status in retried_statuses):
+        slot.outcome = "throttled"  # Also when urllib3 retried past a 429/503 before succeeding
+    elif response.status_code >= 500:
+        slot.outcome = "error"
+    else:
+        slot.outcome = "ok"
+
+
+def record_retry(status, retry_after):
+    """Called by urllib3 before it retries a request, so throttling slows the host before the retries finish."""
+    slot = getattr(_local, "slot", None)
+    if slot is not None and slot.state is not None and status in THROTTLE_STATUSES:
+        slot.state.throttled(retry_after)
+
+
+def record_failure():
+    """Called when a request failed without a response (connection error, timeout)."""
+    slot = getattr(_local, "slot", None)
+    if slot is not None:
+        slot.outcome = "error"
+
+
+class HostState:
+    """Rate, concurrency and pause of one host, adjusted AIMD-style from its responses."""
+
+    def __init__(self, host):
+        self.host = host
+        self.rate = START_RATE
+        self.limit = float(START_CONCURRENCY)
+        self.in_flight = 0
+        self.next_at = 0.0  # Earliest start of the next request
+        self.paused_until = 0.0
+        self.pause = PAUSE_SECONDS
+        self.last_decrease = 0.0
+        self.slow_start = True  # Ramp up quickly until the first sign of throttling
+        self.latency = None  # Moving average
+        self.best_latency = None
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "blocked": 0, "decreases": 0}
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Block until the host is not paused, has a free slot and its rate allows another request."""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self.condition.wait(self.paused_until - now)
+                elif self.in_flight >= int(self.limit):
+                    self.condition.wait()
+                elif now < self.next_at:
+                    self.condition.wait(self.next_at - now)
+                else:
+                    break
+            self.next_at = max(self.next_at, now) + 1 / self.rate
+            self.in_flight += 1
+            self.stats["requests"] += 1
+
+    def release(self, slot):
+        with self.condition:
+            self.in_flight -= 1
+            if slot.outcome == "ok":
+                self._observe_latency(slot.latency)
+            elif slot.outcome == "blocked":
+                self._block()
+            elif slot.outcome in ("throttled", "error"):
+                self.stats["throttled" if slot.outcome == "throttled" else "errors"] += 1
+                self._decrease()
+                if slot.retry_after:
+                    self.paused_until = max(self.paused_until, time.monotonic() + slot.retry_after)
+            self.condition.notify_all()
+
+    def throttled(self, retry_after):
+        """Back off straight away on a 429/503 seen mid-request, honouring its Retry-After."""
+        with self.condition:
+            self._decrease()
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def _observe_latency(self, latency):
+        if latency is None:
+            return
+        self.latency = latency if self.latency is None else (
+            (1 - LATENCY_SMOOTHING) * self.latency + LATENCY_SMOOTHING * latency)
+        self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+        if self.latency > max(self.best_latency * LATENCY_FACTOR, self.best_latency + LATENCY_SLACK):
+            self._decrease()  # The server is slowing down under our load
+            return
+        self.pause = PAUSE_SECONDS  # Healthy again; the next block starts from the short pause
+        if self.slow_start:
+            self.rate = min(MAX_RATE, self.rate * SLOW_START_FACTOR)
+            self.limit = min(MAX_CONCURRENCY, self.limit + 1)
+        else:
+            self.rate = min(MAX_RATE, self.rate + RATE_INCREASE / self.rate)
+            self.limit = min(MAX_CONCURRENCY, self.limit + 1 / self.limit)
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self.last_decrease < DECREASE_INTERVAL:
+            return
+        self.last_decrease = now
+        self.slow_start = False
+        self.stats["decreases"] += 1
+        self.rate = max(MIN_RATE, self.rate * DECREASE_FACTOR)
+        self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+
+    def _block(self):
+        self.stats["blocked"] += 1
+        now = time.monotonic()
+        if now < self.paused_until:
+            return  # Requests already in flight when the block started
+        print(f"{self.host} looks blocked; pausing it for {self.pause:.0f}s.")
+        self.paused_until = now + self.pause
+        self.pause = min(MAX_PAUSE_SECONDS, self.pause * 2)
+        self.rate = max(MIN_RATE, min(self.rate * DECREASE_FACTOR, START_RATE))  # Resume gently
+        self.limit = 1.0
+        self.last_decrease = now
+        self.slow_start = False
+
+
+class AdaptiveLimiter:
+    """Per-host politeness that speeds up while a site answers well and backs off when it throttles.
+
+    A drop-in for `fetching.HostRateLimiter`: requests go through `slot(url)`,
+    and the response hook in `http_client` reports each response's status,
+    latency and block markers back to the host that served it.
+    """
+
+    def __init__(self):
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def host_for(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostState(host)
+            return self.hosts[host]
+
+    def wait(self, url):
+        """Wait for the host's rate only, for callers that don't report back."""
+        state = self.host_for(url)
+        state.acquire()
+        state.release(Slot(url))
+
+    @contextmanager
+    def slot(self, url):
+        state = self.host_for(url)
+        slot = Slot(url)
+        slot.state = state
+        state.acquire()
+        previous, _local.slot = getattr(_local, "slot", None), slot
+        try:
+            yield slot
+        finally:
+            _local.slot = previous
+            slot.blocked = slot.outcome == "blocked"
+            if slot.outcome not in (None, "ok"):
+                count(f"adaptive.{slot.outcome}")
+            state.release(slot)
+
+    def report(self):
+        """Current rate and concurrency limit plus counts for every host seen."""
+        report = {}
+        for host, state in list(self.hosts.items()):
+            with state.condition:
+                report[host] = dict(state.stats, rate=round(state.rate, 2), concurrency=int(state.limit))
+        return report
@@ -0,0 +1,108 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from booking_scraper.browser_pool import create_driver, print_page_stats
+from booking_scraper.instrumentation import timed
+from booking_scraper.listing import fetch_new_cards, format_city, parse_new_cards
+from booking_scraper.waits import (
+    LOAD_MORE_TIMEOUT, LOAD_MORE_XPATH, MODAL_GRACE_TIMEOUT, MODAL_SELECTOR, NEW_RESULTS_TIMEOUT,
+    PAGE_READY_TIMEOUT, modal_or_results, new_results_loaded, print_wait_stats, timed_wait,
+)
+from booking_scraper.settings import BASE_URL, HEADLESS, MAX_LIMIT
+
+# Dismiss the Modal by Clicking the Close Button
+@timed("dismiss_sign_in_modal")
+def dismiss_sign_in_modal(driver):
+    try:
+        print("Waiting for Sign-in modal or results to appear...")
+        found = timed_wait("modal_or_results", driver, modal_or_results, PAGE_READY_TIMEOUT)
+        if found and found[0] == "results":
+            # Results came first; give the modal a short grace period to pop up
+            found = timed_wait("modal_grace", driver, EC.element_to_be_clickable((By.CSS_SELECTOR, MODAL_SELECTOR)), MODAL_GRACE_TIMEOUT)
+            found = ("modal", found) if found else None
+        if not found:
+            print("Sign-in modal did not appear.")
+            return
+        found[1].click()
+        print("Sign-in modal dismissed by clicking the close button.")
+    except Exception as e:
+        print(f"Sign-in modal not found or could not be dismissed: {e}")
+
+# Close the Modal without Waiting if it Popped up Late
+def close_sign_in_modal_if_present(driver):
+    for close_button in driver.find_elements(By.CSS_SELECTOR, MODAL_SELECTOR):
+        try:
+            close_button.click()
+            print("Late sign-in modal dismissed.")
+        except Exception:
+            pass
+
+# Step 1: Scrape Booking.com for Accommodation Details
+@timed("scrape_booking")
+def scrape_booking(city, driver=None, on_listing=None, max_results=MAX_LIMIT, base_url=BASE_URL, headless=HEADLESS, stopping=None):
+    """List a city's accommodations in a browser, clicking "Load more results" until `max_results` (0: all).
+
+    `stopping` is an Event that ends the loop early, e.g. on Ctrl+C.
+    """
+    url = base_url.format(city=format_city(city))
+
+    # Reuse the pool's browser, or start one just for this city
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver(headless)
+    driver.get(url)
+
+    # Dismiss the Sign-in modal if it appears
+    dismiss_sign_in_modal(driver)
+
+    accommodations = []
+    seen_links = set()  # Links already collected, so no card is added twice
+    parsed_count = 0  # Number of cards on the page that have already been parsed
+
+    # Scrape only the accommodations added since the last pass
+    def collect_new_cards():
+        nonlocal parsed_count
+        new_cards = fetch_new_cards(driver, parsed_count)
+        parsed_count += len(new_cards)
+        new_accommodations = parse_new_cards(new_cards, city, seen_links)
+        if max_results != 0:
+            new_accommodations = new_accommodations[:max_results - len(accommodations)]
+        accommodations.extend(new_accommodations)
+        if on_listing is not None:
+            for accommodation in new_accommodations:
+                on_listing(accommodation)  # Hand each listing downstream as soon as it is parsed
+
+    while True:
+        # Check if scraping should stop
+        if stopping is not None and stopping.is_set():
+            print("Scraping stopped.")
+            break
+
+        # Scroll to the bottom to load the "Load More results" button
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        collect_new_cards()
+
+        if max_results != 0 and len(accommodations) >= max_results:
+            break  # Exit the loop once max_results is reached
+
+        # Check if "Load more results" button is present
+        try:
+            load_more_button = timed_wait("load_more_button", driver, EC.element_to_be_clickable((By.XPATH, LOAD_MORE_XPATH)), LOAD_MORE_TIMEOUT)
+            if load_more_button is None:
+                print("No 'Load more results' button found.")
+                break  # Exit loop when the button is not found (all results loaded)
+            close_sign_in_modal_if_present(driver)
+            load_more_button.click()
+            # Wait until new cards are appended
+            if timed_wait("new_results", driver, new_results_loaded(parsed_count), NEW_RESULTS_TIMEOUT) is None:
+                print("No new results appeared after clicking 'Load more results'.")
+                collect_new_cards()  # Keep any cards that arrived right at the timeout
+                break
+        except Exception as e:
+            print(f"Could not load more results: {e}")
+            break
+
+    print_page_stats(city, driver)  # Bytes and load time of the search page, lean or not
+    if own_driver:
+        driver.quit()
+    print_wait_stats(city)
+    return accommodations
@@ -0,0 +1,173 @@
+import os
+import queue
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from booking_scraper.instrumentation import count, observe
+
+BROWSER_WORKERS = os.cpu_count() or 2  # Number of browsers crawling cities in parallel
+CITIES_PER_DRIVER = 10  # Cities a browser searches (each with all its Load more pages) before it is restarted to release memory
+
+# Lean mode: only the HTML, CSS and first-party scripts the result cards need are downloaded
+LEAN_BROWSER = True
+LEAN_WINDOW_SIZE = "1280,800"  # Small, but wide enough that Booking.com keeps its desktop layout
+BLOCKED_RESOURCES = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",  # Images
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",  # Fonts
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",  # Media
+]
+BLOCKED_DOMAINS = [  # Ads, trackers and analytics loaded from third parties
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*adservice.google.*", "*facebook.net*", "*facebook.com/tr*", "*connect.facebook.*", "*bat.bing.com*",
+    "*clarity.ms*", "*hotjar.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*", "*nr-data.net*",
+    "*newrelic.com*", "*optimizely.com*", "*tiktok.com*", "*pinterest.com*", "*twitter.com*", "*linkedin.com*",
+]
+LEAN_ARGUMENTS = [
+    f"--window-size={LEAN_WINDOW_SIZE}",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    "--mute-audio",
+    "--no-first-run",
+]
+# Keeps the resource timings of the whole search session, not just the first 250 requests
+RESOURCE_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(10000);"
+PAGE_STATS_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    bytes: resources.reduce((total, entry) => total + (entry.transferSize || 0), navigation ? navigation.transferSize : 0),
+    requests: resources.length + 1,
+    dom_ready: navigation ? navigation.domContentLoadedEventEnd / 1000 : null,
+};
+"""
+
+_driver_path = None
+_install_lock = threading.Lock()
+
+
+def install_driver():
+    """Install chromedriver once per process and return its path."""
+    global _driver_path
+    with _install_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+
+def create_driver(headless=True, lean=None):
+    """Start a Chrome instance using the shared chromedriver; `lean` (default LEAN_BROWSER) blocks what the scraper doesn't read."""
+    if lean is None:
+        lean = LEAN_BROWSER
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        options.page_load_strategy = "eager"  # driver.get returns at DOMContentLoaded; the scraper waits for cards itself
+    driver = webdriver.Chrome(service=Service(install_driver()), options=options)
+    if lean:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCES + BLOCKED_DOMAINS})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_BUFFER_SCRIPT})
+    return driver
+
+
+def page_stats(driver):
+    """Bytes transferred, requests made and DOMContentLoaded time (seconds) of the page the driver is on."""
+    return driver.execute_script(PAGE_STATS_SCRIPT)
+
+
+def print_page_stats(label, driver):
+    """Print what the current search page cost to load and add it to the run report."""
+    try:
+        stats = page_stats(driver)
+    except Exception as e:
+        print(f"[{label}] Page stats unavailable: {e}")
+        return None
+    count("browser.bytes", stats["bytes"])
+    count("browser.requests", stats["requests"])
+    if stats["dom_ready"] is not None:
+        observe("browser.dom_ready", stats["dom_ready"])
+    print(f"[{label}] Browser downloaded {stats['bytes'] / 1e6:.2f} MB in {stats['requests']} requests, "
+          f"DOM ready after {stats['dom_ready'] or 0:.2f}s")
+    return stats
+
+
+def _worker(worker_id, cities, results, scrape, headless, cities_per_driver, progress):
+    driver = None
+    searched = 0
+    try:
+        while True:
+            try:
+                city = cities.get_nowait()
+            except queue.Empty:
+                break
+
+            # Recycle the browser after cities_per_driver searches to keep its memory in check
+            if driver is not None and searched >= cities_per_driver:
+                print(f"[worker {worker_id}] Recycling browser after {searched} cities.")
+                driver.quit()
+                driver = None
+            accommodations = None
+            try:
+                if driver is None:
+                    driver = create_driver(headless)
+                    searched = 0
+                accommodations = scrape(city, driver)
+                searched += 1
+            except Exception as e:
+                print(f"[worker {worker_id}] Error processing city {city}: {e}")
+                if driver is not None:
+                    driver.quit()
+                    driver = None
+
+            with progress["lock"]:
+                progress["done"] += 1
+                done = progress["done"]
+            found = len(accommodations) if accommodations is not None else "no"
+            print(f"[worker {worker_id}] {city}: {found} listings ({done}/{progress['total']} cities done)")
+            results.put((city, accommodations))
+    finally:
+        if driver is not None:
+            driver.quit()
+
+
+def crawl_cities(cities, scrape, workers=BROWSER_WORKERS, headless=True, cities_per_driver=CITIES_PER_DRIVER):
+    """Scrape `cities` with a pool of browsers, yielding (city, accommodations) as each city finishes.
+
+    `scrape(city, driver)` is called on a worker thread with that worker's driver.
+    Cities that fail are yielded with `None` instead of a list.
+    """
+    work = queue.Queue()
+    for city in cities:
+        work.put(city)
+    results = queue.Queue()
+    progress = {"done": 0, "total": len(cities), "lock": threading.Lock()}
+
+    threads = []
+    for worker_id in range(1, min(workers, len(cities)) + 1):
+        thread = threading.Thread(
+            target=_worker,
+            args=(worker_id, work, results, scrape, headless, cities_per_driver, progress),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    for _ in range(len(cities)):
+        yield results.get()
+
+    for thread in threads:
+        thread.join()
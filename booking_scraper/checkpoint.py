@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+
+from booking_scraper.records import Accommodation
+
+CHECKPOINT_FILE = "crawl_checkpoint.jsonl"
+FSYNC = False  # fsync after every event; survives power loss too, at the cost of a disk flush per listing
+
+# Listing statuses, in the order a listing moves through them
+LISTED = "listed"
+DETAILED = "detailed"
+CONTACTED = "contacted"
+FAILED = "failed"
+
+
+class CheckpointStore:
+    """Append-only JSONL log of crawl progress that can be replayed to resume a run.
+
+    Every event is one line, so writing a checkpoint costs one small append.
+    Cities are "listed" and then "done"; each listing moves through
+    "listed" -> "detailed" -> "contacted", or is marked "failed" at a stage so
+    the next run retries it.
+    """
+
+    def __init__(self, path=CHECKPOINT_FILE):
+        self.path = path
+        self.cities = {}  # City -> {"done": bool, "links": [link, ...]}
+        self.listings = {}  # (city, link) -> {"status": ..., "stage": ..., "record": Accommodation}
+        self.lock = threading.Lock()
+        torn = False
+        if os.path.exists(path):
+            torn = self._replay()
+        self.file = open(path, "a", encoding="utf-8")
+        if torn:
+            self.file.write("\n")  # Don't glue the next event onto a half-written line
+
+    def _replay(self):
+        """Rebuild state from the log; returns True if the last line was cut off by a crash."""
+        line = "\n"
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line torn by a crash mid-write
+                self._apply(event)
+        return not line.endswith("\n")
+
+    def _apply(self, event):
+        city = event["city"]
+        if event["type"] == "city_listed":
+            self.cities[city] = {"done": False, "links": [record["Link"] for record in event["records"]]}
+            for record in event["records"]:
+                self.listings.setdefault((city, record["Link"]), {"status": LISTED, "stage": None, "record": Accommodation.from_row(record)})
+        elif event["type"] == "city_done":
+            self.cities.setdefault(city, {"done": False, "links": []})["done"] = True
+        elif event["type"] == "listing":
+            record = Accommodation.from_row(event["record"])
+            self.listings[(city, record["Link"])] = {"status": event["status"], "stage": event.get("stage"), "record": record}
+
+    def _append(self, event):
+        with self.lock:
+            self._apply(event)
+            self.file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self.file.flush()
+            if FSYNC:
+                os.fsync(self.file.fileno())
+
+    def record_city_listed(self, city, accommodations):
+        self._append({"type": "city_listed", "city": city, "records": [dict(accommodation) for accommodation in accommodations]})
+
+    def record_city_done(self, city):
+        self._append({"type": "city_done", "city": city})
+
+    def record_listing(self, accommodation, status, stage=None):
+        """Save the listing's current fields with its new status; `stage` names the step that failed."""
+        self._append({"type": "listing", "city": accommodation["City"], "status": status, "stage": stage, "record": dict(accommodation)})
+
+    def is_city_done(self, city):
+        return self.cities.get(city, {}).get("done", False)
+
+    def status(self, city, link):
+        entry = self.listings.get((city, link))
+        return (entry["status"], entry["stage"]) if entry else (None, None)
+
+    def city_accommodations(self, city):
+        """Latest saved record of every listing in `city`, in listing order; None if the city was never listed."""
+        if city not in self.cities:
+            return None
+        return [self.listings[(city, link)]["record"].copy() for link in self.cities[city]["links"]]
+
+    def has_failures(self, city):
+        return any(self.status(city, link)[0] == FAILED for link in self.cities.get(city, {}).get("links", []))
+
+    def close(self):
+        with self.lock:
+            self.file.close()
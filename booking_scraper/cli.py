@@ -0,0 +1,107 @@
+"""Command line of the scraper.
+
+    python -m booking_scraper list Venice Verona       # names and links only
+    python -m booking_scraper details -f cities.txt    # + address and property type
+    python -m booking_scraper contacts                 # + email and phone, for TARGET_CITIES
+    python -m booking_scraper merge --excel            # city files -> merged/
+
+Only argparse is imported up front; each command imports what it needs when
+it runs, so `--help` and the lighter commands don't pay for Selenium, pandas
+or the search client.
+"""
+import argparse
+import sys
+
+from booking_scraper.settings import BASE_URL, CITY_DIR, MAX_LIMIT, OUTPUT_FILES, TARGET_CITIES
+
+COMMAND_HELP = {
+    "list": "List accommodations (name, city, link)",
+    "details": "List and add the address and property type from each accommodation page",
+    "contacts": "List, add details and look up email and phone number",
+}
+
+
+def read_cities(paths):
+    """City names from files, one per line; blank lines and # comments are skipped, "-" reads stdin."""
+    cities = []
+    for path in paths:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with f:
+            for line in f:
+                city = line.split("#", 1)[0].strip()
+                if city:
+                    cities.append(city)
+    return cities
+
+
+def select_cities(args):
+    """Cities named on the command line and in --cities-file, in order and once each; TARGET_CITIES if none.
+
+    Raises OSError if a cities file can't be read.
+    """
+    if not args.cities and not args.cities_file:
+        return list(TARGET_CITIES)
+    return list(dict.fromkeys(args.cities + read_cities(args.cities_file)))
+
+
+def run_crawl(args):
+    from booking_scraper import crawl  # requests, bs4 and the checkpoint; Selenium only if a city needs the browser
+    cities = args.cities
+    if not cities:
+        print("No cities to crawl.")
+        return
+    crawl.run(args.command, cities, output=args.output, city_dir=args.city_dir, max_results=args.max_results,
+              base_url=args.base_url, headless=not args.show_browser, browser=not args.no_browser,
+              checkpoint_file=args.checkpoint or crawl.CHECKPOINT_FILE)
+
+
+def run_merge(args):
+    from booking_scraper import merge  # pandas and pyarrow
+    manifest = merge.merge(args.workers or merge.MERGE_WORKERS)
+    if args.excel:
+        merge.export_excel(manifest)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="booking_scraper", description="Scrape Booking.com accommodations by city.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, description in COMMAND_HELP.items():
+        crawl_parser = subparsers.add_parser(command, help=description, description=description)
+        crawl_parser.add_argument("cities", nargs="*", help="Cities to crawl (default: settings.TARGET_CITIES)")
+        crawl_parser.add_argument("-f", "--cities-file", action="append", default=[], metavar="PATH",
+                                  help="File with one city per line; repeatable, - reads stdin")
+        crawl_parser.add_argument("--max-results", type=int, default=MAX_LIMIT, help="Listings per city, 0 for all; cities already in the checkpoint keep the listings they were crawled with")
+        crawl_parser.add_argument("-o", "--output", default=OUTPUT_FILES[command],
+                                  help="Rows file (.csv or .jsonl); the Excel export is written next to it")
+        crawl_parser.add_argument("--city-dir", default=CITY_DIR if command == "contacts" else None,
+                                  help="Also save an Excel file per city here" + (" (default: %(default)s)" if command == "contacts" else ""))
+        crawl_parser.add_argument("--no-city-files", dest="city_dir", action="store_const", const=None,
+                                  help="Don't save Excel files per city")
+        crawl_parser.add_argument("--no-browser", action="store_true",
+                                  help="Skip cities whose results need JavaScript instead of starting Chrome")
+        crawl_parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a window, for debugging")
+        crawl_parser.add_argument("--base-url", default=BASE_URL, help="Search URL with a {city} placeholder; like --max-results, only used for cities not yet in the checkpoint")
+        crawl_parser.add_argument("--checkpoint", metavar="PATH",
+                                  help="Progress log shared by the commands (default: crawl_checkpoint.jsonl); delete it to start over "
+                                       "or to list checkpointed cities again with other --max-results or --base-url")
+        crawl_parser.set_defaults(run=run_crawl)
+    merge_parser = subparsers.add_parser("merge", help="Merge the city files in scraping/ into the master store merged/")
+    merge_parser.add_argument("--excel", action="store_true", help="Also export the whole master store to Total_accommodations.xlsx")
+    merge_parser.add_argument("--workers", type=int, help="Processes reading city files (default: one per CPU)")
+    merge_parser.set_defaults(run=run_merge)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.run is run_crawl:
+        try:
+            args.cities = select_cities(args)
+        except OSError as e:
+            parser.error(f"can't read cities file: {e}")
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
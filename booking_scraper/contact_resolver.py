@@ -0,0 +1,174 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from booking_scraper import http_client
+from booking_scraper.contacts import ContactCollector
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.fetching import fetch_all
+from booking_scraper.http_cache import normalize_url
+from booking_scraper.instrumentation import timed
+
+SEARCH_RESULTS = 5  # Result pages fetched per search
+SEARCH_WORKERS = 1  # Concurrent searches; keep low, search engines block bursts
+FETCH_WORKERS = 8  # Concurrent result-page fetches
+CONTACT_BATCH_SIZE = 20  # Listings resolved (and checkpointed) together
+QUERY_CACHE_SIZE = 20000  # Memoized searches
+PAGE_CACHE_SIZE = 50000  # Memoized contacts per fetched page
+
+# Cities whose searches return the same properties; names found in any of them share one search
+OVERLAPPING_CITIES = {
+    "Ostia Antica": "Ostia",
+    "Fiumicino": "Ostia",
+    "Olbia": "Sardinia",
+    "Cagliari": "Sardinia",
+}
+
+NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation so 'Hôtel  Roma!' and 'hotel roma' match."""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return NON_WORD.sub(" ", name.lower()).strip()
+
+
+def google_search(query, num_results):
+    """Default search backend: result URLs from Google."""
+    from googlesearch import search  # Only needed when Google is the backend
+    return list(search(query, num_results=num_results))
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry above maxsize."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.data:
+                return None
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+
+class ContactResolver:
+    """Resolves contact details for batches of listings with memoized searches and page fetches.
+
+    `search(query, num_results)` returns result URLs and `fetch(url)` returns a
+    response; both can be swapped for local stand-ins. Result pages can be
+    anything, so by default only HTML is downloaded, at most
+    http_client.MAX_BODY_BYTES of it. That capped body is held in memory (it
+    is cached and checked for block pages) and then scanned in chunks without
+    a parse tree. One rate limiter is kept for all batches so per-host
+    politeness carries across them.
+    """
+
+    def __init__(self, search=google_search, fetch=http_client.cached_bounded_get,
+                 search_workers=SEARCH_WORKERS, fetch_workers=FETCH_WORKERS, limiter=None):
+        self.search = search
+        self.fetch = fetch
+        self.limiter = limiter or AdaptiveLimiter()
+        self.search_workers = search_workers
+        self.fetch_workers = fetch_workers
+        self.queries = LRUCache(QUERY_CACHE_SIZE)  # Query key -> result URLs
+        self.pages = LRUCache(PAGE_CACHE_SIZE)  # Normalised URL -> (emails, phones)
+        self.stats = {"listings": 0, "searches": 0, "fetches": 0, "failed": 0}
+        self.lock = threading.Lock()  # Batches may be resolved from several threads
+
+    def query_key(self, name, city):
+        return normalize_name(name), OVERLAPPING_CITIES.get(city, city)
+
+    @timed("contacts.search")
+    def _search(self, key, name, city):
+        try:
+            urls = self.search(f"{name} {city} phone email", SEARCH_RESULTS)
+        except Exception as e:
+            print(f"Error during search for {name} in {city}: {e}")
+            return key, None  # Not memoized, so the next batch tries again; the listings are reported as failed
+        return key, urls
+
+    def _fetch_contacts(self, url):
+        try:
+            collector = ContactCollector()
+            collector.scan_stream(http_client.iter_body(self.fetch(url)))
+            return list(collector.emails.values()), list(collector.phones)
+        except http_client.ContentRejected:
+            return [], []  # A PDF, image or video: remembered as a page without contacts
+        except Exception as e:
+            print(f"Error fetching contact details from {url}: {e}")
+            return None
+
+    @timed("contacts.resolve_batch")
+    def resolve_batch(self, listings):
+        """Return {"Emails": [...], "Phones": [...], "Failed": bool} for every listing dict (Name, City), in order.
+
+        "Failed" is True when the search raised or none of its result pages
+        could be fetched: the contacts are unknown and worth retrying, not
+        missing. Listings whose pages were read but had no contacts get "N/A"
+        with "Failed" False.
+        """
+        with self.lock:
+            self.stats["listings"] += len(listings)
+        keys = [self.query_key(listing["Name"], listing["City"]) for listing in listings]
+
+        # Search once per distinct normalised name and area
+        to_search = {}
+        for key, listing in zip(keys, listings):
+            if key not in to_search and self.queries.get(key) is None:
+                to_search[key] = listing
+        with ThreadPoolExecutor(max_workers=self.search_workers) as executor:
+            searches = executor.map(lambda item: self._search(item[0], item[1]["Name"], item[1]["City"]), to_search.items())
+            for key, urls in searches:
+                if urls is not None:
+                    with self.lock:
+                        self.stats["searches"] += 1
+                    self.queries.put(key, urls)
+
+        # Fetch each result page not seen before, concurrently and politely
+        to_fetch = {}
+        for key in keys:
+            for url in self.queries.get(key) or []:
+                page_key = normalize_url(url)
+                if page_key not in to_fetch and self.pages.get(page_key) is None:
+                    to_fetch[page_key] = url
+        page_contacts = fetch_all(list(to_fetch.values()), self._fetch_contacts, max_in_flight=self.fetch_workers, limiter=self.limiter)
+        with self.lock:
+            self.stats["fetches"] += len(to_fetch)
+        for page_key, contacts in zip(to_fetch, page_contacts):
+            if contacts is not None:
+                self.pages.put(page_key, contacts)
+
+        results = []
+        for key in keys:
+            collector = ContactCollector()
+            urls = self.queries.get(key)
+            pages = [self.pages.get(normalize_url(url)) for url in urls or []]
+            for emails, phones in filter(None, pages):
+                for email in emails:
+                    collector.add_email(email)
+                for phone in phones:
+                    collector.add_phone(phone)
+            result = collector.result()
+            result["Failed"] = urls is None or (bool(pages) and not any(pages))
+            if result["Failed"]:
+                with self.lock:
+                    self.stats["failed"] += 1
+            results.append(result)
+        return results
+
+    def calls_per_listing(self):
+        """External calls (searches plus page fetches) made per listing resolved so far."""
+        return (self.stats["searches"] + self.stats["fetches"]) / max(self.stats["listings"], 1)
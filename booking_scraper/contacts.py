@@ -0,0 +1,306 @@
+import codecs
+import json
+import re
+from html.parser import HTMLParser
+from urllib.parse import unquote
+from bs4 import BeautifulSoup
+from booking_scraper.instrumentation import timed
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+VALID_EMAIL = re.compile(r"^[a-zA-Z][a-zA-Z0-9._%+-]*@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+PHONE_PATTERN = re.compile(r"\+39[\s\-()0-9]{8,}")  # Italian numbers
+# Emails are found by jumping from one "@" (or "[at]" marker) to the next and
+# matching the local part and domain around it, instead of trying a full
+# email pattern at every position of the page text.
+LOCAL_PART = re.compile(r"[a-zA-Z][a-zA-Z0-9._%+-]*$")
+DOMAIN = re.compile(r"[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+MAX_LOCAL_PART = 64
+# "info [at] hotel [dot] it", "info(at)hotel(dot)it", "info {at} hotel {dot} it"
+AT_MARKER = re.compile(r"[\[({]\s*at\s*[\])}]", re.IGNORECASE)
+OBFUSCATED_LOCAL_PART = re.compile(r"[a-zA-Z][a-zA-Z0-9._%+-]*(?=\s*$)")
+OBFUSCATED_DOMAIN = re.compile(r"\s*([a-zA-Z0-9-]+(?:\s*[\[({]\s*dot\s*[\])}]\s*[a-zA-Z0-9-]+)+)", re.IGNORECASE)
+OBFUSCATED_DOT = re.compile(r"\s*[\[({]\s*dot\s*[\])}]\s*", re.IGNORECASE)
+NOT_PHONE_CHARS = re.compile(r"[^\d+]")
+# Image names such as "logo@2x.png" look like emails
+FILE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp")
+SCAN_WINDOW = 64 * 1024  # Characters of page text gathered before they are scanned when streaming
+SCAN_OVERLAP = 256  # Characters at the end of a window left for the next one, so matches across the cut aren't lost
+SCHEMA_PROPS = ("email", "telephone")
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+if etree is not None:
+    LINK_HREFS = etree.XPath('//a[@href]/@href')
+    SCHEMA_ELEMENTS = etree.XPath('//*[@itemprop="email" or @itemprop="telephone"]')
+    JSONLD_BLOCKS = etree.XPath('//script[@type="application/ld+json"]/text()')
+
+
+def normalize_phone(phone):
+    """Normalize phone numbers to the format '+39 XXX XXX XXXX'."""
+    # Keep only digits and '+'
+    phone_cleaned = NOT_PHONE_CHARS.sub("", phone)
+    if phone_cleaned.startswith("+39"):  # Ensure it starts with +39
+        # Reformat into +39 XXX XXX XXXX
+        formatted_phone = f"{phone_cleaned[:3]} {phone_cleaned[3:6]} {phone_cleaned[6:9]} {phone_cleaned[9:]}"
+        return formatted_phone.strip()
+    return None  # Return None if it doesn't match the expected pattern
+
+
+def validate_email(email):
+    """Ensure emails start with a letter and are valid."""
+    if not VALID_EMAIL.match(email) or email.lower().endswith(FILE_SUFFIXES):
+        return None
+    return email
+
+
+def find_emails(text, stop=None):
+    """Yield every "local@domain.tld" in `text` (with its "@" before `stop`)."""
+    at = text.find("@", 0, stop)
+    while at != -1:
+        local = LOCAL_PART.search(text, max(0, at - MAX_LOCAL_PART), at)
+        domain = DOMAIN.match(text, at + 1)
+        if local and domain:
+            yield f"{local.group()}@{domain.group()}"
+        at = text.find("@", at + 1, stop)
+
+
+def find_obfuscated_emails(text, stop=None):
+    """Yield emails written as "info [at] hotel [dot] it" and similar, with the markers replaced."""
+    for marker in AT_MARKER.finditer(text):
+        if stop is not None and marker.start() >= stop:
+            break
+        local = OBFUSCATED_LOCAL_PART.search(text, max(0, marker.start() - MAX_LOCAL_PART), marker.start())
+        domain = OBFUSCATED_DOMAIN.match(text, marker.end())
+        if local and domain:
+            yield f"{local.group()}@{OBFUSCATED_DOT.sub('.', domain.group(1))}"
+
+
+class ContactCollector:
+    """Collects emails and phone numbers across pages, deduplicating as it goes."""
+
+    def __init__(self):
+        self.emails = {}  # Lowercased email -> email as first seen
+        self.phones = {}  # Normalised phone -> None, used as an ordered set
+
+    def add_email(self, raw):
+        email = validate_email(raw.strip().strip("."))
+        if email and email.lower() not in self.emails:
+            self.emails[email.lower()] = email
+
+    def add_phone(self, raw):
+        phone = normalize_phone(raw)
+        if phone:
+            self.phones.setdefault(phone, None)
+
+    def scan_text(self, text, stop=None):
+        """Find plain and obfuscated emails and phone numbers in one page's text (starting before `stop`)."""
+        for email in find_emails(text, stop):
+            self.add_email(email)
+        for email in find_obfuscated_emails(text, stop):
+            self.add_email(email)
+        for match in PHONE_PATTERN.finditer(text):
+            if stop is not None and match.start() >= stop:
+                break
+            self.add_phone(match.group())
+
+    def scan_href(self, href):
+        scheme, _, value = href.strip().partition(":")
+        scheme = scheme.lower()
+        if scheme == "mailto":
+            for address in unquote(value.split("?", 1)[0]).split(","):
+                self.add_email(address)
+        elif scheme == "tel":
+            self.add_phone(unquote(value))
+
+    def scan_jsonld(self, text):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                if isinstance(item.get("email"), str):
+                    self.add_email(item["email"].removeprefix("mailto:"))
+                if isinstance(item.get("telephone"), str):
+                    self.add_phone(item["telephone"])
+                stack.extend(value for value in item.values() if isinstance(value, (dict, list)))
+
+    @timed("parse.contacts")
+    def scan_page(self, content):
+        """Scan a fetched page: links, schema.org markup and JSON-LD, then a single pass over its text."""
+        if etree is not None:
+            self._scan_lxml(content)
+        else:
+            self._scan_soup(content)
+
+    @timed("parse.contacts")
+    def scan_stream(self, chunks):
+        """Scan a page from its body chunks, keeping a window of its text instead of a parsed tree."""
+        scanner = StreamScanner(self)
+        if etree is not None:
+            parser = etree.HTMLParser(target=scanner)
+            fed = False
+            for chunk in chunks:
+                if chunk:
+                    parser.feed(chunk)
+                    fed = True
+            if fed:
+                parser.close()  # Calls scanner.close()
+            return
+        parser = TargetHTMLParser(scanner)
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        for chunk in chunks:
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        scanner.close()
+
+    def _scan_lxml(self, content):
+        try:
+            tree = lxml_html.fromstring(content)
+        except (etree.ParserError, ValueError):
+            return  # Empty or undecodable page
+        for href in LINK_HREFS(tree):
+            self.scan_href(href)
+        for element in SCHEMA_ELEMENTS(tree):
+            self._scan_schema(element.get("itemprop"), element.get("content") or element.text_content())
+        for block in JSONLD_BLOCKS(tree):
+            self.scan_jsonld(block)
+        etree.strip_elements(tree, "script", "style", with_tail=False)
+        self.scan_text(" ".join(tree.itertext()))
+
+    def _scan_soup(self, content):
+        soup = BeautifulSoup(content, 'html.parser')
+        for link in soup.select("a[href]"):
+            self.scan_href(link["href"])
+        for element in soup.select('[itemprop="email"], [itemprop="telephone"]'):
+            self._scan_schema(element["itemprop"], element.get("content") or element.get_text())
+        for script in soup.select('script[type="application/ld+json"]'):
+            self.scan_jsonld(script.get_text())
+        for element in soup(["script", "style"]):
+            element.decompose()
+        self.scan_text(soup.get_text(" "))
+
+    def _scan_schema(self, prop, value):
+        if prop == "email":
+            self.add_email(value.removeprefix("mailto:"))
+        else:
+            self.add_phone(value)
+
+    def result(self):
+        return {
+            "Emails": list(self.emails.values()) or ["N/A"],
+            "Phones": list(self.phones) or ["N/A"],
+        }
+
+
+class StreamScanner:
+    """Parser target feeding a ContactCollector from parse events, for pages scanned as they stream in.
+
+    Finds the same links, schema.org markup, JSON-LD and text as `scan_page`,
+    but page text is scanned every SCAN_WINDOW characters and then dropped.
+    """
+
+    def __init__(self, collector):
+        self.collector = collector
+        self.text = []  # Page text since the last scan
+        self.size = 0
+        self.depth = 0
+        self.skip = 0  # Open script and style elements, whose text isn't page text
+        self.jsonld = None  # Text of the JSON-LD block being read
+        self.schema = []  # [itemprop, depth, text] of open email/telephone elements without a content attribute
+
+    def start(self, tag, attrib):
+        self.depth += 1
+        self._separate()
+        if tag == "a" and attrib.get("href") is not None:
+            self.collector.scan_href(attrib["href"])
+        prop = attrib.get("itemprop")
+        if prop in SCHEMA_PROPS:
+            if attrib.get("content"):
+                self.collector._scan_schema(prop, attrib["content"])
+            else:
+                self.schema.append([prop, self.depth, []])
+        if tag in ("script", "style"):
+            self.skip += 1
+            if tag == "script" and attrib.get("type") == "application/ld+json":
+                self.jsonld = []
+
+    def end(self, tag):
+        if tag in ("script", "style") and self.skip:
+            self.skip -= 1
+            if self.jsonld is not None:
+                self.collector.scan_jsonld("".join(self.jsonld))
+                self.jsonld = None
+        if self.schema and self.schema[-1][1] == self.depth:
+            prop, _, text = self.schema.pop()
+            self.collector._scan_schema(prop, "".join(text))
+        self.depth -= 1
+        self._separate()
+
+    def data(self, data):
+        for _, _, text in self.schema:
+            text.append(data)
+        if self.jsonld is not None:
+            self.jsonld.append(data)
+        if self.skip:
+            return
+        self.text.append(data)
+        self.size += len(data)
+        if self.size > SCAN_WINDOW:
+            self._scan(final=False)
+
+    def close(self):
+        while self.schema:  # Elements left open at the end of a cut-off page
+            prop, _, text = self.schema.pop()
+            self.collector._scan_schema(prop, "".join(text))
+        self._scan(final=True)
+
+    def _separate(self):
+        # Text on either side of a tag is scanned as separate words, like " ".join(tree.itertext())
+        if self.text and self.text[-1] != " ":
+            self.text.append(" ")
+            self.size += 1
+
+    def _scan(self, final):
+        text = "".join(self.text)
+        if final:
+            self.collector.scan_text(text)
+            self.text, self.size = [], 0
+            return
+        stop = len(text) - SCAN_OVERLAP
+        self.collector.scan_text(text, stop)
+        # Matches starting at or after `stop` are found in the next window, with room for their local part
+        rest = text[stop - MAX_LOCAL_PART:]
+        self.text, self.size = [rest], len(rest)
+
+
+class TargetHTMLParser(HTMLParser):
+    """html.parser driving a StreamScanner when lxml isn't installed."""
+
+    def __init__(self, target):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {name: value or "" for name, value in attrs})
+        if tag in VOID_ELEMENTS:
+            self.target.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, {name: value or "" for name, value in attrs})
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_ELEMENTS:
+            self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
@@ -0,0 +1,150 @@
+import functools
+import os
+import signal
+import sys
+import threading
+
+from booking_scraper import http_client
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.checkpoint import CHECKPOINT_FILE, CheckpointStore
+from booking_scraper.extract import extract_details
+from booking_scraper.instrumentation import add_section, install, timed
+from booking_scraper.listing import scrape_booking_http
+from booking_scraper.records import COLUMNS, to_frame
+from booking_scraper.sink import RowSink, export_excel
+from booking_scraper.settings import BASE_URL, CITY_DIR, HEADLESS, MAX_LIMIT, OUTPUT_FILES
+
+MODES = ("list", "details", "contacts")  # How far a listing is taken: listed, + address and type, + email and phone
+stopping = threading.Event()  # Set on Ctrl+C or SIGTERM; listing stops at the next city or result page
+
+# List Cities over Plain HTTP, Falling Back to the Browser Pool
+def list_cities(cities, checkpoint, on_listing=None, max_results=MAX_LIMIT, base_url=BASE_URL, headless=HEADLESS, browser=True,
+                limiter=None):
+    fallback_cities = []
+    for city in cities:
+        if stopping.is_set():
+            return
+        # Cities listed by an earlier run resume from their checkpointed listings
+        accommodations = checkpoint.city_accommodations(city)
+        if accommodations is not None:
+            print(f"Resuming {city} with {len(accommodations)} checkpointed accommodations.")
+            yield city, accommodations
+            continue
+        try:
+            accommodations = scrape_booking_http(city, max_results, base_url, on_listing, limiter)
+        except Exception as e:
+            print(f"HTTP listing failed for {city}: {e}")
+            accommodations = []
+        if accommodations:
+            print(f"Listed {len(accommodations)} accommodations for {city} over HTTP.")
+            checkpoint.record_city_listed(city, accommodations)
+            yield city, accommodations
+        else:
+            fallback_cities.append(city)
+
+    if fallback_cities and not browser:
+        print(f"No listings over HTTP for {', '.join(fallback_cities)}; skipped without the browser.")
+    elif fallback_cities:
+        # Only cities whose result pages need JavaScript get a browser, and only then is Selenium imported
+        from booking_scraper.browser_pool import crawl_cities
+        from booking_scraper.browser import scrape_booking
+        print(f"Falling back to the browser for {len(fallback_cities)} cities.")
+        scrape = lambda city, driver: scrape_booking(city, driver, on_listing, max_results, base_url, headless, stopping)
+        for city, accommodations in crawl_cities(fallback_cities, scrape, headless=headless):
+            if accommodations is not None:
+                checkpoint.record_city_listed(city, accommodations)
+            yield city, accommodations
+
+# Step 2: Scrape the Address from the Accommodation Page
+@timed("scrape_address_property")
+def scrape_address_property(link):
+    """(address, property_type) of an accommodation page, or None if the page couldn't be fetched or read."""
+    try:
+        response = http_client.cached_get(link)
+        return extract_details(response.content)
+    except Exception as e:
+        print(f"Error scraping address and property type for {link}: {e}")
+        return None
+
+# Save Data to Excel (city file)
+@timed("save_data_to_excel")
+def save_data_to_excel(city, city_accommodations, directory=CITY_DIR):
+    if city_accommodations and directory:
+        os.makedirs(directory, exist_ok=True)
+        city_filename = os.path.join(directory, f"{city}_accommodations.xlsx")
+        df = to_frame(city_accommodations)
+        df.to_excel(city_filename, index=False)
+        print(f"Saved {len(city_accommodations)} accommodations for {city} in {city_filename}.")
+
+# Export the Streamed Rows to Excel next to the Rows File
+@timed("save_total_result")
+def save_total_result(output_sink):
+    if output_sink.rows:
+        output_sink.close()
+        total_filename = os.path.splitext(output_sink.path)[0] + ".xlsx"
+        export_excel(output_sink.path, total_filename)
+        print(f"Saved total results of {output_sink.rows} accommodations in {total_filename}.")
+
+def run(mode, cities, output=None, city_dir=None, max_results=MAX_LIMIT, base_url=BASE_URL, headless=HEADLESS,
+        browser=True, checkpoint_file=CHECKPOINT_FILE):
+    """Crawl `cities` as far as `mode` goes, streaming rows to `output` and exporting them to Excel at the end.
+
+    With `city_dir`, each finished city is also saved there as an Excel file.
+    """
+    output = output or OUTPUT_FILES[mode]
+    install(mode)  # Timings, HTTP and pipeline stats are reported when the run exits
+    checkpoint = CheckpointStore(checkpoint_file)
+    output_sink = RowSink(output, COLUMNS)
+
+    def save_and_exit(signum, frame):
+        print("\nInterrupt detected! Saving progress and stopping scraping...")
+        stopping.set()
+        # Every finished row is already on disk; closing the sink drops rows the pipeline threads write from here on
+        # (their cities aren't done, so the next run writes them again)
+        save_total_result(output_sink)
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, save_and_exit)
+    signal.signal(signal.SIGTERM, save_and_exit)
+
+    # Skip cities finished by an earlier run; ones with failed listings are revisited to retry them
+    remaining_cities = []
+    for city in cities:
+        if checkpoint.is_city_done(city) and not checkpoint.has_failures(city):
+            for accommodation in checkpoint.city_accommodations(city):
+                output_sink.write(accommodation)
+        else:
+            remaining_cities.append(city)
+    if len(remaining_cities) < len(cities):
+        print(f"Skipping {len(cities) - len(remaining_cities)} cities completed in an earlier run.")
+
+    save_city = functools.partial(save_data_to_excel, directory=city_dir)
+    listing_options = {"max_results": max_results, "base_url": base_url, "headless": headless, "browser": browser}
+    if mode == "list":
+        for city, accommodations in list_cities(remaining_cities, checkpoint, limiter=AdaptiveLimiter(), **listing_options):
+            if accommodations is None:
+                continue  # The browser pool already reported the error
+            for accommodation in accommodations:
+                output_sink.write(accommodation)
+            save_city(city, accommodations)
+        save_total_result(output_sink)
+        return
+
+    # Listings flow through details -> contacts -> sink while the next ones are still being listed
+    from booking_scraper.enrichment import Enricher  # The search client, store and scheduler are only loaded to enrich
+    enricher = Enricher(checkpoint, output_sink, scrape_address_property, save_city, contacts=mode == "contacts")
+    add_section("pipeline", enricher.pipeline.stats)
+    add_section("http_cache", lambda: http_client.get_cache().stats)
+    add_section("hosts", enricher.limiter.report)
+    # Search pages share the detail pages' per-host limits: both are requests to Booking.com
+    for city, accommodations in list_cities(remaining_cities, checkpoint, enricher.submit, limiter=enricher.limiter, **listing_options):
+        if stopping.is_set():
+            break
+        if accommodations is None:
+            continue  # The browser pool already reported the error
+        enricher.city_listed(city, accommodations)
+    enricher.close()  # Wait for the queued listings to be enriched and written
+
+    save_total_result(output_sink)  # Save total data after all cities are scraped
+    print(f"HTTP cache: {http_client.get_cache().stats}")
+    enricher.report()
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from booking_scraper.http_cache import normalize_url
+
+INDEX_PATH = "property_index.sqlite"
+LOOKUP_CHUNK = 500  # Keys per SELECT ... IN (...) when looking up a batch
+# Fields copied from an earlier record instead of fetching them again
+ENRICHED_FIELDS = ("Address", "Property Type", "Email", "Phone Number")
+
+BOOKING_HOSTS = {"booking.com", "www.booking.com"}
+LANGUAGE_SUFFIX = re.compile(r"\.[a-z]{2}(?:-[a-z]{2,4})?\.html$")  # "ca-sagredo.en-gb.html"
+
+
+def canonical_property_url(link):
+    """Canonical form of a property link: Booking hotel pages lose their query, fragment and language suffix."""
+    parts = urlsplit(link)
+    host = parts.netloc.lower()
+    if host in BOOKING_HOSTS and parts.path.startswith("/hotel/"):
+        path = LANGUAGE_SUFFIX.sub(".html", parts.path)
+        return urlunsplit(("https", "www.booking.com", path, "", ""))
+    return normalize_url(link)
+
+
+def property_key(link):
+    """Signed 64-bit hash of the canonical URL, stored as SQLite's integer rowid."""
+    digest = hashlib.blake2b(canonical_property_url(link).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class PropertyIndex:
+    """Persistent index of properties already enriched, keyed on their canonical URL.
+
+    Keys are 8-byte hashes kept as the table's rowid, so millions of properties
+    take one compact B-tree and a lookup is a single index probe. Each entry
+    keeps the enriched fields, which are copied onto later duplicates instead of
+    fetching the detail page and searching for contacts again.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS properties (key INTEGER PRIMARY KEY, fields TEXT)")
+        self.stats = {"duplicates": 0, "details_avoided": 0, "contacts_avoided": 0}
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM properties").fetchone()[0]
+
+    def lookup_many(self, links):
+        """Return {link: fields} for the links already in the index."""
+        keys = {link: property_key(link) for link in links}
+        key_list = list(set(keys.values()))
+        found = {}
+        with self.lock:
+            for start in range(0, len(key_list), LOOKUP_CHUNK):
+                chunk = key_list[start:start + LOOKUP_CHUNK]
+                rows = self.db.execute(
+                    f"SELECT key, fields FROM properties WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                found.update((key, json.loads(fields)) for key, fields in rows)
+        return {link: found[key] for link, key in keys.items() if key in found}
+
+    def apply_known(self, accommodations, required=ENRICHED_FIELDS):
+        """Copy saved fields onto listings seen before; returns the listings that still need work.
+
+        A listing only counts as known when its entry has every field in `required`.
+        """
+        known = self.lookup_many([accommodation["Link"] for accommodation in accommodations])
+        remaining = []
+        for accommodation in accommodations:
+            fields = known.get(accommodation["Link"])
+            if fields is None or any(field not in fields for field in required):
+                remaining.append(accommodation)
+                continue
+            accommodation.update((field, fields[field]) for field in required)
+            self.stats["duplicates"] += 1
+            self.stats["details_avoided"] += 1
+            if "Email" in required:
+                self.stats["contacts_avoided"] += 1
+        return remaining
+
+    def add_many(self, accommodations):
+        """Save the enriched fields of finished listings in one transaction."""
+        rows = [
+            (property_key(accommodation["Link"]),
+             json.dumps({field: accommodation[field] for field in ENRICHED_FIELDS if field in accommodation}, ensure_ascii=False))
+            for accommodation in accommodations
+        ]
+        with self.lock:
+            self.db.executemany("INSERT OR REPLACE INTO properties (key, fields) VALUES (?, ?)", rows)
+            self.db.commit()
+
+    def report(self):
+        return (f"{self.stats['duplicates']} duplicate listings, "
+                f"{self.stats['details_avoided']} detail fetches and {self.stats['contacts_avoided']} contact lookups avoided")
+
+    def close(self):
+        with self.lock:
+            self.db.close()
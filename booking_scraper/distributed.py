@@ -0,0 +1,254 @@
+import argparse
+import os
+import socket
+import threading
+import time
+
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.contact_resolver import CONTACT_BATCH_SIZE
+from booking_scraper.dedup_index import canonical_property_url
+from booking_scraper.fetching import fetch_all
+from booking_scraper.records import Accommodation, RecordBuffer
+from booking_scraper.work_queue import DONE, FAILED, LEASE_SECONDS, LEASED, PENDING, QUEUE_URL, open_queue
+
+CITY = "city"  # Task kinds: a city to list, then one task per listing to enrich
+LISTING = "listing"
+POLL_INTERVAL = 5  # Seconds an idle worker waits before asking the queue again
+
+
+def listing_key(accommodation):
+    """Queue key of a listing: one task per city and canonical link, however often it is listed."""
+    return f"{accommodation['City']}|{canonical_property_url(accommodation['Link'])}"
+
+
+class LeaseKeeper:
+    """Renews the leases a worker holds while it works on them, so only a crashed worker loses its tasks."""
+
+    def __init__(self, queue, owner, lease_seconds=LEASE_SECONDS):
+        self.queue = queue
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.held = {}  # (kind, key) -> task
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def hold(self, tasks):
+        with self.lock:
+            for task in tasks:
+                self.held[(task.kind, task.key)] = task
+
+    def drop(self, tasks):
+        with self.lock:
+            for task in tasks:
+                self.held.pop((task.kind, task.key), None)
+
+    def stop(self):
+        self.done.set()
+
+    def _run(self):
+        while not self.done.wait(self.lease_seconds / 3):  # Renew well before the leases expire
+            with self.lock:
+                tasks = list(self.held.values())
+            if tasks:
+                self.queue.renew(tasks, self.owner, self.lease_seconds)
+
+
+class Worker:
+    """Leases cities and listings from the shared queue until it is drained.
+
+    `list_city(city)` returns the city's listings, `fetch_details(link)`
+    returns (address, property_type) or None if the page couldn't be fetched,
+    and `contact_resolver.resolve_batch` returns contacts per listing, as in
+    the single-process crawl. Everything a task does is safe to repeat, so a
+    task whose worker died is simply redone.
+    """
+
+    def __init__(self, queue, list_city, fetch_details, contact_resolver, limiter=None, owner=None,
+                 lease_seconds=LEASE_SECONDS, batch_size=CONTACT_BATCH_SIZE, property_index=None):
+        self.queue = queue
+        self.list_city = list_city
+        self.fetch_details = fetch_details
+        self.contact_resolver = contact_resolver
+        self.limiter = limiter or AdaptiveLimiter()
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+        self.property_index = property_index
+        self.keeper = LeaseKeeper(queue, self.owner, lease_seconds)
+        self.stats = {"cities": 0, "listings": 0, "failed": 0}
+
+    def run(self, keep_polling=False):
+        """Work until nothing is pending or leased anywhere (or forever with `keep_polling`)."""
+        try:
+            while True:
+                # Listings first, so results flow while other workers are still listing cities
+                tasks = self.queue.lease(LISTING, self.owner, self.batch_size, self.lease_seconds)
+                if tasks:
+                    self._run_tasks(tasks, self.enrich_listings)
+                    continue
+                tasks = self.queue.lease(CITY, self.owner, 1, self.lease_seconds)
+                if tasks:
+                    self._run_tasks(tasks, self.list_cities)
+                    continue
+                if not keep_polling and not outstanding(self.queue):
+                    break
+                time.sleep(POLL_INTERVAL)  # Other workers still hold leases that may produce listings or expire
+        finally:
+            self.keeper.stop()
+        print(f"[{self.owner}] Finished: {self.stats}")
+        return self.stats
+
+    def _run_tasks(self, tasks, handler):
+        self.keeper.hold(tasks)
+        try:
+            handler(tasks)
+        except Exception as e:
+            print(f"[{self.owner}] Error in {tasks[0].kind} tasks: {e}")
+            for task in tasks:
+                self.queue.fail(task, e)
+            self.stats["failed"] += len(tasks)
+        finally:
+            self.keeper.drop(tasks)
+
+    def list_cities(self, tasks):
+        for task in tasks:
+            city = task.payload["City"]
+            accommodations = self.list_city(city)
+            if not accommodations:
+                raise RuntimeError(f"No listings found for {city}")
+            self.queue.put_many(LISTING, [(listing_key(accommodation), dict(accommodation)) for accommodation in accommodations])
+            self.queue.complete(task, {"listings": len(accommodations)})
+            self.stats["cities"] += 1
+            print(f"[{self.owner}] Listed {len(accommodations)} accommodations for {city}.")
+
+    def enrich_listings(self, tasks):
+        accommodations = [Accommodation.from_row(task.payload) for task in tasks]
+        # Properties this worker already enriched (for another city or in an earlier run) are copied
+        unknown = self.property_index.apply_known(accommodations) if self.property_index is not None else accommodations
+        details = fetch_all([accommodation["Link"] for accommodation in unknown], self.fetch_details, limiter=self.limiter)
+        errors = {}  # id(accommodation) -> why its task goes back to the queue
+        for accommodation, result in zip(unknown, details):
+            if result is None:
+                errors[id(accommodation)] = "detail fetch failed"
+            else:
+                accommodation["Address"], accommodation["Property Type"] = result
+        for accommodation, contact_details in zip(unknown, self.contact_resolver.resolve_batch(unknown)):
+            accommodation["Email"] = contact_details["Emails"][0]
+            accommodation["Phone Number"] = contact_details["Phones"][0]
+            if contact_details["Failed"]:
+                errors.setdefault(id(accommodation), "contact lookup failed")
+        if self.property_index is not None:
+            # Failed fetches stay out of the index the crawl shares, so nobody copies their N/A
+            self.property_index.add_many([accommodation for accommodation in unknown if id(accommodation) not in errors])
+        for task, accommodation in zip(tasks, accommodations):
+            if id(accommodation) in errors:
+                self.queue.fail(task, errors[id(accommodation)])  # Pending again until MAX_ATTEMPTS leases
+                self.stats["failed"] += 1
+            else:
+                self.queue.complete(task, dict(accommodation))
+                self.stats["listings"] += 1
+
+
+def outstanding(queue):
+    """Number of tasks still pending or leased, of any kind."""
+    return sum(statuses.get(PENDING, 0) + statuses.get(LEASED, 0) for statuses in queue.counts().values())
+
+
+def enqueue_cities(queue, cities):
+    queue.put_many(CITY, [(city, {"City": city}) for city in cities])
+
+
+def collect(queue, store, save_city=None):
+    """Merge finished listings from every worker into the store; returns (rows, finished cities).
+
+    Safe to run at any time and any number of times: store rows are keyed by
+    city, run date and link. A city's file is saved once it was listed and none
+    of its listings are still pending or leased.
+    """
+    cities = {task.key: task.status for task in queue.tasks(CITY)}
+    rows, open_cities = {}, set()  # City -> RecordBuffer, so a large crawl is held column by column
+    for task in queue.tasks(LISTING):
+        city = task.payload["City"]
+        if task.status == DONE:
+            rows.setdefault(city, RecordBuffer()).append(task.result)
+        elif task.status == FAILED:
+            rows.setdefault(city, RecordBuffer()).append(task.payload)  # Kept with "N/A" fields, like a failed fetch
+        else:
+            open_cities.add(city)
+    finished = [city for city in rows if cities.get(city) == DONE and city not in open_cities]
+    store.add_rows(row for city_rows in rows.values() for row in city_rows)
+    if save_city is not None:
+        for city in finished:
+            save_city(city, rows[city])
+    return sum(len(city_rows) for city_rows in rows.values()), finished
+
+
+def print_status(queue):
+    for kind, statuses in sorted(queue.counts().items()):
+        print(f"{kind:<8} " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+
+
+def scraping_worker(queue, owner=None):
+    """A worker that lists and enriches like the contacts command: HTTP listing with the browser as fallback."""
+    from booking_scraper.crawl import scrape_address_property
+    from booking_scraper.settings import BASE_URL, MAX_LIMIT
+    from booking_scraper.contact_resolver import ContactResolver
+    from booking_scraper.dedup_index import PropertyIndex
+    from booking_scraper.listing import scrape_booking_http
+
+    def list_city(city):
+        try:
+            accommodations = scrape_booking_http(city, MAX_LIMIT, BASE_URL, limiter=limiter)
+        except Exception as e:
+            print(f"HTTP listing failed for {city}: {e}")
+            accommodations = []
+        if accommodations:
+            return accommodations
+        from booking_scraper.browser import scrape_booking  # Selenium is only loaded by workers that need it
+        return scrape_booking(city)
+
+    limiter = AdaptiveLimiter()
+    return Worker(queue, list_city, scrape_address_property, ContactResolver(limiter=limiter),
+                  limiter=limiter, owner=owner, property_index=PropertyIndex())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl cities with any number of workers sharing one work queue.")
+    parser.add_argument("--queue", default=QUEUE_URL, help="Queue URL, e.g. sqlite:///work_queue.sqlite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    enqueue_parser = subparsers.add_parser("enqueue", help="Queue cities (default: settings.TARGET_CITIES)")
+    enqueue_parser.add_argument("cities", nargs="*")
+    worker_parser = subparsers.add_parser("worker", help="Lease and run tasks until the queue is drained")
+    worker_parser.add_argument("--id", help="Worker name (default: host and process id)")
+    worker_parser.add_argument("--keep-polling", action="store_true", help="Wait for new tasks instead of exiting")
+    subparsers.add_parser("status", help="Task counts per kind and status")
+    subparsers.add_parser("collect", help="Merge finished listings into the store and save finished cities")
+    args = parser.parse_args()
+
+    queue = open_queue(args.queue)
+    if args.command == "enqueue":
+        if args.cities:
+            cities = args.cities
+        else:
+            from booking_scraper.settings import TARGET_CITIES
+            cities = TARGET_CITIES
+        enqueue_cities(queue, cities)
+        print(f"Queued {len(cities)} cities.")
+        print_status(queue)
+    elif args.command == "worker":
+        from booking_scraper.instrumentation import install
+        install("worker")
+        scraping_worker(queue, args.id).run(args.keep_polling)
+    elif args.command == "status":
+        print_status(queue)
+    elif args.command == "collect":
+        from booking_scraper.crawl import save_data_to_excel
+        from booking_scraper.store import AccommodationStore
+        rows, finished = collect(queue, AccommodationStore(), save_data_to_excel)
+        print(f"Collected {rows} accommodations into the store; {len(finished)} cities are complete.")
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
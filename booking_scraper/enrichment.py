@@ -0,0 +1,188 @@
+import threading
+
+from booking_scraper.checkpoint import CONTACTED, DETAILED, FAILED, LISTED
+from booking_scraper.contact_resolver import CONTACT_BATCH_SIZE, ContactResolver
+from booking_scraper.dedup_index import ENRICHED_FIELDS, PropertyIndex
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.fetching import MAX_IN_FLIGHT, fetch_politely
+from booking_scraper.pipeline import Pipeline, Stage
+from booking_scraper.scheduler import RefreshScheduler
+from booking_scraper.store import AccommodationStore
+
+DETAIL_FIELDS = ("Address", "Property Type")  # What a details-only run needs from the property index
+DETAIL_WORKERS = MAX_IN_FLIGHT  # Concurrent detail-page fetches
+CONTACT_WORKERS = 1  # Batches resolved at once; raise it if the pipeline stats show contacts busy and queued
+SINK_WORKERS = 1  # Keep a single writer so rows are appended one at a time
+STATS_INTERVAL = 30  # Seconds between pipeline progress reports
+
+
+class CityTracker:
+    """Calls `on_city_done(city, accommodations)` once every listing of a fully listed city has reached the sink."""
+
+    def __init__(self, on_city_done):
+        self.on_city_done = on_city_done
+        self.expected = {}  # City -> links in listing order
+        self.finished = {}  # City -> {link: accommodation}
+        self.lock = threading.Lock()
+
+    def expect(self, city, links):
+        with self.lock:
+            self.expected[city] = list(links)
+            self.finished.setdefault(city, {})
+        self._check(city)
+
+    def finish(self, accommodation):
+        with self.lock:
+            self.finished.setdefault(accommodation["City"], {})[accommodation["Link"]] = accommodation
+        self._check(accommodation["City"])
+
+    def _check(self, city):
+        with self.lock:
+            links = self.expected.get(city)
+            finished = self.finished.get(city, {})
+            if links is None or any(link not in finished for link in links):
+                return
+            del self.expected[city]
+            accommodations = [finished[link] for link in links]
+        self.on_city_done(city, accommodations)
+
+
+class Enricher:
+    """Runs listings through details -> contacts -> sink as a pipeline while the listing stage keeps going.
+
+    `fetch_details(link)` returns (address, property_type), or None when the
+    page couldn't be fetched; only then is the listing marked failed.
+    Listings are submitted one by one as their cards are parsed; `city_listed`
+    is called once a city's listing is complete so the city can be finished
+    (Excel file, store, checkpoint) as soon as its last listing is written.
+    With `contacts=False` the contacts stage is left out and listings stop at
+    "detailed"; their cities stay open in the checkpoint for a later run to
+    finish with contacts.
+    """
+
+    def __init__(self, checkpoint, sink, fetch_details, save_city, contact_resolver=None, limiter=None,
+                 detail_workers=DETAIL_WORKERS, contact_workers=CONTACT_WORKERS, contacts=True):
+        self.checkpoint = checkpoint
+        self.sink = sink
+        self.fetch_details = fetch_details
+        self.save_city = save_city
+        self.limiter = limiter or AdaptiveLimiter()
+        self.property_index = PropertyIndex()
+        self.accommodation_store = AccommodationStore()
+        self.refresh_scheduler = RefreshScheduler()
+        self.contacts = contacts
+        self.contact_resolver = (contact_resolver or ContactResolver(limiter=self.limiter)) if contacts else None
+        self.final_status = CONTACTED if contacts else DETAILED
+        self.tracker = CityTracker(self._city_done)
+        self.submitted = {}  # City -> links already in the pipeline, in submission order (dict keys)
+        self.enriched = set()  # (city, link) of listings fetched in this run rather than copied
+        self.lock = threading.Lock()
+        stages = [Stage("details", self._details, workers=detail_workers)]
+        if contacts:
+            stages.append(Stage("contacts", self._contacts, workers=contact_workers, batch_size=CONTACT_BATCH_SIZE))
+        stages.append(Stage("sink", self._write, workers=SINK_WORKERS))
+        self.pipeline = Pipeline(stages)
+        self.done = threading.Event()
+        threading.Thread(target=self._report, daemon=True).start()
+
+    def submit(self, accommodation):
+        """Queue a listing for enrichment; blocks while the pipeline is full."""
+        with self.lock:
+            links = self.submitted.setdefault(accommodation["City"], {})
+            if accommodation["Link"] in links:
+                return
+            links[accommodation["Link"]] = None
+        self.pipeline.put(accommodation)
+
+    def city_listed(self, city, accommodations):
+        """Submit any listings not streamed yet and finish the city once they are all written.
+
+        Listings streamed by an HTTP listing that then failed over to the
+        browser are in the pipeline too, so the city also waits for them and
+        keeps them in its file.
+        """
+        for accommodation in accommodations:
+            self.submit(accommodation)
+        with self.lock:
+            links = list(self.submitted.get(city, {}))
+        self.tracker.expect(city, links)
+
+    def close(self):
+        self.pipeline.close()
+        self.done.set()
+        print("Pipeline:")
+        self.pipeline.print_stats()
+
+    def _report(self):
+        while not self.done.wait(STATS_INTERVAL):
+            self.pipeline.print_stats()
+
+    # Stage 1: copy known properties, fetch the detail pages still missing
+    def _details(self, accommodation):
+        city, link = accommodation["City"], accommodation["Link"]
+        status, stage = self.checkpoint.status(city, link)
+        if status in (CONTACTED, self.final_status):
+            return accommodation  # Finished by an earlier run
+        # Properties already enriched for another city or in an earlier run are copied, not fetched again
+        if not self.property_index.apply_known([accommodation], ENRICHED_FIELDS if self.contacts else DETAIL_FIELDS):
+            self.checkpoint.record_listing(accommodation, self.final_status)
+            return accommodation
+        with self.lock:
+            self.enriched.add((city, link))
+        if status in (None, LISTED) or (status, stage) == (FAILED, "details"):
+            details = fetch_politely(link, self.fetch_details, self.limiter)
+            if details is None:
+                self.checkpoint.record_listing(accommodation, FAILED, "details")
+            else:
+                # A page without an address or type is still detailed; only a failed fetch is retried
+                accommodation["Address"], accommodation["Property Type"] = details
+                self.checkpoint.record_listing(accommodation, DETAILED)
+        return accommodation
+
+    # Stage 2: look up contacts for a batch of listings
+    def _contacts(self, accommodations):
+        needs_contacts = []
+        for accommodation in accommodations:
+            status, stage = self.checkpoint.status(accommodation["City"], accommodation["Link"])
+            if status == CONTACTED or (status, stage) == (FAILED, "details"):
+                continue  # Done, or left for the next run, which retries the detail fetch and then the search
+            needs_contacts.append(accommodation)
+        for accommodation, contact_details in zip(needs_contacts, self.contact_resolver.resolve_batch(needs_contacts)):
+            accommodation["Email"] = contact_details["Emails"][0]
+            accommodation["Phone Number"] = contact_details["Phones"][0]
+            if contact_details["Failed"]:
+                # Not indexed, so the next run searches again instead of copying the N/A
+                self.checkpoint.record_listing(accommodation, FAILED, "contacts")
+            else:
+                self.checkpoint.record_listing(accommodation, CONTACTED)
+        return accommodations
+
+    # Stage 3: write the row and remember what was fetched
+    def _write(self, accommodation):
+        city, link = accommodation["City"], accommodation["Link"]
+        self.sink.write(accommodation)
+        if (city, link) in self.enriched and self.checkpoint.status(city, link)[0] == CONTACTED:
+            self.property_index.add_many([accommodation])
+            self.refresh_scheduler.record_listings([accommodation])  # Later refresh runs start from this fetch time
+        self.tracker.finish(accommodation)
+        return accommodation
+
+    def _city_done(self, city, accommodations):
+        try:
+            self.save_city(city, accommodations)  # Save progress after each city
+            self.accommodation_store.add_rows(accommodations)  # Queryable history of every run
+            # A stage that raised leaves its listings short of CONTACTED; the city stays open so a later run retries them
+            unfinished = [accommodation for accommodation in accommodations
+                          if self.checkpoint.status(city, accommodation["Link"])[0] not in (CONTACTED, FAILED)]
+            if self.contacts and unfinished:
+                print(f"{city}: {len(unfinished)} listings didn't finish enrichment; the city is left open.")
+            elif self.contacts:
+                self.checkpoint.record_city_done(city)
+        except Exception as e:
+            print(f"Error processing city {city}: {e}")
+
+    def report(self):
+        print(f"Property index: {self.property_index.report()}")
+        if self.contact_resolver is not None:
+            print(f"Contact lookups: {self.contact_resolver.stats}, "
+                  f"{self.contact_resolver.calls_per_listing():.2f} external calls per listing")
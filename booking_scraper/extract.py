@@ -0,0 +1,195 @@
+import json
+import re
+from bs4 import BeautifulSoup
+from booking_scraper.instrumentation import timed
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Parser backend for detail pages: "lxml" parses incrementally and stops as soon as
+# both fields are found, "selectolax" parses the whole page with a fast C parser,
+# "html.parser" is the pure-Python BeautifulSoup fallback.
+PARSER = "lxml" if etree is not None else "selectolax" if HTMLParser is not None else "html.parser"
+CHUNK_SIZE = 64 * 1024  # Bytes fed to the incremental parser at a time
+
+# Hashed class names Booking.com uses for the address line; they change with site
+# deploys, so JSON-LD is tried first and these are only a fallback.
+ADDRESS_CLASSES = {"a53cbfa6de", "f17adf7576"}
+ADDRESS_SUBTITLE_CLASS = "hp_address_subtitle"
+BREADCRUMB_CLASS = "bui_breadcrumb__link_masked"
+
+COUNTRY_SUFFIX = re.compile(r"(Italy.*)")
+PROPERTY_TYPE = re.compile(r"\((.*?)\)")
+
+
+def squeeze(text):
+    """Collapse runs of whitespace, so text gathered from nested elements reads like the rendered line."""
+    return " ".join(text.split())
+
+
+def clean_address(text):
+    """Cut everything after the country, e.g. the 'Excellent location – show map' tail."""
+    return COUNTRY_SUFFIX.sub("Italy", text)
+
+
+def jsonld_fields(text):
+    """Return (address, type) from a JSON-LD block, either of them None when absent."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None, None
+    for item in data if isinstance(data, list) else [data]:
+        if not isinstance(item, dict) or "address" not in item:
+            continue
+        address = item["address"]
+        if isinstance(address, dict):
+            parts = [address.get("streetAddress")]
+            street = address.get("streetAddress") or ""
+            locality = " ".join(filter(None, [address.get("postalCode"), address.get("addressLocality")]))
+            if locality and address.get("addressLocality", "") not in street:
+                parts.append(locality)
+            country = address.get("addressCountry")
+            if isinstance(country, dict):
+                country = country.get("name")
+            if country and country not in street:
+                parts.append(country)
+            address = ", ".join(filter(None, parts))
+        return (address or None), item.get("@type")
+    return None, None
+
+
+class DetailFields:
+    """Collects address and property type candidates from every source on the page."""
+
+    def __init__(self):
+        self.jsonld_address = None
+        self.jsonld_type = None
+        self.class_address = None
+        self.breadcrumb = None
+        self.open_candidates = 0  # Address or breadcrumb elements started but not ended yet (lxml only)
+
+    def add_jsonld(self, text):
+        address, property_type = jsonld_fields(text)
+        self.jsonld_address = self.jsonld_address or address
+        self.jsonld_type = self.jsonld_type or property_type
+
+    def complete(self):
+        # The breadcrumb names the real type; JSON-LD says "Hotel" for most properties
+        return bool(self.jsonld_address or self.class_address) and self.breadcrumb is not None
+
+    def result(self):
+        address = self.jsonld_address or self.class_address
+        property_type = None
+        if self.breadcrumb:
+            match = PROPERTY_TYPE.search(self.breadcrumb)
+            property_type = match.group(1) if match else None
+        property_type = property_type or self.jsonld_type
+        return (clean_address(address) if address else "N/A"), (property_type or "N/A")
+
+
+def _element_text(element):
+    return squeeze("".join(element.itertext()))
+
+
+def _is_address(element):
+    classes = set(element.get("class", "").split())
+    return (element.tag == "div" and element.get("tabindex") == "0" and ADDRESS_CLASSES <= classes) or ADDRESS_SUBTITLE_CLASS in classes
+
+
+def _is_candidate(element):
+    """Whether the element's text may be read once it ends: an address line or a breadcrumb link."""
+    if element.tag == "a":
+        return BREADCRUMB_CLASS in element.get("class", "").split()
+    return element.tag in ("div", "span") and _is_address(element)
+
+
+def _read_events(parser, fields):
+    for event, element in parser.read_events():
+        if event == "start":
+            if _is_candidate(element):
+                fields.open_candidates += 1
+            continue
+        tag = element.tag
+        if _is_candidate(element):
+            fields.open_candidates -= 1
+        if tag == "script":
+            if element.get("type") == "application/ld+json" and element.text:
+                fields.add_jsonld(element.text)
+        elif tag == "a":
+            if fields.breadcrumb is None and BREADCRUMB_CLASS in element.get("class", "").split():
+                fields.breadcrumb = _element_text(element)
+        elif tag in ("div", "span") and fields.class_address is None:
+            if _is_address(element):
+                fields.class_address = _element_text(element)
+        # Drop finished siblings so memory stays flat on very large pages, but never
+        # inside an open address or breadcrumb, whose text is read when it ends
+        if fields.open_candidates == 0:
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+def _extract_lxml(chunks, encoding):
+    fields = DetailFields()
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+    for chunk in chunks:
+        parser.feed(chunk)
+        _read_events(parser, fields)
+        if fields.complete():
+            return fields.result()  # Both fields found; skip parsing the rest of the page
+    parser.close()
+    _read_events(parser, fields)
+    return fields.result()
+
+
+def _extract_selectolax(html):
+    fields = DetailFields()
+    tree = HTMLParser(html)
+    for script in tree.css('script[type="application/ld+json"]'):
+        fields.add_jsonld(script.text())
+    element = tree.css_first('div[tabindex="0"].a53cbfa6de.f17adf7576') or tree.css_first(f"span.{ADDRESS_SUBTITLE_CLASS}")
+    if element is not None:
+        fields.class_address = squeeze(element.text(deep=True, separator=""))
+    element = tree.css_first(f"a.{BREADCRUMB_CLASS}")
+    if element is not None:
+        fields.breadcrumb = squeeze(element.text(deep=True, separator=""))
+    return fields.result()
+
+
+def _extract_html_parser(html):
+    fields = DetailFields()
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup.select('script[type="application/ld+json"]'):
+        fields.add_jsonld(script.get_text())
+    element = soup.select_one('div[tabindex="0"].a53cbfa6de.f17adf7576') or soup.select_one(f"span.{ADDRESS_SUBTITLE_CLASS}")
+    if element is not None:
+        fields.class_address = squeeze(element.get_text())
+    element = soup.select_one(f"a.{BREADCRUMB_CLASS}")
+    if element is not None:
+        fields.breadcrumb = squeeze(element.get_text())
+    return fields.result()
+
+
+def iter_chunks(content, size=CHUNK_SIZE):
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+@timed("parse.details")
+def extract_details(content, parser=None, encoding=None):
+    """Return (address, property_type) from a detail page's bytes; missing fields are "N/A"."""
+    parser = parser or PARSER
+    if (parser == "lxml" and etree is None) or (parser == "selectolax" and HTMLParser is None):
+        raise ImportError(f"The {parser} parser backend is not installed")
+    if parser == "lxml":
+        return _extract_lxml(iter_chunks(content), encoding or "utf-8")
+    if parser == "selectolax":
+        return _extract_selectolax(content)
+    if parser == "html.parser":
+        return _extract_html_parser(content)
+    raise ValueError(f"Unknown parser backend: {parser}")
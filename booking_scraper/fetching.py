@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlsplit
+
+from booking_scraper.adaptive import Slot
+
+# Defaults for the concurrent detail-page stage
+MAX_IN_FLIGHT = 8  # Number of requests kept in flight at once
+REQUESTS_PER_SECOND = 2.0  # Sustained request rate allowed per host
+BURST = 4  # Number of requests a host may receive back-to-back
+BLOCK_RETRIES = 2  # Times a request answered with a block page is repeated once the host's pause is over
+
+_pending = threading.local()  # The slot of the fetch this thread is running, taken on its first network request
+
+
+class TokenBucket:
+    """Token bucket that refills at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """Hands out one token bucket per host so politeness is enforced per site."""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self.buckets[host]
+
+    def wait(self, url):
+        self.bucket_for(url).acquire()
+
+    @contextmanager
+    def slot(self, url):
+        """Same interface as `adaptive.AdaptiveLimiter.slot`, at a fixed rate."""
+        self.wait(url)
+        yield Slot(url)
+
+
+class PendingSlot:
+    """A limiter slot that is only taken once the fetch goes to the network, so cache hits never wait."""
+
+    def __init__(self, limiter, url):
+        self.limiter = limiter
+        self.url = url
+        self.slots = ExitStack()
+        self.slot = None
+
+    def take(self):
+        if self.slot is None:
+            self.slot = self.slots.enter_context(self.limiter.slot(self.url))
+
+    @property
+    def blocked(self):
+        return self.slot is not None and self.slot.blocked
+
+
+def take_slot():
+    """Take the slot of the fetch running in this thread, if any; `http_client.get` calls this before every request."""
+    pending = getattr(_pending, "slot", None)
+    if pending is not None:
+        pending.take()
+
+
+def fetch_politely(url, fetch, limiter):
+    """Call `fetch(url)` through the limiter, repeating it after the host's pause if it was blocked.
+
+    `fetch` must make its requests through `http_client`: the host's slot is
+    taken on the first one, and a fetch served from the response cache
+    doesn't take one at all.
+    """
+    for _ in range(BLOCK_RETRIES + 1):
+        slot = PendingSlot(limiter, url)
+        previous, _pending.slot = getattr(_pending, "slot", None), slot
+        try:
+            with slot.slots:
+                result = fetch(url)
+        finally:
+            _pending.slot = previous
+        if not slot.blocked:
+            break
+    return result
+
+
+def fetch_all(urls, fetch, max_in_flight=MAX_IN_FLIGHT, limiter=None):
+    """Run `fetch(url)` for every url concurrently and return the results in input order."""
+    if limiter is None:
+        limiter = HostRateLimiter()
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        # executor.map yields results in submission order, whatever order they finish in
+        return list(executor.map(lambda url: fetch_politely(url, fetch, limiter), urls))
@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_PATH = "http_cache.sqlite"
+CACHE_TTL = 7 * 24 * 3600  # Seconds a cached page is served without asking the server
+CACHE_MAX_BYTES = 512 * 2**20  # Least recently used pages are evicted above this size
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = {"aid", "label", "sid", "srpvid", "srepoch", "ucfs", "arphpl", "gclid", "fbclid", "ved", "usg"}
+
+
+def normalize_url(url):
+    """Normalise a URL for use as a cache key: lowercase host, no fragment or tracking params, sorted query."""
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+def build_response(url, status, headers, body):
+    """Rebuild a requests.Response from cached parts."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True  # So iter_content serves the cached body
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL, LRU size eviction and ETag/Last-Modified revalidation."""
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB, "
+            "etag TEXT, last_modified TEXT, fetched_at REAL, accessed_at REAL, size INTEGER)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url, fetch):
+        """Return the response for `url`, calling `fetch(headers)` only when the cache can't answer."""
+        key = normalize_url(url)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, status, headers, body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[6] < self.ttl:
+                self.stats["hits"] += 1
+                self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self.db.commit()
+                return build_response(row[0], row[1], json.loads(row[2]), row[3])
+
+        # Stale or missing: revalidate if the server gave us a validator, otherwise refetch
+        conditional = {}
+        if row and row[4]:
+            conditional["If-None-Match"] = row[4]
+        if row and row[5]:
+            conditional["If-Modified-Since"] = row[5]
+        response = fetch(conditional)
+
+        with self.lock:
+            if response.status_code == 304 and row:
+                self.stats["revalidated"] += 1
+                self.db.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+                self.db.commit()
+                return build_response(row[0], row[1], json.loads(row[2]), row[3])
+            self.stats["misses"] += 1
+            if response.status_code == 200 and not getattr(response, "blocked", False):
+                self._store(key, response, now)  # Captcha pages are never served from the cache
+        return response
+
+    def _store(self, key, response, now):
+        body = response.content
+        previous = self.db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, response.url, response.status_code, json.dumps(dict(response.headers)), body,
+             response.headers.get("ETag"), response.headers.get("Last-Modified"), now, now, len(body)),
+        )
+        self.total_bytes += len(body) - (previous[0] if previous else 0)
+        self._evict()
+        self.db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self.total_bytes > self.max_bytes:
+            row = self.db.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self.db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.stats["evictions"] += 1
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,163 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from booking_scraper import adaptive, fetching
+from booking_scraper.http_cache import ResponseCache
+from booking_scraper.instrumentation import count, record_response
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36"
+}
+CONNECT_TIMEOUT = 5  # Seconds to establish a connection
+READ_TIMEOUT = 20  # Seconds to wait between bytes of the response
+MAX_RETRIES = 3  # Retries per request on connection errors and retryable statuses
+BACKOFF_FACTOR = 0.5  # Exponential backoff: 0.5s, 1s, 2s, ...
+BACKOFF_JITTER = 0.5  # Random extra delay added to every backoff
+MAX_CONNECTIONS_PER_HOST = 8  # Requests to the same host beyond this wait for a free connection
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_BODY_BYTES = 2 * 2**20  # Bytes of a page from an arbitrary site read by bounded_get; the rest is never downloaded
+CHUNK_SIZE = 64 * 1024  # Bytes read from the socket at a time when streaming a body
+# Content types worth reading for contact details; a missing Content-Type is given the benefit of the doubt
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+_session = None
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class ContentRejected(requests.RequestException):
+    """A streamed response was closed before its body was read because of its content type (PDF, image, video...)."""
+
+
+class FeedbackRetry(Retry):
+    """Retry that reports every retried status to the adaptive limiter as it happens."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None:
+            adaptive.record_retry(response.status, self.get_retry_after(response))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+def create_session(max_connections_per_host=MAX_CONNECTIONS_PER_HOST, max_retries=MAX_RETRIES):
+    """Build a session with keep-alive pools, bounded retries and Retry-After support."""
+    retry = FeedbackRetry(
+        total=max_retries,
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_jitter=BACKOFF_JITTER,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,  # 429/503 wait as long as the server asks
+        raise_on_status=False,  # Return the last response instead of raising
+    )
+    adapter = HTTPAdapter(
+        pool_connections=32,  # Number of hosts kept pooled
+        pool_maxsize=max_connections_per_host,
+        pool_block=True,  # Cap connections per host instead of opening throwaway ones
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.hooks["response"].append(record_response)  # Status, bytes and retries for the run report
+    session.hooks["response"].append(adaptive.record_response)  # Feedback for the adaptive limiter
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def get(url, **kwargs):
+    """GET through the shared session with connect/read timeouts applied."""
+    kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+    fetching.take_slot()  # Inside fetch_politely, wait for the host only now that the network is used
+    try:
+        return get_session().get(url, **kwargs)
+    except requests.RequestException:
+        adaptive.record_failure()
+        raise
+
+
+def iter_body(response, max_bytes=MAX_BODY_BYTES, chunk_size=CHUNK_SIZE):
+    """Yield the body in chunks, at most `max_bytes` in total; sets `response.truncated` when it stopped early.
+
+    Works for streamed responses, which are closed once the cap is reached so
+    the rest is never downloaded, and for responses already read into memory.
+    """
+    response.truncated = False
+    read = 0
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if read + len(chunk) > max_bytes:
+                response.truncated = True
+                if read < max_bytes:
+                    yield chunk[:max_bytes - read]
+                break
+            read += len(chunk)
+            yield chunk
+    finally:
+        response.close()
+
+
+def bounded_get(url, max_bytes=MAX_BODY_BYTES, content_types=HTML_CONTENT_TYPES, **kwargs):
+    """GET a page from an arbitrary site without ever holding more than `max_bytes` of its body.
+
+    The body is streamed: responses of any other content type are closed as
+    soon as the headers arrive and raise ContentRejected, and long bodies are
+    cut at `max_bytes` (`response.truncated`).
+    """
+    response = get(url, stream=True, **kwargs)
+    content_type = response.headers.get("Content-Type", "").partition(";")[0].strip().lower()
+    if content_type and content_type not in content_types:
+        response.close()
+        count("http.rejected")
+        raise ContentRejected(f"Skipped {content_type} response from {url}", response=response)
+    response._content = b"".join(iter_body(response, max_bytes))
+    response._content_consumed = True
+    count("http.bytes", len(response.content))
+    if response.truncated:
+        count("http.truncated")
+    adaptive.record_response(response)  # Check the body for a block page, which the hook couldn't read yet
+    return response
+
+
+def get_cache():
+    """Return the shared on-disk response cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
+
+
+def cached_get(url, **kwargs):
+    """GET through the on-disk cache; the network is only used on a miss or revalidation."""
+    def fetch(conditional_headers):
+        return get(url, headers=conditional_headers, **kwargs)
+    return get_cache().get(url, fetch)
+
+
+def cached_bounded_get(url, **kwargs):
+    """cached_get through bounded_get: only HTML is fetched and at most MAX_BODY_BYTES of it is cached."""
+    def fetch(conditional_headers):
+        return bounded_get(url, headers=conditional_headers, **kwargs)
+    return get_cache().get(url, fetch)
+
+
+def connection_stats(session=None):
+    """Count connections opened (handshakes) and requests sent through the session's pools."""
+    session = session or get_session()
+    stats = {"connections": 0, "requests": 0}
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+    return stats
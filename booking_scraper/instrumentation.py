@@ -0,0 +1,208 @@
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("SCRAPER_METRICS", "1") != "0"  # Set SCRAPER_METRICS=0 to turn recording off
+PROFILE_PATH = os.environ.get("SCRAPER_PROFILE")  # Set to a .prof path to run the whole script under cProfile
+REPORT_DIR = "reports"  # One JSON report per run is written here at exit
+# Latency bucket upper bounds in seconds: 1ms doubling up to ~2 minutes, then everything slower
+BUCKETS = tuple(0.001 * 2 ** n for n in range(18))
+
+_lock = threading.Lock()
+_timers = {}  # Name -> Histogram
+_counters = {}  # Name -> int
+_sections = {}  # Report section name -> callable returning JSON-friendly data
+_started_at = time.time()
+
+
+class Histogram:
+    """Count, total, min, max and log-spaced buckets of observed durations."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples (capped at the max seen)."""
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (self.max,), self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        labels = [f"<={bound:g}s" for bound in BUCKETS] + [f">{BUCKETS[-1]:g}s"]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / max(self.count, 1),
+            "min": self.min or 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+def observe(name, seconds):
+    """Record one duration for `name`."""
+    if not ENABLED:
+        return
+    with _lock:
+        histogram = _timers.get(name)
+        if histogram is None:
+            histogram = _timers[name] = Histogram()
+        histogram.add(seconds)
+
+
+def count(name, amount=1):
+    """Add `amount` to the counter `name`."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+class timer:
+    """Context manager timing its block under `name`."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.start)
+
+
+def timed(name):
+    """Decorator recording every call's duration under `name`, including calls that raise."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def record_response(response, *args, **kwargs):
+    """requests response hook: status, bytes downloaded, retries and time to the response headers.
+
+    Streamed bodies are left unread; whoever reads them counts their bytes.
+    """
+    if not ENABLED:
+        return
+    retries = getattr(response.raw, "retries", None)
+    with _lock:
+        for name, amount in (
+            ("http.requests", 1),
+            (f"http.status.{response.status_code}", 1),
+            ("http.bytes", 0 if kwargs.get("stream") else len(response.content)),
+            ("http.retries", len(retries.history) if retries is not None else 0),
+        ):
+            _counters[name] = _counters.get(name, 0) + amount
+    observe("http.response", response.elapsed.total_seconds())
+
+
+def add_section(name, provider):
+    """Include `provider()` (e.g. pipeline or cache stats) in the report under `name`."""
+    _sections[name] = provider
+
+
+def reset():
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def snapshot():
+    """Return the report as a JSON-friendly dict."""
+    with _lock:
+        timers = {name: histogram.summary() for name, histogram in _timers.items()}
+        counters = dict(_counters)
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(_started_at)),
+        "duration_seconds": time.time() - _started_at,
+        "timers": timers,
+        "counters": counters,
+    }
+    for name, provider in _sections.items():
+        try:
+            report[name] = provider()
+        except Exception as e:
+            report[name] = {"error": str(e)}
+    return report
+
+
+def print_summary(report):
+    print(f"Run took {report['duration_seconds']:.1f}s.")
+    timers = sorted(report["timers"].items(), key=lambda item: item[1]["total"], reverse=True)
+    if timers:
+        print(f"{'timer':<28} {'calls':>7} {'total s':>9} {'mean s':>8} {'p50 s':>8} {'p99 s':>8} {'max s':>8}")
+    for name, stats in timers:
+        print(f"{name:<28} {stats['count']:7d} {stats['total']:9.2f} {stats['mean']:8.3f} "
+              f"{stats['p50']:8.3f} {stats['p99']:8.3f} {stats['max']:8.3f}")
+    counters = report["counters"]
+    statuses = {name.rsplit(".", 1)[1]: value for name, value in counters.items() if name.startswith("http.status.")}
+    if counters.get("http.requests"):
+        print(f"HTTP: {counters['http.requests']} responses, {counters.get('http.bytes', 0) / 1e6:.1f} MB downloaded, "
+              f"{counters.get('http.retries', 0)} retries, statuses {dict(sorted(statuses.items()))}")
+    others = {name: value for name, value in counters.items() if not name.startswith("http.")}
+    if others:
+        print(f"Counters: {others}")
+
+
+def write_report(label):
+    """Write this run's report to REPORT_DIR and print the human summary."""
+    report = snapshot()
+    report["label"] = label
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"{label}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(_started_at))}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    print_summary(report)
+    print(f"Performance report written to {path}.")
+    return path
+
+
+def install(label):
+    """Write the report when the script exits and, with SCRAPER_PROFILE set, profile the whole run.
+
+    For sampling instead, leave this on and attach py-spy to the printed PID:
+    `py-spy record -o profile.svg --pid <pid>`. Worker threads carry their
+    stage names, so py-spy's per-thread view lines up with the report.
+    """
+    if PROFILE_PATH:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        atexit.register(lambda: (profiler.disable(), profiler.dump_stats(PROFILE_PATH),
+                                 print(f"cProfile stats written to {PROFILE_PATH}.")))
+    print(f"{label} running as PID {os.getpid()}.")
+    if ENABLED:
+        atexit.register(write_report, label)
@@ -0,0 +1,105 @@
+from bs4 import BeautifulSoup
+from booking_scraper import http_client
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.dedup_index import canonical_property_url
+from booking_scraper.fetching import fetch_politely
+from booking_scraper.instrumentation import timed
+from booking_scraper.records import Accommodation
+
+SEARCH_URL = "https://www.booking.com/searchresults.html?ss={city}"
+RESULTS_PER_PAGE = 25  # Booking.com pages search results in steps of 25 via the offset parameter
+CARD_SELECTOR = '[data-testid="property-card-container"]'
+
+# Returns the outerHTML of every result card after the first `arguments[0]`,
+# so each "Load more results" pass only serialises the cards it added.
+NEW_CARDS_SCRIPT = f"""
+return Array.from(document.querySelectorAll('{CARD_SELECTOR}'))
+    .slice(arguments[0])
+    .map(card => card.outerHTML);
+"""
+
+
+class SearchPageError(Exception):
+    """A search result page came back with an error or a block page, so the city's listing is incomplete."""
+
+
+def parse_card(item, city):
+    """Extract name and link from a single property card."""
+    title = item.select_one('[data-testid="title"]')
+    name = title.get_text(strip=True) if title else "N/A"
+    link_element = item.select_one('[data-testid="property-card-desktop-single-image"]')
+    link = link_element["href"] if link_element else "N/A"
+    if not link.startswith("https"):
+        link = f"https://www.booking.com{link}"
+    if link_element:
+        link = canonical_property_url(link)  # Same property, same link, whatever tracking params the card carried
+    return Accommodation(name, city, link)
+
+
+def fetch_new_cards(driver, parsed_count):
+    """Return the HTML of the result cards added after the first `parsed_count`."""
+    return driver.execute_script(NEW_CARDS_SCRIPT, parsed_count)
+
+
+def parse_new_cards(cards_html, city, seen_links):
+    """Parse card snippets, skipping links already in `seen_links` (which is updated)."""
+    accommodations = []
+    for card_html in cards_html:
+        accommodation = parse_card(BeautifulSoup(card_html, 'html.parser'), city)
+        if accommodation["Link"] in seen_links:
+            continue
+        seen_links.add(accommodation["Link"])
+        accommodations.append(accommodation)
+    return accommodations
+
+
+def format_city(city):
+    """Turn a city name into the `ss` search parameter."""
+    formatted_city = city.replace(" ", "+")
+    if city.lower() == "alba":
+        formatted_city += "+italy"
+    return formatted_city
+
+
+@timed("listing.scrape_booking_http")
+def scrape_booking_http(city, max_results=0, base_url=SEARCH_URL, on_listing=None, limiter=None):
+    """Collect a city's listings by walking the result pages over plain HTTP.
+
+    Pages are requested with increasing `offset` until one adds no new listings
+    or `max_results` is reached (0 means unlimited). Returns an empty list when
+    the first page has no result cards, e.g. when it needs JavaScript to render.
+    `on_listing(accommodation)` is called for each listing as soon as it is parsed.
+
+    Pages are fetched through `limiter` (a fresh `AdaptiveLimiter` by default)
+    and repeated after the host's pause when they come back blocked. A page
+    that still fails raises SearchPageError rather than returning a truncated
+    city.
+    """
+    if limiter is None:
+        limiter = AdaptiveLimiter()
+    url = base_url.format(city=format_city(city))
+    accommodations = []
+    seen_links = set()
+    offset = 0
+    while True:
+        response = fetch_politely(f"{url}&offset={offset}", http_client.get, limiter)
+        if response.status_code != 200 or response.blocked:
+            raise SearchPageError(f"Search page for {city} at offset {offset} returned "
+                                  + ("a block page" if response.blocked else f"HTTP {response.status_code}"))
+        cards = BeautifulSoup(response.text, 'html.parser').select(CARD_SELECTOR)
+        added = 0
+        for item in cards:
+            accommodation = parse_card(item, city)
+            if accommodation["Link"] in seen_links:
+                continue
+            seen_links.add(accommodation["Link"])
+            accommodations.append(accommodation)
+            added += 1
+            if on_listing is not None:
+                on_listing(accommodation)
+            if max_results != 0 and len(accommodations) >= max_results:
+                return accommodations
+        if added == 0:
+            break  # Past the last page
+        offset += RESULTS_PER_PAGE
+    return accommodations
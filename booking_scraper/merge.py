@@ -0,0 +1,136 @@
+import argparse
+import hashlib
+import json
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from booking_scraper.records import normalize_frame
+
+# Define the folder containing the Excel files and the output file names
+INPUT_FOLDER = 'scraping'
+OUTPUT_FILE = 'Total_accommodations.xlsx'
+MASTER_DIR = 'merged'  # Columnar master store: one Parquet part per city file
+MANIFEST_FILE = os.path.join(MASTER_DIR, '_manifest.json')  # Leading "_" keeps Parquet readers from treating it as data
+MERGE_WORKERS = os.cpu_count()
+
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def created_timestamp(file_path):
+    # Get the file creation or modification date
+    if os.name == 'nt':  # Windows
+        return os.path.getctime(file_path)
+    return os.path.getmtime(file_path)  # Unix-based systems (fallback to modification time)
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    temp_file = MANIFEST_FILE + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(temp_file, MANIFEST_FILE)  # Never leave a half-written manifest behind
+
+def part_path(file_name):
+    return os.path.join(MASTER_DIR, os.path.splitext(file_name)[0] + '.parquet')
+
+def convert_file(file_path, output_path):
+    """Read one city file, clean it and write it as a Parquet part; returns the row count. Runs in a worker process."""
+    df = pd.read_excel(file_path, dtype=str)
+    # The shared schema's columns with normalised values: phone numbers as "+39 XXX XXX XXXX", empty cells as "N/A"
+    df = normalize_frame(df)
+    df.to_parquet(output_path, index=False)
+    return len(df)
+
+def find_changes(manifest):
+    """Return (entries for every input file, names of files to convert); unchanged files are not re-read."""
+    entries, changed = {}, []
+    for file_name in sorted(os.listdir(INPUT_FOLDER)):
+        # Check if the file is an Excel file
+        if not file_name.endswith(('.xlsx', '.xls')):
+            continue
+        file_path = os.path.join(INPUT_FOLDER, file_name)
+        stat = os.stat(file_path)
+        entry = {"mtime": stat.st_mtime, "size": stat.st_size, "created": created_timestamp(file_path)}
+        previous = manifest.get(file_name)
+        if previous and previous["mtime"] == entry["mtime"] and previous["size"] == entry["size"]:
+            entries[file_name] = previous
+            continue
+        # Only hash files whose mtime or size moved; a touched but identical file is not converted again
+        entry["sha256"] = file_hash(file_path)
+        if previous and previous.get("sha256") == entry["sha256"] and os.path.exists(part_path(file_name)):
+            entries[file_name] = {**previous, **entry}
+            continue
+        entries[file_name] = entry
+        changed.append(file_name)
+    return entries, changed
+
+def merge(workers=MERGE_WORKERS):
+    """Bring the master store up to date with the city files; returns the manifest."""
+    os.makedirs(MASTER_DIR, exist_ok=True)
+    manifest = load_manifest()
+    entries, changed = find_changes(manifest)
+
+    # Drop parts whose city file was removed
+    for file_name in set(manifest) - set(entries):
+        if os.path.exists(part_path(file_name)):
+            os.remove(part_path(file_name))
+        print(f"Removed {file_name} from the master store.")
+
+    if changed:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                file_name: executor.submit(convert_file, os.path.join(INPUT_FOLDER, file_name), part_path(file_name))
+                for file_name in changed
+            }
+            for file_name, future in futures.items():
+                try:
+                    entries[file_name]["rows"] = future.result()
+                    print(f"File: {file_name}, Created Date: {datetime.fromtimestamp(entries[file_name]['created'])}")
+                except Exception as e:
+                    print(f"Could not read {file_name}: {e}")
+                    del entries[file_name]  # Retried on the next run
+
+    save_manifest(entries)
+    print(f"Merged {len(changed)} new or changed of {len(entries)} files into {MASTER_DIR}/.")
+    return entries
+
+def read_master(manifest=None):
+    """Load the master store, with the city files in order of creation date."""
+    manifest = manifest if manifest is not None else load_manifest()
+    file_names = sorted(manifest, key=lambda name: manifest[name]["created"])
+    dataframes = [pd.read_parquet(part_path(file_name)) for file_name in file_names]
+    if not dataframes:
+        return None
+    return pd.concat(dataframes, ignore_index=True).fillna("N/A")
+
+def export_excel(manifest=None):
+    merged_df = read_master(manifest)
+    if merged_df is None:
+        print("No Excel files found to merge.")
+        return
+    # Save the merged DataFrame to a new Excel file outside the folder
+    merged_df.to_excel(OUTPUT_FILE, index=False)
+    print(f"Merged file saved as {OUTPUT_FILE}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the city files in scraping/ into one master store.")
+    parser.add_argument("--excel", action="store_true", help=f"Also export the whole master store to {OUTPUT_FILE}")
+    parser.add_argument("--workers", type=int, default=MERGE_WORKERS, help="Processes reading city files")
+    args = parser.parse_args()
+
+    manifest = merge(args.workers)
+    if args.excel:
+        export_excel(manifest)
+
+if __name__ == "__main__":
+    main()
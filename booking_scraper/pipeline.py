@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+
+QUEUE_SIZE = 100  # Items waiting in front of a stage before upstream blocks
+BATCH_WAIT = 0.5  # Seconds a batching stage waits to fill a batch before running a partial one
+STOP = object()  # Tells one worker to finish
+
+
+class Stage:
+    """One pipeline step: `workers` threads take items from a bounded queue and call `handler`.
+
+    `handler(item)` returns the item to pass downstream. With `batch_size`,
+    `handler(items)` gets up to that many items at once and returns them. A
+    handler that raises is reported and its items are passed on unchanged, so
+    every item reaches the end of the pipeline.
+    """
+
+    def __init__(self, name, handler, workers=1, queue_size=QUEUE_SIZE, batch_size=0):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue = queue.Queue(queue_size)
+        self.next = None
+        self.threads = []
+        self.lock = threading.Lock()
+        self.stats = {"processed": 0, "errors": 0, "busy_seconds": 0.0, "max_depth": 0}
+
+    def put(self, item):
+        self.queue.put(item)  # Blocks while the queue is full, which slows the stage upstream
+        depth = self.queue.qsize()
+        if depth > self.stats["max_depth"]:
+            self.stats["max_depth"] = depth
+
+    def start(self):
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{n}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        """Let the workers finish what is queued, then wait for them."""
+        for _ in self.threads:
+            self.queue.put(STOP)
+        for thread in self.threads:
+            thread.join()
+
+    def _take(self):
+        """Return (items, stopping) for the next handler call."""
+        item = self.queue.get()
+        if item is STOP:
+            return [], True
+        if not self.batch_size:
+            return [item], False
+        items = [item]
+        deadline = time.monotonic() + BATCH_WAIT
+        while len(items) < self.batch_size:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            items, stopping = self._take()
+            if not items:
+                continue
+            start = time.perf_counter()
+            try:
+                results = self.handler(items) if self.batch_size else [self.handler(items[0])]
+            except Exception as e:
+                print(f"Error in pipeline stage {self.name}: {e}")
+                results = items
+                with self.lock:
+                    self.stats["errors"] += 1
+            with self.lock:
+                self.stats["processed"] += len(items)
+                self.stats["busy_seconds"] += time.perf_counter() - start
+            if self.next is not None:
+                for result in results:
+                    self.next.put(result)
+
+
+class Pipeline:
+    """Stages joined by bounded queues; each stage's results feed the next one."""
+
+    def __init__(self, stages):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next = next_stage
+        self.started_at = time.perf_counter()
+        for stage in stages:
+            stage.start()
+
+    def put(self, item):
+        self.stages[0].put(item)
+
+    def close(self):
+        """Drain every stage in order and stop the workers."""
+        for stage in self.stages:
+            stage.stop()
+
+    def stats(self):
+        """Per-stage workers, current and peak queue depth, items processed, throughput and utilisation."""
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        report = {}
+        for stage in self.stages:
+            with stage.lock:
+                stats = dict(stage.stats)
+            report[stage.name] = {
+                "workers": stage.workers,
+                "depth": stage.queue.qsize(),
+                "max_depth": stats["max_depth"],
+                "processed": stats["processed"],
+                "errors": stats["errors"],
+                "per_second": stats["processed"] / elapsed,
+                # Share of the stage's worker time spent in its handler; near 1.0 means add workers
+                "utilisation": stats["busy_seconds"] / (elapsed * stage.workers),
+            }
+        return report
+
+    def print_stats(self):
+        for name, stats in self.stats().items():
+            print(f"{name:<10} {stats['workers']:3d} workers, queue {stats['depth']:4d} (peak {stats['max_depth']:4d}), "
+                  f"{stats['processed']:6d} done, {stats['per_second']:7.2f}/s, {stats['utilisation']:5.1%} busy"
+                  + (f", {stats['errors']} errors" if stats["errors"] else ""))
@@ -0,0 +1,217 @@
+import sys
+from collections.abc import Mapping
+
+from booking_scraper.contacts import FILE_SUFFIXES, NOT_PHONE_CHARS, VALID_EMAIL, normalize_phone, validate_email
+
+# The accommodation schema shared by the scrapers, the sink files, the store and merge.py
+COLUMNS = ("Name", "City", "Link", "Address", "Property Type", "Email", "Phone Number")
+ATTRIBUTES = ("name", "city", "link", "address", "property_type", "email", "phone_number")  # Slot and store column names
+REQUIRED = ("City", "Link")  # A record without these can't be stored or deduplicated
+MISSING = "N/A"
+MIN_PHONE_DIGITS = 10  # Digits including the 39 prefix; shorter numbers were cut off on the page
+BATCH_SIZE = 4096  # Rows per frozen batch of a RecordBuffer
+
+ATTRIBUTE_OF = dict(zip(COLUMNS, ATTRIBUTES))
+
+
+class SchemaError(ValueError):
+    """A row doesn't fit the accommodation schema: an unknown column or a missing required value."""
+
+
+def clean_text(value):
+    """Strip a value to text; None, NaN, "" and "N/A" become MISSING."""
+    if value is None or value != value:  # NaN from pandas
+        return MISSING
+    value = str(value).strip()
+    return value if value and value != MISSING else MISSING
+
+
+def clean_shared(value):
+    """clean_text for columns with few distinct values (city, property type), kept as one shared string each."""
+    value = clean_text(value)
+    return value if value == MISSING else sys.intern(value)
+
+
+def clean_email(value):
+    value = clean_text(value)
+    if value == MISSING:
+        return MISSING
+    return validate_email(value) or MISSING
+
+
+def clean_phone(value):
+    """Format a number as "+39 XXX XXX XXXX"; incomplete or non-Italian numbers become MISSING."""
+    value = clean_text(value)
+    if value == MISSING:
+        return MISSING
+    phone = normalize_phone(value)
+    if phone is None or sum(map(str.isdigit, phone)) < MIN_PHONE_DIGITS:
+        return MISSING
+    return phone
+
+
+NORMALIZERS = {
+    "Name": clean_text,
+    "City": clean_shared,
+    "Link": clean_text,
+    "Address": clean_text,
+    "Property Type": clean_shared,
+    "Email": clean_email,
+    "Phone Number": clean_phone,
+}
+
+
+class Accommodation(Mapping):
+    """One accommodation row, stored in slots instead of a dict.
+
+    It reads and writes by column name (`record["Phone Number"]`) like the
+    dicts it replaces. Every value is normalised as it is set, and unknown
+    columns raise KeyError, so a misspelt column fails where it is written
+    instead of silently missing from the output.
+    """
+
+    __slots__ = ATTRIBUTES
+
+    def __init__(self, name=MISSING, city=MISSING, link=MISSING, address=MISSING, property_type=MISSING,
+                 email=MISSING, phone_number=MISSING):
+        self.name = clean_text(name)
+        self.city = clean_shared(city)
+        self.link = clean_text(link)
+        self.address = clean_text(address)
+        self.property_type = clean_shared(property_type)
+        self.email = clean_email(email)
+        self.phone_number = clean_phone(phone_number)
+        for column in REQUIRED:
+            if self[column] == MISSING:
+                raise SchemaError(f"Accommodation without a {column}: {dict(self)}")
+
+    @classmethod
+    def from_row(cls, row):
+        """Validate and normalise a dict (a checkpoint record, queue payload or sink row)."""
+        unknown = [column for column in row if column not in ATTRIBUTE_OF]
+        if unknown:
+            raise SchemaError(f"Unknown columns {unknown}; the schema is {list(COLUMNS)}")
+        return cls(*(row.get(column, MISSING) for column in COLUMNS))
+
+    @classmethod
+    def from_clean(cls, values):
+        """Rebuild a record from values that were already normalised, in COLUMNS order."""
+        record = object.__new__(cls)
+        for attribute, value in zip(ATTRIBUTES, values):
+            setattr(record, attribute, value)
+        return record
+
+    def copy(self):
+        return Accommodation.from_clean(self.values())
+
+    def __getitem__(self, column):
+        try:
+            return getattr(self, ATTRIBUTE_OF[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def __setitem__(self, column, value):
+        if column not in ATTRIBUTE_OF:
+            raise KeyError(f"Unknown column {column!r}; the schema is {list(COLUMNS)}")
+        value = NORMALIZERS[column](value)
+        if value == MISSING and column in REQUIRED:
+            raise SchemaError(f"{column} can't be empty")
+        setattr(self, ATTRIBUTE_OF[column], value)
+
+    def update(self, other=(), **values):
+        """Set several columns at once, like dict.update; each value goes through __setitem__."""
+        pairs = other.items() if isinstance(other, Mapping) else other
+        for column, value in pairs:
+            self[column] = value
+        for column, value in values.items():
+            self[column] = value
+
+    def __iter__(self):
+        return iter(COLUMNS)
+
+    def __len__(self):
+        return len(COLUMNS)
+
+    def values(self):
+        """The record's values in COLUMNS order."""
+        return tuple(getattr(self, attribute) for attribute in ATTRIBUTES)
+
+    def __repr__(self):
+        return f"Accommodation({', '.join(f'{attribute}={getattr(self, attribute)!r}' for attribute in ATTRIBUTES)})"
+
+
+class RecordBuffer:
+    """Many records kept column by column, for runs too large for one object per row.
+
+    Rows are validated like `Accommodation.from_row` as they are added. Every
+    BATCH_SIZE rows the batch is frozen into one tuple per column, so a row
+    costs a pointer per field; cities, property types and "N/A" are shared
+    strings. Iterating yields Accommodation records.
+    """
+
+    def __init__(self, rows=(), batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.batches = []  # Frozen batches: a tuple of values per column
+        self.pending = [[] for _ in COLUMNS]  # The batch being filled, column by column
+        self.extend(rows)
+
+    def append(self, row):
+        values = row.values() if isinstance(row, Accommodation) else Accommodation.from_row(row).values()
+        for column_values, value in zip(self.pending, values):
+            column_values.append(value)
+        if len(self.pending[0]) >= self.batch_size:
+            self.batches.append(tuple(tuple(column_values) for column_values in self.pending))
+            self.pending = [[] for _ in COLUMNS]
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return sum(len(batch[0]) for batch in self.batches) + len(self.pending[0])
+
+    def __iter__(self):
+        for batch in self.batches + [self.pending]:
+            for values in zip(*batch):
+                yield Accommodation.from_clean(values)
+
+    def column(self, column):
+        """Every value of one column, in row order."""
+        index = COLUMNS.index(column)
+        values = [value for batch in self.batches for value in batch[index]]
+        values += self.pending[index]
+        return values
+
+    def frame(self):
+        import pandas as pd
+        return pd.DataFrame({column: self.column(column) for column in COLUMNS}, columns=list(COLUMNS))
+
+
+def to_frame(rows):
+    """DataFrame with the schema's columns from a RecordBuffer or any iterable of records or dicts."""
+    if not isinstance(rows, RecordBuffer):
+        rows = RecordBuffer(rows)
+    return rows.frame()
+
+
+def normalize_frame(df):
+    """Conform a DataFrame read from a city file to the schema with pandas string operations on whole columns.
+
+    Columns outside the schema are dropped and missing ones are filled with
+    "N/A"; rows are kept even when a required value is empty. Values come out
+    as the NORMALIZERS would set them on an Accommodation.
+    """
+    df = df.reindex(columns=list(COLUMNS))
+    for column in COLUMNS:
+        text = df[column].astype("string").str.strip()
+        text = text.mask(text.isin(["", MISSING]))  # Empty cells become <NA> and are filled with MISSING at the end
+        if column == "Email":
+            text = text.where(text.str.match(VALID_EMAIL.pattern, na=False)
+                              & ~text.str.lower().str.endswith(FILE_SUFFIXES, na=False))
+        elif column == "Phone Number":
+            # Keep digits and "+", then format as "+39 XXX XXX XXXX"; incomplete or non-Italian numbers are dropped
+            phone = text.str.replace(NOT_PHONE_CHARS, "", regex=True)
+            complete = phone.str.startswith("+39", na=False) & (phone.str.count(r"\d") >= MIN_PHONE_DIGITS).fillna(False)
+            text = phone.where(complete).str.replace(r"^(.{3})(.{3})(.{3})", r"\1 \2 \3 ", regex=True)
+        df[column] = text.fillna(MISSING).astype(object)
+    return df
@@ -0,0 +1,238 @@
+import argparse
+import json
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from booking_scraper.contact_resolver import SEARCH_RESULTS
+from booking_scraper.dedup_index import canonical_property_url
+
+SCHEDULE_PATH = "refresh_schedule.sqlite"
+REFRESH_BUDGET = 500  # Requests one refresh run may spend
+REFRESH_INTERVAL = 30 * 24 * 3600  # Seconds after which an unchanging field is due for a check
+MIN_AGE = 24 * 3600  # Fields checked more recently than this are never refreshed
+MISSING_WEIGHT = 0.5  # Extra priority per missing ("N/A") field
+
+# Each listing is refreshed in two parts, each with its own fields and request cost
+DETAILS = "details"
+CONTACTS = "contacts"
+KIND_FIELDS = {
+    DETAILS: ("Address", "Property Type"),
+    CONTACTS: ("Email", "Phone Number"),
+}
+KIND_COST = {
+    DETAILS: 1,  # The detail page
+    CONTACTS: 1 + SEARCH_RESULTS,  # A search and its result pages
+}
+
+
+def priority(age, observed, changes, missing):
+    """How much a refresh is worth: the chance the part changed since it was last fetched, plus what is missing.
+
+    Changes are treated as a Poisson process whose rate is the part's change
+    count over the time it has been watched, smoothed with one change per
+    REFRESH_INTERVAL so a part that never changed is still checked now and then.
+    `observed` is None for a part that was never fetched.
+    """
+    if observed is None:
+        return float("inf")  # Never fetched
+    if age < MIN_AGE:
+        return 0.0
+    rate = (changes + 1) / (observed + REFRESH_INTERVAL)
+    return 1 - math.exp(-rate * age) + MISSING_WEIGHT * missing
+
+
+class RefreshScheduler:
+    """Tracks when each listing's details and contacts were last fetched and picks what to refresh next.
+
+    `clock()` returns the current time in seconds, so runs can be simulated.
+    """
+
+    def __init__(self, path=SCHEDULE_PATH, clock=time.time):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS refresh ("
+            "link TEXT, kind TEXT, name TEXT, city TEXT, fields TEXT, "
+            "first_checked_at REAL, checked_at REAL, checks INTEGER, changes INTEGER, PRIMARY KEY (link, kind))"
+        )
+        self.stats = {"checks": 0, "changes": 0, "requests": 0}
+
+    def add_listings(self, accommodations, checked_at=None):
+        """Start tracking listings; already tracked ones are left as they are.
+
+        Without `checked_at` the listings count as never fetched. With it, their
+        current fields count as fetched at that time.
+        """
+        rows = []
+        for accommodation in accommodations:
+            for kind, kind_fields in KIND_FIELDS.items():
+                fields = None
+                if checked_at is not None:
+                    fields = json.dumps({field: accommodation.get(field, "N/A") for field in kind_fields}, ensure_ascii=False)
+                rows.append((canonical_property_url(accommodation["Link"]), kind, accommodation["Name"], accommodation["City"],
+                             fields, checked_at, checked_at, 0 if checked_at is None else 1))
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO refresh (link, kind, name, city, fields, first_checked_at, checked_at, checks, changes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)", rows
+            )
+            self.db.commit()
+
+    def record(self, kind, accommodation):
+        """Save a part's freshly fetched fields and whether they differ from the last fetch."""
+        link = canonical_property_url(accommodation["Link"])
+        now = self.clock()
+        fields = {field: accommodation.get(field, "N/A") for field in KIND_FIELDS[kind]}
+        with self.lock:
+            row = self.db.execute("SELECT fields FROM refresh WHERE link = ? AND kind = ?", (link, kind)).fetchone()
+            previous = json.loads(row[0]) if row and row[0] else None
+            changed = 0
+            if previous is not None:
+                if all(value == "N/A" for value in fields.values()):
+                    fields = previous  # A failed fetch; keep what we had rather than record a change
+                elif fields != previous:
+                    changed = 1
+            self.db.execute(
+                "INSERT INTO refresh (link, kind, name, city, fields, first_checked_at, checked_at, checks, changes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (link, kind) DO UPDATE SET fields = excluded.fields, checked_at = excluded.checked_at, "
+                "first_checked_at = COALESCE(first_checked_at, excluded.checked_at), "
+                "checks = checks + 1, changes = changes + excluded.changes",
+                (link, kind, accommodation.get("Name"), accommodation.get("City"), json.dumps(fields, ensure_ascii=False),
+                 now, now, changed),
+            )
+            self.db.commit()
+        self.stats["checks"] += 1
+        self.stats["changes"] += changed
+        self.stats["requests"] += KIND_COST[kind]
+        return bool(changed)
+
+    def record_listings(self, accommodations):
+        """Record both parts of fully enriched listings, e.g. at the end of a city crawl."""
+        for accommodation in accommodations:
+            for kind in KIND_FIELDS:
+                self.record(kind, accommodation)
+
+    def plan(self, budget=REFRESH_BUDGET):
+        """Return the (kind, accommodation) refreshes to run, best value per request first, within `budget` requests."""
+        now = self.clock()
+        with self.lock:
+            rows = self.db.execute("SELECT link, kind, name, city, fields, first_checked_at, checked_at, changes FROM refresh").fetchall()
+        # One dict per listing with both parts' fields, shared by its planned refreshes
+        accommodations = {}
+        for link, kind, name, city, fields, *_ in rows:
+            accommodations.setdefault(link, {"Name": name, "City": city, "Link": link}).update(json.loads(fields) if fields else {})
+        candidates = []
+        for link, kind, name, city, fields, first_checked_at, checked_at, changes in rows:
+            fields = json.loads(fields) if fields else {}
+            missing = sum(fields.get(field, "N/A") == "N/A" for field in KIND_FIELDS[kind])
+            if checked_at is None:
+                score = priority(0.0, None, changes, missing)
+            else:
+                score = priority(now - checked_at, checked_at - first_checked_at, changes, missing)
+            if score > 0:
+                candidates.append((score / KIND_COST[kind], kind, accommodations[link]))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        planned, spent = [], 0
+        for _, kind, accommodation in candidates:
+            if spent + KIND_COST[kind] > budget:
+                continue  # A cheaper part further down may still fit
+            planned.append((kind, accommodation))
+            spent += KIND_COST[kind]
+        return planned
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def run_refresh(scheduler, budget, fetch_details, resolve_contacts):
+    """Refresh the planned parts and record them; returns the refreshed listings by link.
+
+    `fetch_details(links)` returns (address, property_type) per link and
+    `resolve_contacts(accommodations)` returns {"Emails", "Phones"} per listing.
+    """
+    planned = scheduler.plan(budget)
+    changes_before = scheduler.stats["changes"]  # The stats add up over every run made with this scheduler
+    refreshed = {}  # Link -> listing with every known field
+    details = [accommodation for kind, accommodation in planned if kind == DETAILS]
+    for accommodation, (address, property_type) in zip(details, fetch_details([a["Link"] for a in details])):
+        if (address, property_type) != ("N/A", "N/A") or "Address" not in accommodation:
+            accommodation["Address"] = address  # A failed fetch keeps the fields we already had
+            accommodation["Property Type"] = property_type
+        scheduler.record(DETAILS, accommodation)
+        refreshed[accommodation["Link"]] = accommodation
+    contacts = [accommodation for kind, accommodation in planned if kind == CONTACTS]
+    for accommodation, contact_details in zip(contacts, resolve_contacts(contacts)):
+        if (contact_details["Emails"][0], contact_details["Phones"][0]) != ("N/A", "N/A") or "Email" not in accommodation:
+            accommodation["Email"] = contact_details["Emails"][0]
+            accommodation["Phone Number"] = contact_details["Phones"][0]
+        scheduler.record(CONTACTS, accommodation)
+        refreshed[accommodation["Link"]] = accommodation
+    print(f"Refreshed {len(details)} detail pages and {len(contacts)} contact lookups "
+          f"({sum(KIND_COST[kind] for kind, _ in planned)} of {budget} requests), {scheduler.stats['changes'] - changes_before} changed.")
+    return refreshed
+
+
+def main():
+    from booking_scraper.adaptive import AdaptiveLimiter
+    from booking_scraper.contact_resolver import CONTACT_BATCH_SIZE, ContactResolver
+    from booking_scraper.dedup_index import PropertyIndex
+    from booking_scraper.extract import extract_details
+    from booking_scraper.fetching import fetch_all
+    from booking_scraper.instrumentation import install
+    from booking_scraper.store import AccommodationStore
+    from booking_scraper import http_client
+
+    parser = argparse.ArgumentParser(description="Refresh the stalest listings within a request budget.")
+    parser.add_argument("--budget", type=int, default=REFRESH_BUDGET, help="Requests this run may spend")
+    parser.add_argument("--seed", action="store_true", help="First track every listing in the accommodation store")
+    args = parser.parse_args()
+    install("refresh")
+
+    scheduler = RefreshScheduler()
+    store = AccommodationStore()
+    if args.seed:
+        # Stored rows count as fetched on their run date, so they are scheduled by age
+        latest = store.query(latest=True)
+        for run_date in sorted({row["Run Date"] for row in latest}):
+            checked_at = datetime.fromisoformat(run_date).timestamp()
+            scheduler.add_listings([row for row in latest if row["Run Date"] == run_date], checked_at)
+        print(f"Tracking {len(latest)} listings from the accommodation store.")
+
+    limiter = AdaptiveLimiter()  # Shared by detail pages and contact pages
+
+    def fetch_details(links):
+        def fetch(link):
+            try:
+                return extract_details(http_client.get(link).content)  # Not the cache: a refresh must see the live page
+            except Exception as e:
+                print(f"Error scraping address and property type for {link}: {e}")
+                return "N/A", "N/A"
+        return fetch_all(links, fetch, limiter=limiter)
+
+    resolver = ContactResolver(fetch=http_client.bounded_get, limiter=limiter)
+
+    def resolve_contacts(accommodations):
+        results = []
+        for start in range(0, len(accommodations), CONTACT_BATCH_SIZE):
+            results += resolver.resolve_batch(accommodations[start:start + CONTACT_BATCH_SIZE])
+        return results
+
+    refreshed = run_refresh(scheduler, args.budget, fetch_details, resolve_contacts)
+    store.add_rows(refreshed.values())
+    property_index = PropertyIndex()
+    property_index.add_many(refreshed.values())  # Later crawls copy the fresh fields
+    property_index.close()
+    scheduler.close()
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# Defaults shared by the commands; each can be overridden on the command line
+BASE_URL = "https://www.booking.com/searchresults.html?ss={city}"
+HEADLESS = True  # Set to False to show the browser windows for debugging
+MAX_LIMIT = 20  # Listings per city, 0 walks every result page
+CITY_DIR = "scraping"  # City Excel files, the input of merge.py
+OUTPUT_FILES = {  # Rows are streamed here and exported to Excel next to it at the end
+    "list": "listings.csv",
+    "details": "accommodations_details.csv",
+    "contacts": "total_accommodations.csv",
+}
+TARGET_CITIES = [
+    "Venice", "Verona", "Padova", "Vicenza", "Bassano del Grappa", "Cortina d'Ampezzo", "Jesolo", 
+    "Milan", "Como", "Bergamo", "Brescia", "Mantua", "Sirmione", "Pavia", "Cremona", "Lecco",
+    "Rome", "Tivoli", "Viterbo", "Ostia Antica", "Ostia", "Fiumicino", "Gaeta",
+    "Florence", "Pisa", "Siena", "Lucca", "Forte dei Marmi", "Viareggio",
+    "Naples", "Pompeii", "Amalfi", "Sorrento", "Capri", "Ischia", "Procida", "Caserta",
+    "Bologna", "Rimini", "Ferrara", "Modena", "Parma", "Ravenna", "Cesenatico", "Riccione",
+    "Palermo", "Catania", "Taormina", "Syracuse", "Agrigento", "Cefalù", "Ragusa", "Trapani",
+    "Bari", "Lecce", "Alberobello", "Ostuni", "Polignano a Mare", "Monopoli", "Gallipoli", "Otranto",
+    "Cinque Terre", "Portofino", "Sanremo", "Alassio",
+    "Turin", "Alba", "Asti",
+    "Trento", "Bolzano", "Madonna di Campiglio", "Riva del Garda",
+    "Olbia", "Cagliari", "Sardinia",
+    "Ancona", "Urbino", "San Benedetto del Tronto", "Macerata",
+    "Perugia",
+    "Trieste", "Udine",
+    "Aosta", "Courmayeur", "Cervinia", "La Thuile", "Gressoney-Saint-Jean", "Saint-Vincent", "Cogne", "Champoluc", "Antey-Saint-André", "Valtournenche"
+]  # Cities crawled when none are given, and queued by distributed.py
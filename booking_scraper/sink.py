@@ -0,0 +1,72 @@
+import csv
+import json
+import os
+import threading
+
+
+class RowSink:
+    """Appends rows to a CSV or JSONL file as they are produced.
+
+    Each write is a single appended line that is flushed straight away, so
+    persisting a row costs the same however many rows came before it, and rows
+    are not kept in memory. The format follows the file extension. Rows
+    written after `close` are dropped, so pipeline threads still running when
+    an interrupted run exports its file can't write into it.
+    """
+
+    def __init__(self, path, columns=None, append=False):
+        self.path = path
+        self.columns = list(columns) if columns else None
+        self.jsonl = path.endswith(".jsonl")
+        self.rows = 0
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        resuming = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if resuming and not self.jsonl:
+            with open(path, newline="", encoding="utf-8") as f:
+                self.columns = next(csv.reader(f))  # Keep the existing header
+        self.file = open(path, "a" if resuming else "w", newline="", encoding="utf-8")
+        self.writer = None
+        if resuming and not self.jsonl:
+            self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction="ignore")
+
+    def write(self, row):
+        with self.lock:
+            if self.file.closed:
+                return
+            if self.jsonl:
+                self.file.write(json.dumps(dict(row), ensure_ascii=False) + "\n")
+            else:
+                if self.writer is None:
+                    # The header comes from the declared columns or the first row
+                    self.columns = self.columns or list(row)
+                    self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction="ignore")
+                    self.writer.writeheader()
+                self.writer.writerow(row)
+            self.file.flush()
+            self.rows += 1
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+def read_rows(path):
+    """Load a sink file into a DataFrame."""
+    import pandas as pd  # Only needed once a run is exported, not while rows are streamed
+    if path.endswith(".jsonl"):
+        return pd.read_json(path, lines=True, dtype=False)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def export_excel(path, excel_path):
+    """Convert a finished sink file to Excel in one pass; returns the number of rows written."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        print(f"No rows in {path} to export.")
+        return 0
+    df = read_rows(path)
+    df.to_excel(excel_path, index=False)
+    return len(df)
@@ -0,0 +1,187 @@
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime
+
+from booking_scraper.dedup_index import canonical_property_url
+from booking_scraper.records import ATTRIBUTES, COLUMNS, MISSING  # MISSING is stored as NULL and returned as "N/A"
+
+STORE_PATH = "accommodations.sqlite"
+FIELDS = dict(zip(COLUMNS, ATTRIBUTES))  # Output column -> store column
+
+REGIONS = {
+    "Veneto": ["Venice", "Verona", "Padova", "Vicenza", "Bassano del Grappa", "Cortina d'Ampezzo", "Jesolo"],
+    "Lombardy": ["Milan", "Como", "Bergamo", "Brescia", "Mantua", "Sirmione", "Pavia", "Cremona", "Lecco"],
+    "Lazio": ["Rome", "Tivoli", "Viterbo", "Ostia Antica", "Ostia", "Fiumicino", "Gaeta", "Anzio"],
+    "Tuscany": ["Florence", "Pisa", "Siena", "Lucca", "Forte dei Marmi", "Viareggio"],
+    "Campania": ["Naples", "Pompeii", "Amalfi", "Sorrento", "Capri", "Ischia", "Procida", "Caserta"],
+    "Emilia-Romagna": ["Bologna", "Rimini", "Ferrara", "Modena", "Parma", "Ravenna", "Cesenatico", "Riccione"],
+    "Sicily": ["Palermo", "Catania", "Taormina", "Syracuse", "Agrigento", "Cefalù", "Ragusa", "Trapani"],
+    "Puglia": ["Bari", "Lecce", "Alberobello", "Ostuni", "Polignano a Mare", "Monopoli", "Gallipoli", "Otranto"],
+    "Liguria": ["Cinque Terre", "Portofino", "Sanremo", "Alassio"],
+    "Piedmont": ["Turin", "Alba", "Asti"],
+    "Trentino-Alto Adige": ["Trento", "Bolzano", "Madonna di Campiglio", "Riva del Garda"],
+    "Sardinia": ["Olbia", "Cagliari", "Sardinia"],
+    "Marche": ["Ancona", "Urbino", "San Benedetto del Tronto", "Macerata"],
+    "Umbria": ["Perugia"],
+    "Friuli-Venezia Giulia": ["Trieste", "Udine"],
+    "Aosta Valley": ["Aosta", "Courmayeur", "Cervinia", "La Thuile", "Gressoney-Saint-Jean", "Saint-Vincent",
+                     "Cogne", "Champoluc", "Antey-Saint-André", "Valtournenche"],
+}
+CITY_REGIONS = {city: region for region, cities in REGIONS.items() for city in cities}
+
+# Rows are clustered on (city, run_date, link), so every city and run is one
+# contiguous range of the table, the way a partitioned dataset would be.
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS accommodations ("
+    "city TEXT NOT NULL, run_date TEXT NOT NULL, link TEXT NOT NULL, name TEXT, region TEXT, "
+    "address TEXT, property_type TEXT COLLATE NOCASE, email TEXT, phone_number TEXT, "
+    "PRIMARY KEY (city, run_date, link)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS accommodations_property_type ON accommodations (property_type, city)",
+    "CREATE INDEX IF NOT EXISTS accommodations_region ON accommodations (region, property_type)",
+    "CREATE INDEX IF NOT EXISTS accommodations_link ON accommodations (link)",
+]
+
+
+class AccommodationStore:
+    """SQLite store of every scraped accommodation, one row per city, run date and link.
+
+    Filters passed to `query` become indexed WHERE clauses, so a lookup reads
+    only the matching rows instead of loading the whole history.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self.db.execute(statement)
+
+    def add_rows(self, rows, run_date=None):
+        """Save accommodation records or dicts for one run (today by default); a rerun on the same day replaces them."""
+        run_date = run_date or date.today().isoformat()
+        records = []
+        for row in rows:
+            record = {column: row.get(field) for field, column in FIELDS.items()}
+            record = {column: (None if value in (None, "", MISSING) else str(value)) for column, value in record.items()}
+            if not record["city"] or not record["link"]:
+                continue
+            record["link"] = canonical_property_url(record["link"])
+            record["run_date"] = run_date
+            record["region"] = CITY_REGIONS.get(record["city"])
+            records.append(record)
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO accommodations (city, run_date, link, name, region, address, property_type, email, phone_number) "
+                "VALUES (:city, :run_date, :link, :name, :region, :address, :property_type, :email, :phone_number)",
+                records,
+            )
+            self.db.commit()
+        return len(records)
+
+    def query(self, city=None, region=None, property_type=None, run_date=None, link=None, missing=(), latest=False, limit=None):
+        """Return matching rows as dicts with the output column names.
+
+        `missing` names output columns that must be empty, e.g. ["Phone Number"];
+        `latest` keeps only each city's most recent run.
+        """
+        conditions, params = [], []
+        for column, value in (("city", city), ("region", region), ("property_type", property_type),
+                              ("run_date", run_date), ("link", link)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        for field in missing:
+            conditions.append(f"{FIELDS[field]} IS NULL")
+        if latest:
+            conditions.append("run_date = (SELECT MAX(run_date) FROM accommodations AS newer WHERE newer.city = accommodations.city)")
+        sql = f"SELECT {', '.join(FIELDS.values())}, run_date FROM accommodations"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY city, run_date, link"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        names = list(FIELDS) + ["Run Date"]
+        return [{name: (MISSING if value is None else value) for name, value in zip(names, row)} for row in rows]
+
+    def run_dates(self, city=None):
+        sql, params = "SELECT DISTINCT run_date FROM accommodations", []
+        if city is not None:
+            sql, params = sql + " WHERE city = ?", [city]
+        with self.lock:
+            return [row[0] for row in self.db.execute(sql + " ORDER BY run_date", params)]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def read_file(path):
+    """Load rows from an xlsx, CSV, JSONL or Parquet file."""
+    import pandas as pd  # Only needed to ingest files
+
+    if path.endswith((".xlsx", ".xls")):
+        df = pd.read_excel(path, dtype=str)
+    elif path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    elif path.endswith(".jsonl"):
+        df = pd.read_json(path, lines=True, dtype=False)
+    else:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def ingest_file(store, path, run_date=None):
+    """Add a finished output file to the store; the run date defaults to the file's modification date."""
+    run_date = run_date or datetime.fromtimestamp(os.path.getmtime(path)).date().isoformat()
+    return store.add_rows(read_file(path), run_date)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and load the accommodation store.")
+    parser.add_argument("--store", default=STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Load output files (xlsx, csv, jsonl, parquet) into the store")
+    ingest.add_argument("files", nargs="+")
+    ingest.add_argument("--run-date", help="YYYY-MM-DD; defaults to each file's modification date")
+
+    query = commands.add_parser("query", help="Print matching rows as CSV")
+    query.add_argument("--city")
+    query.add_argument("--region", choices=sorted(REGIONS))
+    query.add_argument("--type", dest="property_type", help='Property type, e.g. "Bed and Breakfast"')
+    query.add_argument("--run-date")
+    query.add_argument("--link")
+    query.add_argument("--missing", action="append", default=[], choices=[field for field in FIELDS if field not in ("City", "Link")],
+                       help="Only rows where this column is empty; can be repeated")
+    query.add_argument("--latest", action="store_true", help="Only each city's most recent run")
+    query.add_argument("--limit", type=int)
+    query.add_argument("--count", action="store_true", help="Print the number of matching rows only")
+    args = parser.parse_args()
+
+    store = AccommodationStore(args.store)
+    if args.command == "ingest":
+        for path in args.files:
+            try:
+                print(f"Loaded {ingest_file(store, path, args.run_date)} rows from {path}.")
+            except Exception as e:
+                print(f"Could not load {path}: {e}")
+    else:
+        rows = store.query(args.city, args.region, args.property_type, args.run_date, args.link,
+                           args.missing, args.latest, args.limit)
+        if args.count:
+            print(len(rows))
+        else:
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(FIELDS) + ["Run Date"])
+            writer.writeheader()
+            writer.writerows(rows)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import threading
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from booking_scraper.instrumentation import observe
+from booking_scraper.listing import CARD_SELECTOR
+
+MODAL_SELECTOR = 'button[aria-label="Dismiss sign-in info."]'
+LOAD_MORE_XPATH = '//button[.//span[text()="Load more results"]]'
+
+# Timeouts in seconds; each wait returns as soon as its condition holds
+PAGE_READY_TIMEOUT = 15  # Sign-in modal or first results after opening the search page
+MODAL_GRACE_TIMEOUT = 3  # Extra time for the modal to pop up once results are showing
+LOAD_MORE_TIMEOUT = 5  # "Load more results" button becoming clickable
+NEW_RESULTS_TIMEOUT = 10  # Cards appended after a "Load more" click
+POLL_FREQUENCY = 0.1
+
+# Wait name -> list of (seconds waited, condition met), kept per thread so
+# browsers crawling different cities in parallel don't mix their numbers
+_local = threading.local()
+
+
+def get_wait_stats():
+    if not hasattr(_local, "wait_stats"):
+        _local.wait_stats = {}
+    return _local.wait_stats
+
+
+def timed_wait(name, driver, condition, timeout):
+    """Wait for `condition`, recording how long it took. Returns None on timeout."""
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+    except TimeoutException:
+        result = None
+    elapsed = time.perf_counter() - start
+    get_wait_stats().setdefault(name, []).append((elapsed, result is not None))
+    observe(f"wait.{name}", elapsed)
+    return result
+
+
+def modal_or_results(driver):
+    """Condition: the sign-in modal's close button or the first result card is on the page."""
+    close_buttons = driver.find_elements(By.CSS_SELECTOR, MODAL_SELECTOR)
+    if close_buttons:
+        return ("modal", close_buttons[0])
+    if driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR):
+        return ("results", None)
+    return False
+
+
+def card_count_above(count):
+    """Condition: more than `count` result cards are on the page."""
+    def condition(driver):
+        return len(driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)) > count
+    return condition
+
+
+def new_results_loaded(count):
+    """Condition: new cards were appended after a "Load more" click.
+
+    The clicked button going stale is not enough: the page removes it before
+    the new cards are inserted, and on the last page no new button follows.
+    """
+    return card_count_above(count)
+
+
+def summarize_wait_stats():
+    """Return count, total and max seconds and timeouts for every wait recorded on this thread."""
+    summary = {}
+    for name, samples in get_wait_stats().items():
+        durations = [duration for duration, _ in samples]
+        summary[name] = {
+            "count": len(samples),
+            "total": sum(durations),
+            "max": max(durations),
+            "timeouts": sum(1 for _, met in samples if not met),
+        }
+    return summary
+
+
+def print_wait_stats(label):
+    """Print the wait summary for `label` (usually a city) and start a fresh one."""
+    for name, stats in summarize_wait_stats().items():
+        print(f"[{label}] {name}: {stats['count']} waits, {stats['total']:.2f}s total, "
+              f"{stats['max']:.2f}s max, {stats['timeouts']} timeouts")
+    get_wait_stats().clear()
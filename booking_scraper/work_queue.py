@@ -0,0 +1,187 @@
+import abc
+import json
+import sqlite3
+import threading
+import time
+
+QUEUE_URL = "sqlite:///work_queue.sqlite"
+LEASE_SECONDS = 300  # A leased task not completed or renewed within this goes back to the queue
+MAX_ATTEMPTS = 3  # Leases per task before it is marked failed, so a task that crashes workers can't loop forever
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class Task:
+    """One unit of work: `kind` ("city", "listing", ...), a unique `key` and a JSON-friendly `payload`."""
+
+    def __init__(self, kind, key, payload, attempts=0, status=PENDING, result=None):
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+        self.status = status
+        self.result = result
+
+
+class WorkQueue(abc.ABC):
+    """Interface of the shared queue coordinators and workers talk to.
+
+    Tasks are identified by (kind, key), so putting the same task twice is a
+    no-op and a task redone after a lost lease completes only once. A backend
+    for another store (e.g. Redis) implements these methods and registers
+    itself with `register_backend`; one that misses any of them can't be created.
+    """
+
+    @abc.abstractmethod
+    def put_many(self, kind, items):
+        """Add (key, payload) tasks; keys already in the queue are left alone."""
+
+    @abc.abstractmethod
+    def lease(self, kind, owner, limit=1, lease_seconds=LEASE_SECONDS):
+        """Claim up to `limit` pending or expired tasks of `kind` for `owner`."""
+
+    @abc.abstractmethod
+    def renew(self, tasks, owner, lease_seconds=LEASE_SECONDS):
+        """Extend `owner`'s leases on tasks still being worked on."""
+
+    @abc.abstractmethod
+    def complete(self, task, result=None):
+        """Mark a task done with its result; later completions of the same task are ignored."""
+
+    @abc.abstractmethod
+    def fail(self, task, error):
+        """Return a task to the queue, or mark it failed once it has used MAX_ATTEMPTS leases."""
+
+    @abc.abstractmethod
+    def tasks(self, kind, status=None):
+        """Return every task of `kind`, optionally only those with `status`."""
+
+    @abc.abstractmethod
+    def counts(self):
+        """Return {kind: {status: count}}."""
+
+    def close(self):
+        pass
+
+
+class SQLiteQueue(WorkQueue):
+    """Work queue in one SQLite file, shared by every process that can open it (same machine or a shared disk)."""
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        # Autocommit mode so leases can take the write lock up front with BEGIN IMMEDIATE
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "kind TEXT NOT NULL, key TEXT NOT NULL, payload TEXT, status TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "owner TEXT, lease_expires REAL, result TEXT, error TEXT, updated_at REAL, UNIQUE (kind, key))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (kind, status, lease_expires)")
+
+    def put_many(self, kind, items):
+        now = time.time()
+        rows = [(kind, key, json.dumps(payload, ensure_ascii=False), PENDING, now) for key, payload in items]
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.executemany(
+                "INSERT OR IGNORE INTO tasks (kind, key, payload, status, attempts, updated_at) VALUES (?, ?, ?, ?, 0, ?)", rows
+            )
+            self.db.execute("COMMIT")
+
+    def lease(self, kind, owner, limit=1, lease_seconds=LEASE_SECONDS):
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")  # No other process can lease the same rows in between
+            try:
+                # Expired leases whose owner crashed too often are given up on
+                self.db.execute(
+                    "UPDATE tasks SET status = ?, error = 'lease expired', owner = NULL, updated_at = ? "
+                    "WHERE kind = ? AND status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, now, kind, LEASED, now, MAX_ATTEMPTS),
+                )
+                rows = self.db.execute(
+                    "SELECT rowid, key, payload, attempts FROM tasks "
+                    "WHERE kind = ? AND (status = ? OR (status = ? AND lease_expires < ?)) ORDER BY rowid LIMIT ?",
+                    (kind, PENDING, LEASED, now, limit),
+                ).fetchall()
+                self.db.executemany(
+                    "UPDATE tasks SET status = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE rowid = ?",
+                    [(LEASED, owner, now + lease_seconds, now, rowid) for rowid, *_ in rows],
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        return [Task(kind, key, json.loads(payload), attempts + 1, LEASED) for _, key, payload, attempts in rows]
+
+    def renew(self, tasks, owner, lease_seconds=LEASE_SECONDS):
+        now = time.time()
+        with self.lock:
+            self.db.executemany(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE kind = ? AND key = ? AND owner = ? AND status = ?",
+                [(now + lease_seconds, now, task.kind, task.key, owner, LEASED) for task in tasks],
+            )
+
+    def complete(self, task, result=None):
+        with self.lock:
+            self.db.execute(
+                "UPDATE tasks SET status = ?, result = ?, owner = NULL, lease_expires = NULL, error = NULL, updated_at = ? "
+                "WHERE kind = ? AND key = ? AND status != ?",
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), task.kind, task.key, DONE),
+            )
+
+    def fail(self, task, error):
+        with self.lock:
+            self.db.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, owner = NULL, lease_expires = NULL, "
+                "error = ?, updated_at = ? WHERE kind = ? AND key = ? AND status != ?",
+                (MAX_ATTEMPTS, FAILED, PENDING, str(error), time.time(), task.kind, task.key, DONE),
+            )
+
+    def tasks(self, kind, status=None):
+        query = "SELECT key, payload, attempts, status, result FROM tasks WHERE kind = ?"
+        params = [kind]
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        with self.lock:
+            rows = self.db.execute(query + " ORDER BY rowid", params).fetchall()
+        return [Task(kind, key, json.loads(payload), attempts, task_status, json.loads(result) if result else None)
+                for key, payload, attempts, task_status, result in rows]
+
+    def counts(self):
+        with self.lock:
+            rows = self.db.execute("SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status").fetchall()
+        counts = {}
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+BACKENDS = {"sqlite": lambda location: SQLiteQueue(location)}  # URL scheme -> factory taking the rest of the URL
+
+
+def register_backend(scheme, factory):
+    """Make `open_queue("<scheme>://...")` call `factory(rest_of_url)`."""
+    BACKENDS[scheme] = factory
+
+
+def open_queue(url=QUEUE_URL):
+    """Open a queue from a URL such as "sqlite:///work_queue.sqlite"; a bare path is a SQLite file."""
+    scheme, separator, location = url.partition("://")
+    if not separator:
+        return SQLiteQueue(url)
+    if scheme not in BACKENDS:
+        raise ValueError(f"No work queue backend for {scheme}:// (known: {', '.join(sorted(BACKENDS))})")
+    if scheme == "sqlite":
+        location = location[1:] if location.startswith("/") else location  # sqlite:///relative, sqlite:////absolute
+    return BACKENDS[scheme](location)
@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.fixture_server import start_server
+from booking_scraper import http_client
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """A fresh shared HTTP session without retries, so each test sees every status its server sends."""
+    monkeypatch.setattr(http_client, "_session", http_client.create_session(max_retries=0))
+
+
+@pytest.fixture
+def serve():
+    """`serve(**start_server options)` starts a local fixture server and returns its base URL; stopped after the test."""
+    servers = []
+
+    def start(**kwargs):
+        kwargs.setdefault("latency", 0)
+        server, base_url = start_server(**kwargs)
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
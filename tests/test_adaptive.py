@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from booking_scraper import adaptive, http_client
+from booking_scraper.adaptive import AdaptiveLimiter
+from booking_scraper.fetching import fetch_politely
+
+CAPTCHA_PAGE = b'<html><body><div id="px-captcha"></div></body></html>'
+PAGE = b"<html><body>Hotel</body></html>"
+
+
+@pytest.fixture
+def short_pause(monkeypatch):
+    monkeypatch.setattr(adaptive, "PAUSE_SECONDS", 0.5)  # Read by each new host
+    return 0.5
+
+
+def get_through(limiter, url):
+    with limiter.slot(url) as slot:
+        http_client.get(url)
+    return slot
+
+
+def test_healthy_responses_ramp_the_host_up(session, serve):
+    url = serve(route=lambda path: PAGE) + "/page"
+    limiter = AdaptiveLimiter()
+    for _ in range(5):
+        assert get_through(limiter, url).outcome == "ok"
+    state = limiter.host_for(url)
+    assert state.rate > adaptive.START_RATE
+    assert state.limit > adaptive.START_CONCURRENCY
+
+
+def test_throttling_halves_rate_and_concurrency_once_per_burst(session, serve):
+    url = serve(route=lambda path: PAGE, error_rate=1.0, error_status=429) + "/page"
+    limiter = AdaptiveLimiter()
+    state = limiter.host_for(url)
+    for _ in range(2):
+        assert get_through(limiter, url).outcome == "throttled"
+    assert state.rate == adaptive.START_RATE * adaptive.DECREASE_FACTOR
+    assert state.limit == adaptive.START_CONCURRENCY * adaptive.DECREASE_FACTOR
+    assert state.stats["throttled"] == 2
+    assert state.stats["decreases"] == 1  # Both 429s came within DECREASE_INTERVAL
+    assert not state.slow_start
+
+
+def test_a_block_page_pauses_the_host(session, serve, short_pause):
+    url = serve(route=lambda path: CAPTCHA_PAGE) + "/page"
+    limiter = AdaptiveLimiter()
+    slot = get_through(limiter, url)
+    assert slot.blocked
+    state = limiter.host_for(url)
+    assert state.limit == 1.0
+    assert state.pause == short_pause * 2  # The next block in a row pauses twice as long
+
+    start = time.monotonic()
+    limiter.wait(url)
+    assert time.monotonic() - start >= short_pause * 0.9
+
+
+def test_fetch_politely_repeats_a_blocked_request_after_the_pause(session, serve, short_pause):
+    answers = iter([CAPTCHA_PAGE, PAGE])
+    url = serve(route=lambda path: next(answers)) + "/page"
+    limiter = AdaptiveLimiter()
+    start = time.monotonic()
+    response = fetch_politely(url, http_client.get, limiter)
+    assert response.content == PAGE
+    assert time.monotonic() - start >= short_pause * 0.9
+    assert limiter.host_for(url).stats == {"requests": 2, "throttled": 0, "errors": 0, "blocked": 1, "decreases": 0}
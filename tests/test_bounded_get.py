@@ -0,0 +1,46 @@
+import pytest
+
+from benchmarks.bench_bounded_fetch import start_oversized_server
+from booking_scraper import http_client
+from booking_scraper.contacts import ContactCollector
+
+PAGE_SIZE = 3 * http_client.MAX_BODY_BYTES  # Of the directory page, the PDF and the video
+
+
+@pytest.fixture
+def site():
+    """Serves /contact (a normal page), /directory (a huge page), /pdf and /video."""
+    server, base_url = start_oversized_server(PAGE_SIZE)
+    yield base_url
+    server.shutdown()
+
+
+def contacts_in(response):
+    collector = ContactCollector()
+    collector.scan_stream(http_client.iter_body(response))
+    return list(collector.emails.values())
+
+
+def test_small_pages_are_read_whole(session, site):
+    response = http_client.bounded_get(site + "/contact")
+    assert not response.truncated
+    assert b"</html>" in response.content
+    assert contacts_in(response)
+
+
+def test_long_pages_are_cut_at_max_bytes(session, site):
+    response = http_client.bounded_get(site + "/directory")
+    assert response.truncated
+    assert len(response.content) == http_client.MAX_BODY_BYTES
+    assert contacts_in(response)  # The contacts at the top of the page are still found
+
+
+def test_the_cap_can_be_lowered_per_call(session, site):
+    response = http_client.bounded_get(site + "/directory", max_bytes=1000)
+    assert (len(response.content), response.truncated) == (1000, True)
+
+
+@pytest.mark.parametrize("kind", ["pdf", "video"])
+def test_binary_responses_are_rejected_from_their_headers(session, site, kind):
+    with pytest.raises(http_client.ContentRejected, match="application/pdf|video/mp4"):
+        http_client.bounded_get(f"{site}/{kind}")
@@ -0,0 +1,58 @@
+import json
+
+from booking_scraper.checkpoint import CONTACTED, DETAILED, FAILED, LISTED, CheckpointStore
+from booking_scraper.records import Accommodation
+
+
+def listing(n):
+    return Accommodation(f"Hotel {n}", "Venice", f"https://www.booking.com/hotel/it/h-{n}.html")
+
+
+def crawl_and_crash(path):
+    """Record a city's progress, then cut the last event off mid-line like a crash during the write."""
+    checkpoint = CheckpointStore(path)
+    checkpoint.record_city_listed("Venice", [listing(1), listing(2), listing(3)])
+    first = listing(1)
+    first["Address"] = "Via Roma 1, 30124 Venice, Italy"
+    checkpoint.record_listing(first, DETAILED)
+    checkpoint.record_listing(listing(2), FAILED, "details")
+    third = listing(3)
+    third["Email"] = "info@hotel.it"
+    checkpoint.record_listing(third, CONTACTED)
+    checkpoint.close()
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text[:-20])
+
+
+def test_a_torn_last_line_is_skipped_on_replay(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    crawl_and_crash(path)
+    checkpoint = CheckpointStore(path)
+    assert checkpoint.status("Venice", listing(1)["Link"]) == (DETAILED, None)
+    assert checkpoint.status("Venice", listing(2)["Link"]) == (FAILED, "details")
+    assert checkpoint.status("Venice", listing(3)["Link"]) == (LISTED, None)  # Its contacts are fetched again
+    accommodations = checkpoint.city_accommodations("Venice")
+    assert accommodations[0]["Address"] == "Via Roma 1, 30124 Venice, Italy"
+    assert accommodations[2]["Email"] == "N/A"
+    assert checkpoint.has_failures("Venice")
+    assert not checkpoint.is_city_done("Venice")
+    checkpoint.close()
+
+
+def test_events_after_a_torn_line_start_on_a_line_of_their_own(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    crawl_and_crash(path)
+    checkpoint = CheckpointStore(path)
+    checkpoint.record_listing(listing(3), CONTACTED)
+    checkpoint.record_city_done("Venice")
+    checkpoint.close()
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["type"] for line in lines[-2:]] == ["listing", "city_done"]
+    resumed = CheckpointStore(path)
+    assert resumed.status("Venice", listing(3)["Link"]) == (CONTACTED, None)
+    assert resumed.is_city_done("Venice")
+    resumed.close()
@@ -0,0 +1,38 @@
+import pytest
+
+from booking_scraper import extract
+
+FILLER = "".join(f"<p>Review {n}</p>" for n in range(50))  # Finished siblings the lxml backend prunes
+PAGES = {
+    "address div": (
+        f"<html><body>{FILLER}<div class='wrap'>{FILLER}"
+        "<div tabindex='0' class='a53cbfa6de f17adf7576'><span>Via <b>Roma</b> 1</span>, "
+        "<em>30124 Venice</em>, Italy <button>Excellent location</button></div></div>"
+        f"{FILLER}<nav><a class='bui_breadcrumb__link_masked' href='#'><span>Hotels</span> <i>(Apartment)</i></a></nav>"
+        "</body></html>"
+    ),
+    "address subtitle": (
+        f"<html><body>{FILLER}<p><span class='hp_address_subtitle'><span>Calle Larga 1</span>, "
+        "<b>San Marco</b>, Venice, Italy</span></p>"
+        f"<ul><li>{FILLER}</li><li><a class='bui_breadcrumb__link_masked'><span>Venice</span> "
+        "<span>(Guest house)</span></a></li></ul></body></html>"
+    ),
+}
+EXPECTED = {
+    "address div": ("Via Roma 1, 30124 Venice, Italy", "Apartment"),
+    "address subtitle": ("Calle Larga 1, San Marco, Venice, Italy", "Guest house"),
+}
+BACKENDS = ["lxml", "html.parser"] + (["selectolax"] if extract.HTMLParser is not None else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_backends_return_the_full_nested_address(page, backend):
+    assert extract.extract_details(PAGES[page].encode("utf-8"), backend) == EXPECTED[page]
+
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+def test_lxml_small_chunks(page):
+    """Elements end in different feeds, so pruning runs while the address is still open."""
+    chunks = extract.iter_chunks(PAGES[page].encode("utf-8"), size=16)
+    assert extract._extract_lxml(chunks, "utf-8") == EXPECTED[page]
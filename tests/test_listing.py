@@ -0,0 +1,53 @@
+import pytest
+
+from benchmarks.fixture_server import replay_route
+from booking_scraper.fetching import HostRateLimiter
+from booking_scraper.listing import SearchPageError, scrape_booking_http
+
+CAPTCHA_PAGE = b'<html><body><div id="px-captcha"></div></body></html>'
+
+
+@pytest.fixture
+def limiter():
+    return HostRateLimiter(rate=10000, capacity=1000)  # One local host; no need to be polite
+
+
+def search_url(base_url):
+    return f"{base_url}/searchresults.html?ss={{city}}"
+
+
+def failing_at(offset, body):
+    """A replay route whose search page at `offset` answers with `body` (None for a 404)."""
+    return lambda path: body if f"offset={offset}" in path else replay_route(path)
+
+
+def test_every_result_page_is_walked(session, serve, limiter):
+    url = search_url(serve(route=replay_route))
+    accommodations = scrape_booking_http("Venice", base_url=url, limiter=limiter)
+    assert len(accommodations) == 60
+    assert len({accommodation["Link"] for accommodation in accommodations}) == 60
+    assert {accommodation["City"] for accommodation in accommodations} == {"Venice"}
+    assert all("fixture-venice" in accommodation["Link"] for accommodation in accommodations)
+
+
+def test_max_results_stops_early_and_each_listing_is_streamed(session, serve, limiter):
+    url = search_url(serve(route=replay_route))
+    streamed = []
+    accommodations = scrape_booking_http("Venice", max_results=30, base_url=url, on_listing=streamed.append,
+                                         limiter=limiter)
+    assert len(accommodations) == 30
+    assert streamed == accommodations
+
+
+def test_a_page_without_cards_lists_nothing(session, serve, limiter):
+    url = search_url(serve(fixture="search_empty.html"))
+    assert scrape_booking_http("Venice", base_url=url, limiter=limiter) == []
+
+
+@pytest.mark.parametrize("body, reason", [(None, "HTTP 404"), (CAPTCHA_PAGE, "a block page")])
+def test_a_failing_later_page_raises_instead_of_truncating(session, serve, limiter, body, reason):
+    url = search_url(serve(route=failing_at(25, body)))
+    streamed = []
+    with pytest.raises(SearchPageError, match=f"offset 25 returned {reason}"):
+        scrape_booking_http("Venice", base_url=url, on_listing=streamed.append, limiter=limiter)
+    assert len(streamed) == 25  # The first page was already handed on
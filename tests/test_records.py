@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from booking_scraper.records import COLUMNS, MISSING, NORMALIZERS, Accommodation, RecordBuffer, SchemaError, normalize_frame
+
+LINK = "https://www.booking.com/hotel/it/h-1.html"
+
+
+def test_values_are_normalised_as_they_are_set():
+    record = Accommodation("  Hotel 1 ", "Venice", LINK, address="", email="info@hotel.it",
+                           phone_number="+39 (041) 520-0000")
+    assert record["Name"] == "Hotel 1"
+    assert record["Address"] == MISSING
+    assert record["Phone Number"] == "+39 041 520 0000"
+
+    record["Email"] = "logo@2x.png"  # An image name the email pattern picked up
+    record["Phone Number"] = "+39 041 52"  # Cut off on the page
+    assert (record["Email"], record["Phone Number"]) == (MISSING, MISSING)
+    record["Phone Number"] = "041 520 0000"  # No +39
+    assert record["Phone Number"] == MISSING
+
+
+@pytest.mark.parametrize("row", [{"Name": "Hotel 1", "Link": LINK}, {"City": "Venice", "Link": " N/A "},
+                                 {"City": None, "Link": LINK}])
+def test_records_without_a_city_or_link_are_rejected(row):
+    with pytest.raises(SchemaError):
+        Accommodation.from_row(row)
+
+
+def test_unknown_columns_fail_where_they_are_written():
+    with pytest.raises(SchemaError, match="Phone"):
+        Accommodation.from_row({"City": "Venice", "Link": LINK, "Phone": "+39 041 520 0000"})
+    record = Accommodation(city="Venice", link=LINK)
+    with pytest.raises(KeyError, match="Adress"):
+        record["Adress"] = "Via Roma 1"
+    with pytest.raises(KeyError):
+        record["Adress"]
+    with pytest.raises(SchemaError):
+        record["Link"] = ""
+
+
+def test_update_and_copy_behave_like_a_dict():
+    record = Accommodation.from_row({"City": "Venice", "Link": LINK})
+    copy = record.copy()
+    record.update({"Address": "Via Roma 1"}, Email="info@hotel.it")
+    assert dict(record) == {"Name": MISSING, "City": "Venice", "Link": LINK, "Address": "Via Roma 1",
+                            "Property Type": MISSING, "Email": "info@hotel.it", "Phone Number": MISSING}
+    assert copy["Address"] == MISSING
+
+
+def test_record_buffer_validates_rows_and_reads_back_across_batches():
+    rows = [{"City": "Venice", "Link": f"{LINK}?n={n}", "Phone Number": "+390415200000"} for n in range(5)]
+    buffer = RecordBuffer(rows, batch_size=2)
+    assert len(buffer) == 5
+    assert [record["Link"] for record in buffer] == [row["Link"] for row in rows]
+    assert set(buffer.column("Phone Number")) == {"+39 041 520 0000"}
+    with pytest.raises(SchemaError):
+        buffer.append({"City": "Venice"})
+    assert len(buffer) == 5
+
+
+def test_normalize_frame_matches_the_record_normalisers():
+    cells = [None, np.nan, "", " N/A ", "  Hotel 1 ", 12, "info@hotel.it", "1info@hotel.it", "logo@2x.PNG",
+             "+39 (041) 520-0000", "+390415200000", "+39 041 52", "041 520 0000"]
+    df = pd.DataFrame({column: cells for column in COLUMNS[1:]}).assign(Extra=1)  # No Name column, one unknown
+    normalized = normalize_frame(df)
+    assert list(normalized.columns) == list(COLUMNS)
+    assert normalized["Name"].tolist() == [MISSING] * len(cells)
+    for column in COLUMNS[1:]:
+        assert normalized[column].tolist() == [NORMALIZERS[column](cell) for cell in cells], column
@@ -0,0 +1,85 @@
+import pytest
+
+from booking_scraper import scheduler
+from booking_scraper.scheduler import CONTACTS, DETAILS, KIND_COST, RefreshScheduler, run_refresh
+
+DAY = 24 * 3600
+
+
+class FakeClock:
+    """Stands in for time.time; tests move it forward by hand."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def listing(n, address="Via Roma 1, Venice, Italy", email="info@hotel.it"):
+    return {"Name": f"Hotel {n}", "City": "Venice", "Link": f"https://www.booking.com/hotel/it/h-{n}.html",
+            "Address": address, "Property Type": "Hotel", "Email": email, "Phone Number": "+39 041 000 0000"}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def refresh(tmp_path, clock):
+    refresh_scheduler = RefreshScheduler(str(tmp_path / "schedule.sqlite"), clock=clock)
+    yield refresh_scheduler
+    refresh_scheduler.close()
+
+
+def planned_links(plan, kind=None):
+    return [accommodation["Link"] for planned_kind, accommodation in plan if kind in (None, planned_kind)]
+
+
+def test_never_fetched_parts_come_first_within_the_budget(refresh, clock):
+    refresh.add_listings([listing(1)], checked_at=clock())
+    refresh.add_listings([listing(2)])  # Never fetched
+    clock.advance(60 * DAY)
+    plan = refresh.plan(budget=KIND_COST[DETAILS] + KIND_COST[CONTACTS])
+    assert planned_links(plan) == [listing(2)["Link"]] * 2
+
+
+def test_recently_checked_parts_wait_for_min_age(refresh, clock):
+    refresh.add_listings([listing(1)], checked_at=clock())
+    clock.advance(scheduler.MIN_AGE - 1)
+    assert refresh.plan() == []
+    clock.advance(2)
+    assert sorted(kind for kind, _ in refresh.plan()) == [CONTACTS, DETAILS]
+
+
+def test_parts_that_change_are_refreshed_before_stable_ones(refresh, clock):
+    refresh.add_listings([listing(1), listing(2)], checked_at=clock())
+    for day in range(1, 4):
+        clock.advance(10 * DAY)
+        refresh.record(DETAILS, listing(1, address=f"Via Roma {day}, Venice, Italy"))  # Moves every check
+        refresh.record(DETAILS, listing(2))
+    clock.advance(10 * DAY)
+    assert planned_links(refresh.plan(budget=1), DETAILS) == [listing(1)["Link"]]
+
+
+def test_run_refresh_keeps_fields_on_failed_fetches_and_reports_this_runs_changes(refresh, clock, capsys):
+    refresh.add_listings([listing(1), listing(2)], checked_at=clock())
+    clock.advance(40 * DAY)
+    pages = {listing(1)["Link"]: ("Via Nuova 2, Venice, Italy", "Hotel"), listing(2)["Link"]: ("N/A", "N/A")}
+    fetch_details = lambda links: [pages[link] for link in links]
+    resolve_contacts = lambda accommodations: [{"Emails": ["info@hotel.it"], "Phones": ["+39 041 000 0000"]}
+                                               for _ in accommodations]
+
+    refreshed = run_refresh(refresh, 100, fetch_details, resolve_contacts)
+    assert refreshed[listing(1)["Link"]]["Address"] == "Via Nuova 2, Venice, Italy"
+    assert refreshed[listing(2)["Link"]]["Address"] == "Via Roma 1, Venice, Italy"  # The failed fetch changed nothing
+    assert "1 changed." in capsys.readouterr().out
+
+    clock.advance(40 * DAY)
+    run_refresh(refresh, 100, fetch_details, resolve_contacts)
+    assert "0 changed." in capsys.readouterr().out  # Not the running total
+    assert refresh.stats["changes"] == 1
@@ -0,0 +1,12 @@
+from booking_scraper.records import COLUMNS, Accommodation
+from booking_scraper.sink import RowSink, read_rows
+
+
+def test_rows_written_after_close_are_dropped(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    sink = RowSink(path, COLUMNS)
+    sink.write(Accommodation("Hotel 1", "Venice", "https://www.booking.com/hotel/it/h-1.html"))
+    sink.close()
+    sink.write(Accommodation("Hotel 2", "Venice", "https://www.booking.com/hotel/it/h-2.html"))  # A late pipeline thread
+    assert sink.rows == 1
+    assert read_rows(path)["Name"].tolist() == ["Hotel 1"]
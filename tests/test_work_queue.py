@@ -0,0 +1,98 @@
+import pytest
+
+from booking_scraper import work_queue
+from booking_scraper.work_queue import DONE, FAILED, LEASED, MAX_ATTEMPTS, PENDING, SQLiteQueue
+
+
+class FakeTime:
+    """Stands in for the time module inside work_queue, so leases expire when a test says so."""
+
+    now = 1_700_000_000.0
+
+    @classmethod
+    def time(cls):
+        return cls.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(work_queue, "time", FakeTime)
+    FakeTime.now = 1_700_000_000.0
+    return FakeTime
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    task_queue = SQLiteQueue(str(tmp_path / "queue.sqlite"))
+    task_queue.put_many("city", [("Venice", {"City": "Venice"}), ("Verona", {"City": "Verona"})])
+    yield task_queue
+    task_queue.close()
+
+
+def statuses(queue):
+    return {task.key: (task.status, task.attempts) for task in queue.tasks("city")}
+
+
+def test_putting_a_task_twice_is_a_no_op(queue):
+    queue.put_many("city", [("Venice", {"City": "Somewhere else"})])
+    assert [task.payload["City"] for task in queue.tasks("city")] == ["Venice", "Verona"]
+
+
+def test_leased_tasks_are_not_handed_out_again_until_the_lease_expires(queue, clock):
+    first = queue.lease("city", "worker-1", limit=1, lease_seconds=60)
+    assert [(task.key, task.attempts) for task in first] == [("Venice", 1)]
+    assert [task.key for task in queue.lease("city", "worker-2", limit=5, lease_seconds=60)] == ["Verona"]
+    assert queue.lease("city", "worker-3", limit=5, lease_seconds=60) == []
+
+    clock.now += 61  # worker-1 died holding Venice
+    again = queue.lease("city", "worker-3", limit=5, lease_seconds=60)
+    assert [(task.key, task.attempts) for task in again] == [("Venice", 2), ("Verona", 2)]
+
+
+def test_renewed_leases_stay_with_their_owner(queue, clock):
+    tasks = queue.lease("city", "worker-1", limit=2, lease_seconds=60)
+    clock.now += 50
+    queue.renew(tasks, "worker-1", lease_seconds=60)
+    clock.now += 50
+    assert queue.lease("city", "worker-2", limit=2) == []
+    queue.renew(tasks, "worker-2", lease_seconds=600)  # Not its lease; changes nothing
+    clock.now += 11
+    assert len(queue.lease("city", "worker-2", limit=2)) == 2
+
+
+def test_a_task_completes_once(queue):
+    task, = queue.lease("city", "worker-1")
+    queue.complete(task, {"listings": 60})
+    queue.complete(task, {"listings": 0})  # A redone task after a lost lease
+    queue.fail(task, "too late")
+    done, = queue.tasks("city", DONE)
+    assert (done.key, done.result) == ("Venice", {"listings": 60})
+
+
+def test_failed_tasks_are_retried_until_max_attempts(queue):
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        task, = queue.lease("city", "worker-1")
+        assert (task.key, task.attempts) == ("Venice", attempt)
+        queue.fail(task, "search page blocked")
+        expected = FAILED if attempt == MAX_ATTEMPTS else PENDING
+        assert statuses(queue)["Venice"] == (expected, attempt)
+    assert [task.key for task in queue.lease("city", "worker-1", limit=5)] == ["Verona"]
+
+
+def test_a_task_that_keeps_losing_its_lease_is_given_up(queue, clock):
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        task, = queue.lease("city", "worker-1", limit=1, lease_seconds=60)
+        assert (task.key, task.attempts) == ("Venice", attempt)
+        clock.now += 61  # The worker crashed on it
+    assert statuses(queue)["Venice"] == (LEASED, MAX_ATTEMPTS)  # Expired, but only noticed by the next lease
+    assert [task.key for task in queue.lease("city", "worker-2", limit=5)] == ["Verona"]
+    assert statuses(queue)["Venice"] == (FAILED, MAX_ATTEMPTS)
+    assert queue.counts() == {"city": {FAILED: 1, LEASED: 1}}
+
+
+def test_an_incomplete_backend_fails_when_created():
+    class NoFail(work_queue.WorkQueue):
+        put_many = lease = renew = complete = tasks = counts = lambda self, *args, **kwargs: None
+
+    with pytest.raises(TypeError, match="fail"):
+        NoFail()